@@ -0,0 +1,187 @@
+"""
+구조화(JSON) 로깅 설정
+
+요청 처리 중에는 로그 레코드를 큐에 넣기만 하고, 포맷/stdout 쓰기는 QueueListener 스레드가 처리합니다.
+(Fly 로그 수집 중 stdout 쓰기가 막혀도 요청 지연에 영향을 주지 않도록, 큐가 가득 차면 버리고 개수만 셈)
+
+- LOG_LEVEL: DEBUG / INFO / WARNING / ERROR (기본 INFO)
+- LOG_FORMAT: json (기본) / text (로컬 개발용 한 줄 형식)
+- LOG_SUCCESS_SAMPLE_EVERY: extra={"sample": True}로 남긴 INFO 이하 로그는 같은 메시지 N개 중 1개만 출력 (기본 10, 1이면 전부)
+- API 키, JWT, Bearer 토큰처럼 보이는 값과 api_key/token/password 같은 필드는 출력 전에 가립니다.
+
+모듈에서는 logging.getLogger(__name__)으로 로거를 만들고 값은 extra로 넘깁니다.
+    logger.info("초안 생성 성공", extra={"user_id": user_id, "model": model, "sample": True})
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from typing import Optional
+
+from tracing import current_workflow_id
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_SUCCESS_SAMPLE_EVERY = max(int(os.getenv("LOG_SUCCESS_SAMPLE_EVERY", "10")), 1)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+REDACTED = "[REDACTED]"
+_SECRET_PATTERN = re.compile(
+    r'sk-[A-Za-z0-9_-]{8,}'                       # OpenAI
+    r'|gsk_[A-Za-z0-9]{8,}'                       # Groq
+    r'|AIza[0-9A-Za-z_-]{10,}'                    # Google (Gemini)
+    r'|(?:secret_|ntn_)[A-Za-z0-9]{8,}'           # Notion
+    r'|eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+'  # JWT
+    r'|(?i:bearer)\s+[A-Za-z0-9._~+/=-]+'
+)
+_SENSITIVE_FIELDS = {"api_key", "api_keys", "article_api_key", "token", "session_id", "password", "user_pw", "authorization", "secret"}
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 받은 필드로 출력)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+_stats = {"dropped": 0, "sampled_out": 0}
+
+
+def redact(value):
+    """문자열 안의 키/토큰 패턴을 가림 (dict/list는 재귀)"""
+    if isinstance(value, str):
+        return _SECRET_PATTERN.sub(REDACTED, value)
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in _SENSITIVE_FIELDS and v else redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    fields = {}
+    for key, value in vars(record).items():
+        if key in _RESERVED or key.startswith("_"):
+            continue
+        fields[key] = REDACTED if key.lower() in _SENSITIVE_FIELDS and value else redact(value)
+    return fields
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": redact(record.getMessage()),
+            **_fields(record),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = redact(record.exc_text)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = " ".join(f"{key}={value}" for key, value in _fields(record).items())
+        line = f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.levelname:<7} {record.name}: {redact(record.getMessage())}"
+        if fields:
+            line += f" {fields}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += "\n" + redact(record.exc_text)
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """extra={"sample": True}인 INFO 이하 로그는 (로거, 메시지)별로 N개 중 1개만 통과"""
+
+    def __init__(self, every: int = LOG_SUCCESS_SAMPLE_EVERY):
+        super().__init__()
+        self.every = every
+        self._counts: dict = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every <= 1 or not getattr(record, "sample", False) or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.msg)
+        with _lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % self.every:
+            _stats["sampled_out"] += 1
+            return False
+        record.sample_every = self.every
+        return True
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    호출한 쪽 스레드에서는 메시지/예외 문자열만 만들고 큐에 넣음 (가득 차면 버림)
+
+    workflow id(tracing)는 contextvar라 여기서 읽어 둡니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        workflow_id = current_workflow_id()
+        if workflow_id and not hasattr(record, "workflow_id"):
+            record.workflow_id = workflow_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _stats["dropped"] += 1
+
+
+def setup_logging() -> None:
+    """루트 로거에 큐 핸들러 설치 후 stdout 쓰기 스레드 시작 (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JSONFormatter())
+
+        handler = _NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        root.handlers = [handler]
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    큐에 남은 로그를 모두 쓰고 쓰기 스레드 종료 (lifespan 종료 시)
+    이후 로그(종료 중 다른 모듈, atexit 등)가 버려지지 않도록 루트 로거는 stdout 핸들러로 직접 씁니다.
+    """
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        stream = _listener.handlers[0]
+        stream.addFilter(SamplingFilter())
+        logging.getLogger().handlers = [stream]
+        _listener = None
+
+
+def get_logging_stats() -> dict:
+    return {"level": LOG_LEVEL, "format": LOG_FORMAT, "sample_every": LOG_SUCCESS_SAMPLE_EVERY, **_stats}
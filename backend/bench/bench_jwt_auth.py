@@ -0,0 +1,56 @@
+"""
+인증 오버헤드 벤치마크 (요청당 토큰 검증 시간)
+
+같은 토큰을 반복 검증해 요청당 평균/p99 시간을 비교합니다.
+  - decode: 캐시 없이 매번 jwt.decode (기존 require_auth 방식)
+  - cached: jwt_auth.JWTAuth.verify_token (첫 호출만 decode, 이후는 해시 + 캐시 조회)
+  - revoked: 로그아웃(폐기)된 토큰 검증 (폐기 목록 조회 후 바로 거절)
+
+실행 (backend 디렉토리에서):
+    python bench/bench_jwt_auth.py --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+
+import jwt
+
+from common import percentile
+from jwt_auth import JWT_ALGORITHM, JWT_SECRET_KEY, JWTAuth
+
+
+async def measure(fn, token: str, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn(token)
+        if asyncio.iscoroutine(result):
+            await result
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name: str, samples: list) -> None:
+    mean = sum(samples) / len(samples)
+    print(f"{name:<8} mean={mean * 1e6:7.2f}µs  p50={percentile(samples, 50) * 1e6:7.2f}µs  p99={percentile(samples, 99) * 1e6:7.2f}µs")
+
+
+async def run(iterations: int) -> None:
+    token = JWTAuth.create_token("bench-user")
+    report("decode", await measure(lambda t: jwt.decode(t, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM]), token, iterations))
+    report("cached", await measure(JWTAuth.verify_token, token, iterations))
+
+    revoked = JWTAuth.create_token("bench-user")
+    await JWTAuth.revoke_token(revoked)
+    report("revoked", await measure(JWTAuth.verify_token, revoked, iterations))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+LLM 호출 동시성 벤치마크
+
+로컬 mock OpenAI 호환 서버(고정 지연)를 띄운 뒤, 같은 이벤트 루프에서 N개의 초안 생성을 동시에 실행합니다.
+  - blocking: async 함수 안에서 동기 OpenAI 클라이언트를 호출 (기존 방식, 요청이 직렬화됨)
+  - async:    llm_service.generate_draft (AsyncOpenAI, 이벤트 루프를 블로킹하지 않음)
+
+실행 (backend 디렉토리에서):
+    python bench/bench_llm_concurrency.py --concurrency 12 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from fastapi import FastAPI
+
+from common import free_port, start_server
+
+
+def build_mock_openai(latency: float) -> FastAPI:
+    """chat.completions 엔드포인트만 흉내 내는 mock 서버"""
+    mock = FastAPI()
+
+    @mock.post("/v1/chat/completions")
+    async def chat_completions(payload: dict):
+        await asyncio.sleep(latency)
+        return {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "벤치마크용 초안 본문입니다."},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        }
+
+    return mock
+
+
+async def run_blocking(concurrency: int, base_url: str) -> float:
+    """기존 방식: async 핸들러 안에서 동기 SDK 호출"""
+    from openai import OpenAI
+
+    async def handler():
+        client = OpenAI(api_key="sk-bench", base_url=base_url)
+        client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": "벤치마크"}],
+        )
+
+    start = time.perf_counter()
+    await asyncio.gather(*[handler() for _ in range(concurrency)])
+    return time.perf_counter() - start
+
+
+async def run_async(concurrency: int) -> float:
+    """새 방식: llm_service의 비동기 provider 호출"""
+    from llm_service import generate_draft
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        generate_draft("벤치마크", "정보성", "일반", "친근한", model_type="openai", api_key="sk-bench")
+        for _ in range(concurrency)
+    ])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.5, help="mock 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(build_mock_openai(args.latency), port)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    try:
+        blocking = asyncio.run(run_blocking(args.concurrency, base_url))
+        non_blocking = asyncio.run(run_async(args.concurrency))
+    finally:
+        server.should_exit = True
+
+    print(f"동시 요청 {args.concurrency}개, provider 지연 {args.latency:.2f}s")
+    print(f"  blocking (동기 SDK): {blocking:.2f}s")
+    print(f"  async    (AsyncOpenAI): {non_blocking:.2f}s")
+    print(f"  speedup: {blocking / non_blocking:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Notion 호출 지연 벤치마크 (p50/p99)
+
+로컬 mock Notion 서버에 API 키 조회 쿼리를 반복 실행합니다.
+  - per-call: 요청마다 httpx.Client()를 새로 만드는 기존 방식 (매번 TCP 연결, 동기 호출)
+  - pooled:   notion.http_client의 공용 AsyncClient (keep-alive 재사용, 비동기 호출)
+
+mock 서버는 평문 HTTP/1.1이므로 실제 api.notion.com의 TLS 핸드셰이크 비용은 포함되지 않습니다.
+운영 환경에서는 차이가 더 커집니다.
+
+실행 (backend 디렉토리에서):
+    python bench/bench_notion_latency.py --requests 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from common import free_port, percentile, start_server
+from mock_notion import build_mock_notion
+
+USERS_DB = "users-db"
+
+
+async def run_per_call(base_url: str, user_ids: list, concurrency: int) -> list:
+    """기존 방식: 매 요청마다 새 동기 클라이언트"""
+    import httpx
+
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(user_id: str):
+        async with semaphore:
+            start = time.perf_counter()
+            with httpx.Client() as client:
+                response = client.post(
+                    f"{base_url}/databases/{USERS_DB}/query",
+                    headers={"Authorization": "Bearer secret-bench", "Notion-Version": "2022-06-28"},
+                    json={"filter": {"property": "아이디", "title": {"equals": user_id}}},
+                )
+                response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[one(u) for u in user_ids])
+    return samples
+
+
+async def run_pooled(user_ids: list, concurrency: int) -> list:
+    """새 방식: 공용 AsyncClient를 사용하는 Notion 헬퍼"""
+    from notion.auth import get_user_api_keys_from_notion
+    from notion.http_client import close_notion_http, init_notion_http
+
+    await init_notion_http()
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(user_id: str):
+        async with semaphore:
+            start = time.perf_counter()
+            await get_user_api_keys_from_notion(user_id)
+            samples.append(time.perf_counter() - start)
+
+    try:
+        await asyncio.gather(*[one(u) for u in user_ids])
+    finally:
+        await close_notion_http()
+    return samples
+
+
+def report(label: str, samples: list, wall: float) -> None:
+    print(
+        f"  {label:<9} p50={percentile(samples, 50) * 1000:7.1f}ms  "
+        f"p99={percentile(samples, 99) * 1000:7.1f}ms  wall={wall:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="mock 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(build_mock_notion(latency=args.latency), port)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    os.environ.update({
+        "NOTION_API_BASE_URL": base_url,
+        "NOTION_API_KEY": "secret-bench",
+        "NOTION_DATABASE_ID": USERS_DB,
+    })
+    user_ids = [f"user{i % 50}" for i in range(args.requests)]
+
+    try:
+        start = time.perf_counter()
+        per_call = asyncio.run(run_per_call(base_url, user_ids, args.concurrency))
+        per_call_wall = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pooled = asyncio.run(run_pooled(user_ids, args.concurrency))
+        pooled_wall = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+
+    print(f"Notion 쿼리 {args.requests}회, 동시성 {args.concurrency}, mock 지연 {args.latency * 1000:.0f}ms")
+    report("per-call", per_call, per_call_wall)
+    report("pooled", pooled, pooled_wall)
+
+
+if __name__ == "__main__":
+    main()
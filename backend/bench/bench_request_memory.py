@@ -0,0 +1,126 @@
+"""
+요청 크기 제한 메모리 벤치마크
+
+GenerateFinalRequest / SaveArticleRequest 모델과 RequestBodyLimitMiddleware만 올린 로컬 서버에
+동시 요청을 보내고 단계별 최대 RSS(VmHWM)를 출력합니다. (LLM/Notion 호출 없음)
+  1. max:       필드 길이 상한에 딱 맞는 최종 글 요청 (정상 처리되어야 함)
+  2. oversized: --oversized-mb 크기의 본문을 Content-Length와 함께 전송 (본문을 읽기 전에 413)
+  3. chunked:   같은 크기를 Content-Length 없이 청크로 전송 (한도를 넘는 순간 413)
+
+--no-limit으로 미들웨어를 빼고 실행하면 2, 3단계에서 본문이 통째로 메모리에 올라가는 것과 비교할 수 있습니다.
+Fly 설정(hard_limit = 25)에 맞춰 기본 동시 요청 수는 25입니다.
+
+실행 (backend 디렉토리에서):
+    python bench/bench_request_memory.py --concurrency 25 --oversized-mb 20
+"""
+import argparse
+import asyncio
+import json
+import resource
+
+import httpx
+from fastapi import FastAPI
+
+from common import free_port, start_server
+from main import MAX_ANALYSIS_ITEM_CHARS, MAX_ARTICLE_CHARS, MAX_DRAFT_CHARS, SUPPORTED_MODELS, GenerateFinalRequest, SaveArticleRequest
+from request_limits import MAX_REQUEST_BODY_BYTES, RequestBodyLimitMiddleware
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB) - Linux는 /proc의 VmHWM, 그 외는 getrusage"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_app(limit: bool) -> FastAPI:
+    bench = FastAPI()
+    if limit:
+        bench.add_middleware(RequestBodyLimitMiddleware)
+
+    @bench.post("/final")
+    async def final(request: GenerateFinalRequest):
+        return {"drafts": len(request.drafts), "chars": sum(len(d.content) for d in request.drafts)}
+
+    @bench.post("/save")
+    async def save(request: SaveArticleRequest):
+        return {"chars": len(request.content)}
+
+    return bench
+
+
+def max_final_payload() -> bytes:
+    """필드 상한에 맞춘 최대 크기 최종 글 요청 (한글 UTF-8)"""
+    item = "가" * MAX_ANALYSIS_ITEM_CHARS
+    return json.dumps({
+        "topic": "벤치마크",
+        "article_intent": "정보성",
+        "target_audience": "일반",
+        "tone_style": "친근한",
+        "drafts": [{"model": model, "content": "가" * MAX_DRAFT_CHARS} for model in SUPPORTED_MODELS],
+        "analyses": [
+            {"model": model, "pros": [item] * 10, "cons": [item] * 10, "improvement": item}
+            for model in SUPPORTED_MODELS
+        ],
+    }, ensure_ascii=False).encode("utf-8")
+
+
+async def fire(client: httpx.AsyncClient, url: str, concurrency: int, body, chunked: bool = False) -> dict:
+    async def one():
+        if chunked:
+            async def chunks():
+                for start in range(0, len(body), 64 * 1024):
+                    yield body[start:start + 64 * 1024]
+            content = chunks()
+        else:
+            content = body
+        try:
+            response = await client.post(url, content=content, headers={"content-type": "application/json"})
+            return response.status_code
+        except httpx.HTTPError as e:
+            return type(e).__name__
+
+    results = await asyncio.gather(*[one() for _ in range(concurrency)])
+    counts = {}
+    for result in results:
+        counts[result] = counts.get(result, 0) + 1
+    return counts
+
+
+async def run(port: int, concurrency: int, oversized_mb: int):
+    base = f"http://127.0.0.1:{port}"
+    oversized = b'{"topic": "' + b"a" * (oversized_mb * 1024 * 1024) + b'"}'
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        print(f"시작: peak RSS {peak_rss_mb():.1f} MB")
+        payload = max_final_payload()
+        result = await fire(client, f"{base}/final", concurrency, payload)
+        print(f"max       ({len(payload) / 1024:.0f} KB x {concurrency}): {result}, peak RSS {peak_rss_mb():.1f} MB")
+        result = await fire(client, f"{base}/save", concurrency, oversized)
+        print(f"oversized ({oversized_mb} MB x {concurrency}): {result}, peak RSS {peak_rss_mb():.1f} MB")
+        result = await fire(client, f"{base}/save", concurrency, oversized, chunked=True)
+        print(f"chunked   ({oversized_mb} MB x {concurrency}): {result}, peak RSS {peak_rss_mb():.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--oversized-mb", type=int, default=20)
+    parser.add_argument("--no-limit", action="store_true", help="RequestBodyLimitMiddleware 없이 실행")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(build_app(not args.no_limit), port)
+    print(f"본문 한도: {'없음' if args.no_limit else f'{MAX_REQUEST_BODY_BYTES // 1024} KB'}, 글 최대 {MAX_ARTICLE_CHARS}자")
+    try:
+        asyncio.run(run(port, args.concurrency, args.oversized_mb))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
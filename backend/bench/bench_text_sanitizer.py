@@ -0,0 +1,109 @@
+"""
+LLM 출력 후처리 처리량 벤치마크
+
+5000자 안팎의 최종 글 샘플에 후처리를 반복 실행해 초당 처리 문자 수를 비교합니다.
+  - legacy:    기존 generate_final의 re.sub 체인 (볼드/이탤릭, 헤딩 6단계, 문자 범위 4개를 따로 실행)
+  - translate: 비한글 문자 제거를 str.translate(제거 테이블)로 한 경우 (참고용)
+  - sanitizer: text_sanitizer.sanitize_final (미리 컴파일한 패턴, 합친 문자 범위, '*'/'#' 없으면 생략)
+  - stream:    text_sanitizer.StreamingTextCleaner에 20자 단위 청크로 입력
+
+샘플마다 결과가 legacy와 같은지 먼저 확인하고, 다르면 해당 방식은 측정하지 않습니다.
+
+실행 (backend 디렉토리에서):
+    python bench/bench_text_sanitizer.py --iterations 2000
+"""
+import argparse
+import re
+import time
+
+import common  # noqa: F401  (backend 디렉토리를 import 경로에 추가)
+from text_sanitizer import NON_KOREAN_RANGES, StreamingTextCleaner, clean_final_markdown, sanitize_final
+
+_TRANSLATE_TABLE = {code: None for start, end in NON_KOREAN_RANGES for code in range(start, end + 1)}
+
+
+def legacy_final(content: str) -> str:
+    """기존 generate_final 후처리 (변경 전 코드 그대로)"""
+    content = re.sub(r'\*\*([^*]+)\*\*', r'\1', content, flags=re.DOTALL)
+    content = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', r'\1', content)
+    content = re.sub(r'^#{1,6}\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^##\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^###\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^####\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^#####\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'^######\s+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'\*([^*\n]+)\*', r'\1', content)
+    content = re.sub(r'\*\*([^*\n]+)\*\*', r'\1', content)
+    content = re.sub(r'[\u4e00-\u9fff]+', '', content)
+    content = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', content)
+    content = re.sub(r'[\u0400-\u04ff]+', '', content)
+    content = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', content)
+    return content
+
+
+def translate_final(content: str) -> str:
+    return clean_final_markdown(content).translate(_TRANSLATE_TABLE)
+
+
+def stream_final(content: str, chunk_size: int = 20) -> str:
+    cleaner = StreamingTextCleaner()
+    parts = [cleaner.feed(content[i:i + chunk_size]) for i in range(0, len(content), chunk_size)]
+    parts.append(cleaner.flush())
+    return "".join(parts)
+
+
+def build_sample(markdown: bool, foreign: bool, target: int = 5000) -> str:
+    paragraph = (
+        "요즘 소비자들은 단순한 할인보다 브랜드가 전하는 이야기에 더 크게 반응합니다. "
+        "특히 2030 세대는 제품을 고를 때 후기와 가치관을 함께 살펴봅니다.\n"
+    )
+    if markdown:
+        paragraph = "## 브랜드 스토리의 힘\n" + paragraph.replace("브랜드가 전하는", "**브랜드가 전하는**").replace("후기", "*후기*")
+    if foreign:
+        paragraph = paragraph.replace("소비자들은", "消費者들은").replace("세대는", "세대는 поколение")
+    lines = []
+    while sum(len(l) for l in lines) < target:
+        lines.append(paragraph)
+    return "".join(lines) + "#마케팅 #브랜딩"
+
+
+def measure(func, text: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    variants = [
+        ("legacy", legacy_final),
+        ("translate", translate_final),
+        ("sanitizer", sanitize_final),
+        ("stream", stream_final),
+    ]
+    samples = [
+        ("markdown+foreign", build_sample(markdown=True, foreign=True)),
+        ("markdown", build_sample(markdown=True, foreign=False)),
+        ("plain", build_sample(markdown=False, foreign=False)),
+    ]
+
+    for label, text in samples:
+        expected = legacy_final(text).strip()
+        print(f"\n[{label}] {len(text)}자 x {args.iterations}회")
+        baseline = None
+        for name, func in variants:
+            if func(text).strip() != expected:
+                print(f"  {name:<10} 결과가 legacy와 다름")
+                continue
+            elapsed = measure(func, text, args.iterations)
+            baseline = baseline or elapsed
+            throughput = len(text) * args.iterations / elapsed / 1_000_000
+            print(f"  {name:<10} {elapsed * 1000 / args.iterations:7.3f}ms/회  {throughput:7.1f}M자/s  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""벤치마크 스크립트 공용 헬퍼 (로컬 mock 서버 실행, 지연 통계)"""
+import os
+import socket
+import sys
+import threading
+import time
+
+import uvicorn
+
+# backend 디렉토리를 import 경로에 추가 (main, llm_service, notion 모듈 사용)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """mock 서버를 백그라운드 스레드에서 실행"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(samples: list, pct: float) -> float:
+    """정렬된 표본에서 nearest-rank 백분위수"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,120 @@
+"""
+로컬 mock Notion API 서버 (벤치마크용)
+
+databases/{id}/query (필터·페이지네이션), blocks/{id}/children, pages 생성/수정만 흉내 냅니다.
+응답마다 고정 지연(latency)을 넣어 실제 네트워크 왕복을 근사합니다.
+"""
+import asyncio
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def _title(content: str) -> dict:
+    return {"title": [{"type": "text", "text": {"content": content}}]}
+
+
+def _rich_text(content: str) -> dict:
+    return {"rich_text": [{"type": "text", "text": {"content": content}}]}
+
+
+def build_mock_notion(latency: float = 0.02, users: int = 50, articles_per_user: int = 20) -> FastAPI:
+    mock = FastAPI()
+    edited = datetime(2026, 1, 1).isoformat()
+
+    user_rows = [
+        {
+            "id": f"user-page-{i}",
+            "last_edited_time": edited,
+            "properties": {
+                "아이디": _title(f"user{i}"),
+                "비밀번호": _rich_text(f"pw{i}"),
+                "OpenAI API 키": _rich_text(f"sk-bench-{i}"),
+                "Groq API 키": _rich_text(""),
+                "Gemini API 키": _rich_text(""),
+            },
+        }
+        for i in range(users)
+    ]
+    article_rows = [
+        {
+            "id": f"article-{u}-{a}",
+            "last_edited_time": edited,
+            "properties": {
+                "제목": _title(f"벤치마크 글 {a}"),
+                "주제": _rich_text(f"주제 {a}"),
+                "내용": _rich_text("미리보기"),
+                "생성일": _rich_text(f"2026-01-01 00:{a:02d}:00"),
+                "사용자": _rich_text(f"user{u}"),
+                "모델": {"select": {"name": "gemini"}},
+                "글 의도": _rich_text("정보성"),
+                "대상 독자": _rich_text("일반"),
+                "유형": {"select": {"name": "최종글"}},
+            },
+        }
+        for u in range(users)
+        for a in range(articles_per_user)
+    ]
+
+    def _matches(row: dict, flt: dict) -> bool:
+        if not flt:
+            return True
+        if "and" in flt:
+            return all(_matches(row, f) for f in flt["and"])
+        prop = row["properties"].get(flt.get("property"), {})
+        for kind in ("title", "rich_text"):
+            if kind in flt:
+                items = prop.get(kind, [])
+                value = items[0]["text"]["content"] if items else ""
+                return value == flt[kind].get("equals")
+        if "select" in flt:
+            return (prop.get("select") or {}).get("name") == flt["select"].get("equals")
+        return True
+
+    @mock.post("/v1/databases/{database_id}/query")
+    async def query(database_id: str, request: Request):
+        await asyncio.sleep(latency)
+        body = await request.json() if await request.body() else {}
+        rows = user_rows if database_id.startswith("users") else article_rows
+        rows = [r for r in rows if _matches(r, body.get("filter"))]
+        start = int(body.get("start_cursor") or 0)
+        size = min(int(body.get("page_size") or 100), 100)
+        page = rows[start:start + size]
+        has_more = start + size < len(rows)
+        return {
+            "object": "list",
+            "results": page,
+            "has_more": has_more,
+            "next_cursor": str(start + size) if has_more else None,
+        }
+
+    @mock.get("/v1/blocks/{block_id}/children")
+    async def children(block_id: str):
+        await asyncio.sleep(latency)
+        return {
+            "object": "list",
+            "results": [{"type": "paragraph", "paragraph": _rich_text("본문 " * 200)}],
+            "has_more": False,
+            "next_cursor": None,
+        }
+
+    @mock.get("/v1/pages/{page_id}")
+    async def get_page(page_id: str):
+        await asyncio.sleep(latency)
+        for row in article_rows:
+            if row["id"] == page_id:
+                return row
+        return JSONResponse({"object": "error", "status": 404}, status_code=404)
+
+    @mock.post("/v1/pages")
+    async def create_page():
+        await asyncio.sleep(latency)
+        return {"object": "page", "id": "new-page"}
+
+    @mock.patch("/v1/pages/{page_id}")
+    async def update_page(page_id: str):
+        await asyncio.sleep(latency)
+        return {"object": "page", "id": page_id}
+
+    return mock
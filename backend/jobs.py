@@ -0,0 +1,270 @@
+"""
+오래 걸리는 생성 작업을 HTTP 연결과 분리해 실행하는 비동기 작업 관리
+
+최종 글 생성(Gemini 3000~5000자 + Notion 저장 예약)은 한 번에 수십 초가 걸려
+브라우저 탭이나 Fly 프록시 연결이 끊기면 결과를 잃고 처음부터 다시 요청하게 됩니다.
+작업으로 만들면 요청은 작업 id를 바로 돌려받고, 결과는 조회(폴링) / SSE / webhook으로 받습니다.
+
+- 작업 id는 (종류, 사용자, Idempotency-Key 헤더)에서 만듭니다. 헤더가 없으면 요청 본문 지문을 사용
+  → 같은 요청을 다시 보내면 진행 중이거나 끝난 작업을 그대로 돌려받고 LLM을 다시 호출하지 않음
+- 같은 Idempotency-Key로 다른 본문을 보내면 JobConflictError
+- 실행 중인 워커는 lease를 주기적으로 갱신합니다. 워커가 죽어 lease가 만료되었거나 실패한 작업은
+  같은 요청을 다시 보내면 이어서 다시 실행 (이미 성공한 작업은 재실행하지 않음)
+- 작업 상태는 shared_state 백엔드에 저장하므로 워커/머신이 여러 개여도 어느 곳에서나 조회 가능
+- 요청 본문(API 키 포함)은 저장하지 않습니다. 재실행에는 다시 보낸 요청을 사용
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from metrics import jobs_running, jobs_total
+from shared_state import get_state_backend
+
+logger = logging.getLogger(__name__)
+
+# 완료된 작업 결과 보관 시간 (초)
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", str(24 * 3600)))
+# 실행 중인 워커의 lease 유지 시간 (초, 1/3 주기로 갱신 - 만료되면 중단된 작업으로 보고 재실행 허용)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# 상태 변화를 기다릴 때 다른 워커에서 실행 중인 작업의 조회 주기 (초)
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+# webhook 허용 호스트 (쉼표 구분, 비어 있으면 webhook 사용 안 함) / 서명 키 / 전송 제한 시간
+JOB_WEBHOOK_ALLOWED_HOSTS = {host.strip().lower() for host in os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()}
+JOB_WEBHOOK_SECRET = os.getenv("JOB_WEBHOOK_SECRET", "")
+JOB_WEBHOOK_TIMEOUT = float(os.getenv("JOB_WEBHOOK_TIMEOUT", "10"))
+
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+INTERRUPTED = "interrupted"  # 실행하던 워커가 사라짐 (저장된 상태는 running, 조회 시 lease로 판단)
+TERMINAL_STATUSES = (SUCCEEDED, FAILED, INTERRUPTED)
+
+_WORKER_ID = uuid.uuid4().hex[:12]
+
+
+class JobError(Exception):
+    """작업 실패 (HTTP 응답과 같은 detail / status_code로 기록)"""
+
+    def __init__(self, detail: str, status_code: int = 500, retry_after: Optional[float] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class JobConflictError(Exception):
+    """같은 Idempotency-Key로 다른 요청 본문을 보냄"""
+
+
+def request_fingerprint(payload: dict) -> str:
+    """요청 본문 지문 (키 순서와 무관, 제외할 필드는 호출하는 쪽에서 미리 뺌)"""
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def validate_webhook_url(url: str) -> None:
+    """JOB_WEBHOOK_ALLOWED_HOSTS에 있는 https 주소만 허용 (ValueError)"""
+    parsed = urlparse(url)
+    if parsed.scheme != "https" or not parsed.hostname:
+        raise ValueError("webhook_url은 https 주소여야 합니다.")
+    if parsed.hostname.lower() not in JOB_WEBHOOK_ALLOWED_HOSTS:
+        raise ValueError("허용되지 않은 webhook 호스트입니다. (JOB_WEBHOOK_ALLOWED_HOSTS)")
+
+
+def public_view(record: dict) -> dict:
+    """응답용 작업 정보 (사용자 id / 지문 제외)"""
+    return {key: value for key, value in record.items() if key not in ("user_id", "fingerprint", "webhook_url")}
+
+
+class JobManager:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._tasks: dict = {}   # job_id -> asyncio.Task (이 프로세스에서 실행 중)
+        self._events: dict = {}  # job_id -> asyncio.Event (상태가 바뀌면 set)
+        self._stats = {"created": 0, "deduplicated": 0, "resumed": 0, "succeeded": 0, "failed": 0}
+
+    def _job_id(self, user_id: str, idempotency_key: str) -> str:
+        return hashlib.sha256(f"{self.kind}:{user_id}:{idempotency_key}".encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _lease_key(job_id: str) -> str:
+        return f"job:{job_id}:lease"
+
+    async def _save(self, record: dict) -> None:
+        record["updated_at"] = time.time()
+        await get_state_backend().set(self._key(record["id"]), record, ttl=JOB_RESULT_TTL)
+        event = self._events.get(record["id"])
+        if event is not None:
+            event.set()
+
+    async def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        """작업 조회 (다른 사용자의 작업이면 None, 실행 워커가 사라졌으면 status=interrupted)"""
+        backend = get_state_backend()
+        record = await backend.get(self._key(job_id))
+        if record is None or record.get("user_id") != user_id:
+            return None
+        if record["status"] == RUNNING and job_id not in self._tasks and await backend.get(self._lease_key(job_id)) is None:
+            record["status"] = INTERRUPTED
+            record["error"] = {"detail": "작업을 실행하던 서버가 중단되었습니다. 같은 요청을 다시 보내면 이어서 실행합니다.", "status_code": 503}
+        return record
+
+    async def submit(
+        self,
+        user_id: str,
+        fingerprint: str,
+        run: Callable[[], Awaitable[dict]],
+        idempotency_key: Optional[str] = None,
+        webhook_url: Optional[str] = None
+    ) -> tuple:
+        """
+        작업 생성 또는 기존 작업 반환 → (작업 정보, 새로 실행했는지)
+
+        run은 결과 dict를 돌려주는 코루틴 함수 (실패 시 JobError, 그 외 예외는 500으로 기록)
+        """
+        job_id = self._job_id(user_id, idempotency_key or fingerprint)
+        backend = get_state_backend()
+        record = await self.get(job_id, user_id)
+        if record is not None:
+            if record["fingerprint"] != fingerprint:
+                raise JobConflictError("같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.")
+            if record["status"] in (RUNNING, SUCCEEDED):
+                self._stats["deduplicated"] += 1
+                jobs_total.inc(kind=self.kind, outcome="deduplicated")
+                return record, False
+
+        # 새 작업이거나 실패/중단된 작업 → lease를 먼저 잡은 워커 하나만 실행
+        if not await backend.add(self._lease_key(job_id), _WORKER_ID, ttl=JOB_LEASE_SECONDS):
+            self._stats["deduplicated"] += 1
+            jobs_total.inc(kind=self.kind, outcome="deduplicated")
+            # 방금 다른 요청이 lease를 잡고 아직 상태를 저장하기 전일 수 있음
+            current = await self.get(job_id, user_id)
+            return current or {"id": job_id, "kind": self.kind, "status": RUNNING}, False
+
+        now = time.time()
+        attempts = record["attempts"] + 1 if record is not None else 1
+        record = {
+            "id": job_id,
+            "kind": self.kind,
+            "status": RUNNING,
+            "attempts": attempts,
+            "created_at": record["created_at"] if record is not None else now,
+            "user_id": user_id,
+            "fingerprint": fingerprint,
+            "webhook_url": webhook_url or None,
+        }
+        await self._save(record)
+        self._events[job_id] = asyncio.Event()
+        self._tasks[job_id] = asyncio.create_task(self._execute(record, run))
+        outcome = "resumed" if attempts > 1 else "created"
+        self._stats[outcome] += 1
+        jobs_total.inc(kind=self.kind, outcome=outcome)
+        logger.info("작업 시작", extra={"job_id": job_id, "kind": self.kind, "user_id": user_id, "attempts": attempts})
+        return record, True
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                await get_state_backend().set(self._lease_key(job_id), _WORKER_ID, ttl=JOB_LEASE_SECONDS)
+            except Exception as e:
+                logger.warning("작업 lease 갱신 실패", extra={"job_id": job_id, "error": str(e)})
+
+    async def _execute(self, record: dict, run: Callable[[], Awaitable[dict]]) -> None:
+        job_id = record["id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        start = time.perf_counter()
+        try:
+            with jobs_running.track_inflight(kind=self.kind):
+                try:
+                    record["result"] = await run()
+                    record["status"] = SUCCEEDED
+                    record.pop("error", None)
+                except asyncio.CancelledError:
+                    record["status"] = FAILED
+                    record["error"] = {"detail": "서버 종료로 작업이 중단되었습니다. 같은 요청을 다시 보내면 이어서 실행합니다.", "status_code": 503}
+                    raise
+                except JobError as e:
+                    record["status"] = FAILED
+                    record["error"] = {"detail": e.detail, "status_code": e.status_code}
+                    if e.retry_after is not None:
+                        record["error"]["retry_after"] = e.retry_after
+                except Exception as e:
+                    logger.exception("작업 실행 중 예외", extra={"job_id": job_id, "kind": self.kind})
+                    record["status"] = FAILED
+                    record["error"] = {"detail": f"작업 실행 중 오류: {e}", "status_code": 500}
+        finally:
+            heartbeat.cancel()
+            outcome = "succeeded" if record["status"] == SUCCEEDED else "failed"
+            self._stats[outcome] += 1
+            jobs_total.inc(kind=self.kind, outcome=outcome)
+            try:
+                await self._save(record)
+                await get_state_backend().delete(self._lease_key(job_id))
+            except Exception as e:
+                logger.error("작업 결과 저장 실패", extra={"job_id": job_id, "error": str(e)})
+            logger.info("작업 종료", extra={
+                "job_id": job_id, "kind": self.kind, "status": record["status"],
+                "elapsed": round(time.perf_counter() - start, 3),
+            })
+            self._tasks.pop(job_id, None)
+            self._events.pop(job_id, None)
+        if record.get("webhook_url"):
+            await self._send_webhook(record)
+
+    async def _send_webhook(self, record: dict) -> None:
+        body = json.dumps(public_view(record), ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if JOB_WEBHOOK_SECRET:
+            signature = hmac.new(JOB_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256).hexdigest()
+            headers["X-YNK-Signature"] = f"sha256={signature}"
+        try:
+            async with httpx.AsyncClient(timeout=JOB_WEBHOOK_TIMEOUT) as client:
+                response = await client.post(record["webhook_url"], content=body, headers=headers)
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning("작업 webhook 전송 실패", extra={"job_id": record["id"], "error": str(e)})
+
+    async def wait_for_change(self, job_id: str, timeout: float = JOB_POLL_INTERVAL) -> None:
+        """이 프로세스에서 실행 중이면 상태가 바뀔 때까지, 아니면 timeout만큼 대기"""
+        event = self._events.get(job_id)
+        if event is None:
+            await asyncio.sleep(timeout)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """실행 중인 작업을 timeout까지 기다린 후 취소 (lifespan 종료 시, 취소된 작업은 failed로 기록되어 재요청하면 다시 실행)"""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {"kind": self.kind, "running": len(self._tasks), **self._stats}
+
+
+final_jobs = JobManager("final")
+
+
+def get_job_stats() -> dict:
+    return final_jobs.stats()
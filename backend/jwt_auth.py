@@ -0,0 +1,134 @@
+"""
+JWT 발급/검증 (검증 결과 캐시 + 로그아웃 토큰 폐기 목록)
+
+프론트엔드는 글 하나를 만들 때 같은 토큰으로 7번 이상 요청하므로
+한 번 검증한 토큰은 (user_id, exp)를 캐시해 두고 이후 요청에서는 jwt.decode를 생략합니다.
+- 캐시 항목은 토큰 만료 시각(exp)과 JWT_CACHE_TTL 중 먼저 오는 시점에 만료
+- 로그아웃한 토큰은 exp까지 폐기 목록(shared_state 백엔드)에 남겨 캐시 여부와 관계없이 거절
+- 토큰 원문 대신 SHA-256 해시를 키로 사용 (메모리에 토큰 원문을 보관하지 않음)
+"""
+import hashlib
+import os
+import time
+import uuid
+from typing import Optional
+
+import jwt
+
+from metrics import jwt_verify_duration_seconds
+from shared_state import get_state_backend
+from ttl_cache import TTLCache
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "ynk-blog-automation-secret-key-change-in-production")  # 프로덕션에서는 환경 변수로 설정
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRATION_HOURS = float(os.getenv("JWT_EXPIRATION_HOURS", str(24 * 7)))  # 기본 7일
+# 로그인 시 short_lived=true로 요청하면 발급하는 짧은 토큰 유효 시간 (분)
+JWT_SHORT_EXPIRATION_MINUTES = float(os.getenv("JWT_SHORT_EXPIRATION_MINUTES", "60"))
+# 검증 결과 캐시 (0이면 사용 안 함)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "2048"))
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "300"))
+
+_verified_cache = TTLCache(maxsize=max(JWT_CACHE_SIZE, 1), ttl=JWT_CACHE_TTL, name="jwt_verified")
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenRevocationList:
+    """로그아웃한 토큰 목록 (공유 상태 백엔드에 토큰 해시를 exp까지 저장 → 워커가 여러 개여도 같은 목록 사용)"""
+
+    def __init__(self):
+        self.revoked = 0
+
+    @staticmethod
+    def _key(token_hash: str) -> str:
+        return f"jwt:revoked:{token_hash}"
+
+    async def revoke(self, token_hash: str, exp: float) -> None:
+        ttl = exp - time.time()
+        if ttl > 0:
+            await get_state_backend().set(self._key(token_hash), 1, ttl=ttl)
+            self.revoked += 1
+
+    async def is_revoked(self, token_hash: str) -> bool:
+        return await get_state_backend().get(self._key(token_hash)) is not None
+
+
+token_revocations = TokenRevocationList()
+
+
+class JWTAuth:
+    @staticmethod
+    def create_token(user_id: str, short_lived: bool = False) -> str:
+        """JWT 토큰 생성 (short_lived면 JWT_SHORT_EXPIRATION_MINUTES 동안만 유효)"""
+        now = int(time.time())
+        payload = {
+            "user_id": user_id,
+            "exp": now + int(JWTAuth.lifetime_seconds(short_lived)),
+            "iat": now,
+            "jti": uuid.uuid4().hex,
+        }
+        return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+    @staticmethod
+    def lifetime_seconds(short_lived: bool = False) -> float:
+        return JWT_SHORT_EXPIRATION_MINUTES * 60 if short_lived else JWT_EXPIRATION_HOURS * 3600
+
+    @staticmethod
+    async def verify_token(token: str) -> Optional[str]:
+        """JWT 토큰 검증 및 user_id 반환 (캐시 hit이면 서명 검증 생략)"""
+        start = time.perf_counter()
+        result = "ok"
+        try:
+            token_hash = _token_hash(token)
+            if await token_revocations.is_revoked(token_hash):
+                result = "revoked"
+                return None
+            if JWT_CACHE_SIZE > 0:
+                cached = _verified_cache.get(token_hash)
+                if cached is not None:
+                    user_id, exp = cached
+                    if exp > time.time():
+                        result = "cached"
+                        return user_id
+                    _verified_cache.delete(token_hash)
+
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            user_id = payload.get("user_id")
+            if user_id and JWT_CACHE_SIZE > 0:
+                exp = float(payload.get("exp", 0))
+                ttl = min(JWT_CACHE_TTL, exp - time.time())
+                if ttl > 0:
+                    _verified_cache.set(token_hash, (user_id, exp), ttl=ttl)
+            return user_id
+        except jwt.ExpiredSignatureError:
+            # 토큰 만료
+            result = "expired"
+            return None
+        except jwt.InvalidTokenError:
+            # 토큰 무효
+            result = "invalid"
+            return None
+        finally:
+            jwt_verify_duration_seconds.observe(time.perf_counter() - start, result=result)
+
+    @staticmethod
+    async def revoke_token(token: str) -> bool:
+        """
+        로그아웃: 토큰을 만료 시각까지 폐기 목록에 추가하고 검증 캐시에서 제거
+
+        서명이 맞지 않거나 이미 만료된 토큰은 쓸 수 없으므로 추가하지 않습니다.
+        """
+        try:
+            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except jwt.InvalidTokenError:
+            return False
+        token_hash = _token_hash(token)
+        await token_revocations.revoke(token_hash, float(payload.get("exp", time.time() + JWTAuth.lifetime_seconds())))
+        _verified_cache.delete(token_hash)
+        return True
+
+
+def get_jwt_cache_stats() -> dict:
+    return {**_verified_cache.stats(), "revoked": token_revocations.revoked}
@@ -0,0 +1,136 @@
+"""
+LLM 응답 캐시 (메모리 LRU + 디스크 SQLite 2단계)
+
+(provider, model, system 지시문, prompt, temperature, max_tokens) 해시를 키로 생성 결과를 저장합니다.
+같은 주제/의도/독자/톤으로 다시 요청하면 LLM을 호출하지 않고 저장된 결과를 반환합니다.
+LLM_CACHE_ENABLED=1일 때만 동작하며, 요청별로 cache="bypass"를 주면 조회를 건너뛰고 새 결과로 갱신합니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class LLMResponseCache:
+    def __init__(self, path: str, ttl: float = 86400.0, memory_size: int = 256, enabled: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self._memory = TTLCache(maxsize=memory_size, ttl=ttl, name="llm_responses")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, temperature: Optional[float], max_tokens: Optional[int], system: Optional[str] = None) -> str:
+        raw = json.dumps([provider, model, system or "", prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------------- SQLite (스레드에서 실행) ----------------
+
+    def _db(self) -> sqlite3.Connection:
+        with self._db_lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                # 만료 항목 정리
+                conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+                self._conn = conn
+            return self._conn
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        conn = self._db()
+        with self._db_lock:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, value: str) -> None:
+        conn = self._db()
+        with self._db_lock:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+
+    # ---------------- 비동기 API ----------------
+
+    async def get(self, key: str) -> Any:
+        """메모리 → 디스크 순으로 조회 (디스크 hit은 메모리로 승격), 없으면 None"""
+        value = self._memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+        try:
+            raw = await asyncio.to_thread(self._disk_get, key)
+        except Exception as e:
+            logger.warning("LLM 캐시 디스크 조회 실패", extra={"error": str(e)})
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        value = json.loads(raw)
+        self._memory.set(key, value)
+        self.disk_hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._memory.set(key, value)
+        try:
+            await asyncio.to_thread(self._disk_set, key, json.dumps(value, ensure_ascii=False))
+        except Exception as e:
+            logger.warning("LLM 캐시 디스크 저장 실패", extra={"error": str(e)})
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_size": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+
+llm_response_cache = LLMResponseCache(
+    path=os.getenv("LLM_CACHE_PATH", os.path.join("data", "llm_cache.sqlite3")),
+    ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+    memory_size=int(os.getenv("LLM_CACHE_MEMORY_SIZE", "256")),
+    enabled=os.getenv("LLM_CACHE_ENABLED", "0").lower() in ("1", "true", "yes")
+)
+
+
+def get_llm_cache_stats() -> dict:
+    return llm_response_cache.stats()
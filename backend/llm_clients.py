@@ -0,0 +1,130 @@
+"""
+LLM 프로바이더 클라이언트 풀
+API 키(SHA-256 해시)별로 SDK 클라이언트를 재사용해 keep-alive 연결과 TLS 세션을 유지합니다.
+최대 개수(LLM_CLIENT_POOL_SIZE)를 넘으면 가장 오래 사용하지 않은 클라이언트를 닫고 제거합니다.
+"""
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+LLM_CLIENT_POOL_SIZE = int(os.getenv("LLM_CLIENT_POOL_SIZE", "64"))
+# 풀에서 제거된 클라이언트를 닫기까지 기다리는 시간 (초)
+# 제거 직전에 꺼내 간 요청이 끝날 수 있도록 SDK 기본 요청 timeout(openai/groq 600초)보다 길게 둠
+LLM_CLIENT_CLOSE_DELAY = float(os.getenv("LLM_CLIENT_CLOSE_DELAY", "660"))
+
+
+def hash_api_key(api_key: str) -> str:
+    """풀 키로 사용할 API 키 해시 (원문 키를 메모리 딕셔너리 키로 보관하지 않음)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+async def _close_client(client: Any) -> None:
+    """SDK 클라이언트 종료 (close가 동기/비동기 어느 쪽이든 처리, 실패는 무시)"""
+    close = getattr(client, "close", None)
+    if close is None:
+        # Gemini GenerativeModel은 close가 없으므로 내부 async 클라이언트의 transport를 닫음
+        inner = getattr(client, "_async_client", None)
+        close = getattr(getattr(inner, "transport", None), "close", None)
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.warning("LLM 클라이언트 종료 실패", extra={"error": str(e)})
+
+
+class ClientPool:
+    def __init__(self, maxsize: int = 64, close_delay: float = LLM_CLIENT_CLOSE_DELAY):
+        self.maxsize = maxsize
+        self.close_delay = close_delay
+        self._closing: dict = {}  # 제거되어 종료 대기 중인 클라이언트 -> 지연 종료 task
+        self._clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, provider: str, api_key: str, factory: Callable[[], Any]) -> Any:
+        """(provider, 키 해시)에 해당하는 클라이언트 반환, 없으면 factory로 생성"""
+        key = (provider, hash_api_key(api_key))
+        evicted = []
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+            self.misses += 1
+            client = factory()
+            self._clients[key] = client
+            while len(self._clients) > self.maxsize:
+                _, old = self._clients.popitem(last=False)
+                evicted.append(old)
+                self.evictions += 1
+        for old in evicted:
+            self._schedule_close(old)
+        return client
+
+    def _schedule_close(self, client: Any) -> None:
+        """
+        제거된 클라이언트는 close_delay 후에 백그라운드로 종료
+
+        풀은 사용 중인 요청 수를 세지 않으므로, 제거 직전에 꺼내 간 요청이
+        SDK timeout 안에 끝날 때까지 연결 풀을 닫지 않고 기다립니다.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._closing[id(client)] = (client, loop.create_task(self._close_later(client)))
+
+    async def _close_later(self, client: Any) -> None:
+        try:
+            await asyncio.sleep(self.close_delay)
+            await _close_client(client)
+        finally:
+            self._closing.pop(id(client), None)
+
+    async def close_all(self) -> None:
+        """앱 종료 시 풀의 클라이언트와 종료 대기 중인 클라이언트를 모두 바로 닫음"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client, task in list(self._closing.values()):
+            task.cancel()
+            clients.append(client)
+        self._closing.clear()
+        await asyncio.gather(*[_close_client(c) for c in clients])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._clients),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "closing": len(self._closing),
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+llm_client_pool = ClientPool(maxsize=LLM_CLIENT_POOL_SIZE)
+
+
+async def close_llm_clients() -> None:
+    """앱 종료 시 풀의 모든 클라이언트 연결 정리"""
+    await llm_client_pool.close_all()
+
+
+def get_llm_client_pool_stats() -> dict:
+    return llm_client_pool.stats()
@@ -0,0 +1,77 @@
+"""
+LLM 호출 에러 계층
+
+프로바이더 SDK 예외(openai/groq의 RateLimitError·APIStatusError, google.api_core의 ResourceExhausted 등)는
+llm_providers의 translate_error에서 한 번만 아래 타입으로 변환됩니다.
+엔드포인트는 문자열을 파싱하지 않고 status_code / retry_after를 그대로 응답에 사용합니다.
+
+기존 코드와의 호환을 위해 모두 ValueError의 하위 클래스입니다.
+"""
+from typing import Optional
+
+
+class LLMError(ValueError):
+    """LLM 호출 실패 (status_code는 이 API가 클라이언트에 돌려줄 HTTP 상태)"""
+    status_code = 500
+
+    def __init__(
+        self,
+        message: str,
+        provider: str = "",
+        retry_after: Optional[float] = None,
+        upstream_status: Optional[int] = None,
+        code: str = ""
+    ):
+        super().__init__(message)
+        self.provider = provider
+        self.retry_after = retry_after
+        self.upstream_status = upstream_status
+        self.code = code
+
+
+class LLMConfigError(LLMError):
+    """API 키 미설정, 라이브러리 미설치, 지원하지 않는 모델"""
+    status_code = 400
+
+
+class LLMAuthError(LLMError):
+    """프로바이더 API 키가 유효하지 않음 (로그인 세션 만료 401과 구분하기 위해 400)"""
+    status_code = 400
+
+
+class LLMQuotaError(LLMError):
+    """결제/할당량 소진 (재시도해도 회복되지 않음)"""
+    status_code = 402
+
+
+class LLMRateLimitError(LLMError):
+    """요청 한도 초과 (retry_after 후 재시도 가능)"""
+    status_code = 429
+
+
+class LLMModelUnavailableError(LLMError):
+    """모델 폐기/미존재"""
+    status_code = 400
+
+
+class LLMBadRequestError(LLMError):
+    """그 외 프로바이더가 거절한 요청 (4xx)"""
+    status_code = 400
+
+
+class LLMServerError(LLMError):
+    """프로바이더 5xx / 연결 실패"""
+    status_code = 502
+
+
+class LLMTimeoutError(LLMError):
+    """프로바이더 응답 시간 초과"""
+    status_code = 504
+
+
+class ProviderUnavailableError(LLMError):
+    """서킷이 열려 있거나 동시 요청 한도를 넘어 프로바이더를 호출하지 않은 경우"""
+    status_code = 503
+
+    def __init__(self, message: str, provider: str = "", retry_after: float = 1.0):
+        super().__init__(message, provider=provider, retry_after=max(retry_after, 0.0))
@@ -0,0 +1,350 @@
+"""
+LLM 프로바이더 인터페이스와 레지스트리
+
+프로바이더마다 클라이언트 생성, 호출 방식, 에러 메시지 변환만 구현하고
+타임아웃/재시도/캐시 같은 공통 기능은 llm_service의 생성 엔진에서 한 번만 처리합니다.
+새 모델은 LLMProvider를 상속해 register_provider()로 등록하면 모든 생성 함수에서 사용할 수 있습니다.
+"""
+import asyncio
+import os
+from typing import AsyncIterator, Optional
+
+from llm_clients import llm_client_pool
+from llm_errors import (
+    LLMError, LLMConfigError, LLMAuthError, LLMQuotaError, LLMRateLimitError,
+    LLMModelUnavailableError, LLMBadRequestError, LLMServerError, LLMTimeoutError
+)
+
+# OpenAI
+try:
+    import openai
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+# Groq (Llama 모델)
+try:
+    import groq
+    from groq import AsyncGroq
+    GROQ_AVAILABLE = True
+except ImportError:
+    GROQ_AVAILABLE = False
+
+# Google Gemini
+try:
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+    from google.api_core import exceptions as google_exceptions
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+# SDK 자체 재시도 횟수 (0이면 429를 재시도 없이 바로 서킷 브레이커/AIMD 제한에 반영)
+LLM_SDK_MAX_RETRIES = int(os.getenv("LLM_SDK_MAX_RETRIES", "2"))
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """응답 헤더의 retry-after (초) 추출"""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMProvider:
+    """
+    프로바이더 공통 인터페이스
+
+    하위 클래스는 get_client / complete / stream / translate_error를 구현합니다.
+    """
+    name = ""
+    label = ""  # 에러 메시지용 표시 이름
+    model = ""
+    available = False
+    install_hint = ""
+    api_key_env = ""
+
+    def resolve_api_key(self, api_key: Optional[str] = None) -> str:
+        if not api_key:
+            api_key = os.getenv(self.api_key_env)
+        if not api_key:
+            raise LLMConfigError(
+                f"{self.label} API 키가 설정되지 않았습니다. 설정 페이지에서 API 키를 입력해주세요.",
+                provider=self.name
+            )
+        return api_key
+
+    def ensure_available(self) -> None:
+        if not self.available:
+            raise LLMConfigError(self.install_hint, provider=self.name)
+
+    def get_client(self, api_key: Optional[str] = None):
+        raise NotImplementedError
+
+    async def complete(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, json_mode: bool = False, system: Optional[str] = None) -> str:
+        """
+        전체 응답 텍스트 반환 (앞뒤 공백 제거)
+
+        system은 요청마다 바뀌지 않는 지시문으로 프롬프트 맨 앞(system 메시지)에 넣어
+        프로바이더의 프롬프트 prefix 캐시가 적용되게 합니다.
+        """
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, system: Optional[str] = None) -> AsyncIterator[str]:
+        """응답 텍스트 조각을 순서대로 반환"""
+        raise NotImplementedError
+        yield ""
+
+    async def batch(self, prompts: list, temperature: float, max_tokens: int, api_key: Optional[str] = None, concurrency: int = 4, system: Optional[str] = None) -> list:
+        """여러 프롬프트를 동시에 실행 (순서 유지, 동시 요청 수 제한, 같은 system 지시문 공유)"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(prompt: str) -> str:
+            async with semaphore:
+                return await self.complete(prompt, temperature, max_tokens, api_key=api_key, system=system)
+
+        return await asyncio.gather(*[one(p) for p in prompts])
+
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str]) -> list:
+        """chat 형식 메시지 (고정 system 지시문 → 요청별 user 내용 순서)"""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def translate_error(self, e: Exception) -> LLMError:
+        """SDK 예외를 llm_errors 타입으로 변환 (이미 변환된 예외는 그대로)"""
+        if isinstance(e, LLMError):
+            return e
+        return LLMError(f"{self.label} API 오류: {str(e)}", provider=self.name)
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """chat.completions API를 쓰는 프로바이더 (OpenAI, Groq)"""
+    client_class = None
+    # 하위 클래스에서 SDK 모듈(openai / groq)과 안내 메시지 지정
+    sdk = None
+    quota_message = ""
+    rate_limit_message = ""
+    auth_message = ""
+    decommissioned_message = ""
+
+    def get_client(self, api_key: Optional[str] = None):
+        self.ensure_available()
+        api_key = self.resolve_api_key(api_key)
+        return llm_client_pool.get(self.name, api_key, lambda: self.client_class(api_key=api_key, max_retries=LLM_SDK_MAX_RETRIES))
+
+    async def complete(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, json_mode: bool = False, system: Optional[str] = None) -> str:
+        client = self.get_client(api_key)
+        kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        try:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        except Exception as e:
+            raise self.translate_error(e) from e
+        return response.choices[0].message.content.strip()
+
+    async def stream(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, system: Optional[str] = None) -> AsyncIterator[str]:
+        client = self.get_client(api_key)
+        try:
+            stream = await client.chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise self.translate_error(e) from e
+
+    def translate_error(self, e: Exception) -> LLMError:
+        if isinstance(e, LLMError) or self.sdk is None:
+            return super().translate_error(e)
+        if isinstance(e, self.sdk.APITimeoutError):
+            return LLMTimeoutError(f"{self.label} API 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.", provider=self.name)
+        if isinstance(e, self.sdk.APIConnectionError):
+            return LLMServerError(f"{self.label} API에 연결할 수 없습니다. 잠시 후 다시 시도해주세요.", provider=self.name)
+        if not isinstance(e, self.sdk.APIStatusError):
+            return super().translate_error(e)
+
+        # SDK가 파싱한 에러 본문 ({'message', 'type', 'code'} 또는 {'error': {...}})
+        body = e.body if isinstance(e.body, dict) else {}
+        error = body.get("error", body) if isinstance(body.get("error", body), dict) else {}
+        code = error.get("code") or error.get("type") or ""
+        message = error.get("message") or str(e)
+        status_code = e.status_code
+        common = {"provider": self.name, "upstream_status": status_code, "code": str(code)}
+
+        if code == "insufficient_quota":
+            return LLMQuotaError(self.quota_message, **common)
+        if status_code == 429:
+            return LLMRateLimitError(self.rate_limit_message, retry_after=_retry_after(e), **common)
+        if status_code in (401, 403):
+            return LLMAuthError(self.auth_message, **common)
+        if code == "model_decommissioned" or status_code == 404:
+            return LLMModelUnavailableError(self.decommissioned_message or f"{self.label} API 오류: {message}", **common)
+        if status_code >= 500:
+            return LLMServerError(f"{self.label} API 오류: {message}", **common)
+        return LLMBadRequestError(f"{self.label} API 오류: {message}", **common)
+
+
+class OpenAIProvider(OpenAICompatibleProvider):
+    name = "openai"
+    label = "OpenAI"
+    model = "gpt-4o-mini"  # GPT-5 Nano는 아직 없으므로 최신 모델 사용
+    available = OPENAI_AVAILABLE
+    install_hint = "OpenAI 라이브러리가 설치되지 않았습니다. pip install openai"
+    api_key_env = "OPENAI_API_KEY"
+    client_class = AsyncOpenAI if OPENAI_AVAILABLE else None
+    sdk = openai if OPENAI_AVAILABLE else None
+    quota_message = "OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage"
+    rate_limit_message = "OpenAI API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요."
+    auth_message = "OpenAI API 키가 유효하지 않습니다. API 키를 확인해주세요."
+
+
+class GroqProvider(OpenAICompatibleProvider):
+    name = "groq"
+    label = "Groq"
+    model = "llama-3.3-70b-versatile"  # Groq의 최신 Llama 모델 (llama-3.1-70b-versatile은 2025-01-24 폐기됨)
+    available = GROQ_AVAILABLE
+    install_hint = "Groq 라이브러리가 설치되지 않았습니다. pip install groq"
+    api_key_env = "GROQ_API_KEY"
+    client_class = AsyncGroq if GROQ_AVAILABLE else None
+    sdk = groq if GROQ_AVAILABLE else None
+    quota_message = "Groq API 할당량이 초과되었습니다. https://console.groq.com/settings/billing"
+    rate_limit_message = "Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요. https://console.groq.com/limits"
+    auth_message = "Groq API 키가 유효하지 않습니다. API 키를 확인해주세요. https://console.groq.com/keys"
+    decommissioned_message = "사용 중인 Groq 모델이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델을 사용해주세요. https://console.groq.com/docs/deprecations"
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+    label = "Gemini"
+    model = "gemini-2.5-flash-lite"
+    available = GEMINI_AVAILABLE
+    install_hint = "Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai"
+    api_key_env = "GEMINI_API_KEY"
+
+    def _create_model(self, api_key: str):
+        """API 키 전용 async 클라이언트를 가진 Gemini 모델 생성 (전역 genai.configure를 사용하지 않음)"""
+        manager = genai_client._ClientManager()
+        manager.configure(api_key=api_key)
+        model = genai.GenerativeModel(self.model)
+        model._async_client = manager.get_default_client("generative_async")
+        return model
+
+    def get_client(self, api_key: Optional[str] = None, system: Optional[str] = None):
+        self.ensure_available()
+        api_key = self.resolve_api_key(api_key)
+        model = llm_client_pool.get(self.name, api_key, lambda: self._create_model(api_key))
+        if not system:
+            return model
+        # system_instruction은 모델 객체 단위 설정이므로 풀의 async 클라이언트(연결)를 공유하는 가벼운 모델 생성
+        with_system = genai.GenerativeModel(self.model, system_instruction=system)
+        with_system._async_client = model._async_client
+        return with_system
+
+    @staticmethod
+    def _generation_config(temperature: float, max_tokens: int, json_mode: bool = False) -> dict:
+        config = {"temperature": temperature, "max_output_tokens": max_tokens}
+        if json_mode:
+            config["response_mime_type"] = "application/json"
+        return config
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """
+        스트리밍 청크의 텍스트 추출
+        MAX_TOKENS/안전 필터로 끝나는 마지막 청크는 parts가 없어 chunk.text가 ValueError를 내므로 parts에서 직접 읽음
+        """
+        if not chunk.candidates:
+            return ""
+        content = chunk.candidates[0].content
+        parts = content.parts if content else []
+        return "".join(getattr(part, "text", "") or "" for part in parts)
+
+    async def complete(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, json_mode: bool = False, system: Optional[str] = None) -> str:
+        model = self.get_client(api_key, system)
+        try:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens, json_mode)
+            )
+            return response.text.strip()
+        except Exception as e:
+            raise self.translate_error(e) from e
+
+    async def stream(self, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, system: Optional[str] = None) -> AsyncIterator[str]:
+        model = self.get_client(api_key, system)
+        try:
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(temperature, max_tokens),
+                stream=True
+            )
+            async for chunk in response:
+                text = self._chunk_text(chunk)
+                if text:
+                    yield text
+        except Exception as e:
+            raise self.translate_error(e) from e
+
+    def translate_error(self, e: Exception) -> LLMError:
+        if isinstance(e, LLMError) or not GEMINI_AVAILABLE:
+            return super().translate_error(e)
+        common = {"provider": self.name, "upstream_status": getattr(e, "code", None)}
+        if isinstance(e, google_exceptions.ResourceExhausted):
+            return LLMRateLimitError("Gemini API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요. https://ai.google.dev/pricing", **common)
+        if isinstance(e, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)) or (
+            isinstance(e, google_exceptions.InvalidArgument) and "API key" in str(e)
+        ):
+            return LLMAuthError("Gemini API 키가 유효하지 않습니다. API 키를 확인해주세요. https://ai.google.dev/", **common)
+        if isinstance(e, google_exceptions.NotFound):
+            return LLMModelUnavailableError(f"Gemini API 오류: {e.message}", **common)
+        if isinstance(e, google_exceptions.DeadlineExceeded):
+            return LLMTimeoutError("Gemini API 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.", **common)
+        if isinstance(e, google_exceptions.ServerError):
+            return LLMServerError(f"Gemini API 오류: {e.message}", **common)
+        if isinstance(e, google_exceptions.ClientError):
+            return LLMBadRequestError(f"Gemini API 오류: {e.message}", **common)
+        return super().translate_error(e)
+
+
+# ---------------------------------------------------------------------------
+# 레지스트리
+# ---------------------------------------------------------------------------
+
+_PROVIDERS: dict = {}
+
+
+def register_provider(provider: LLMProvider) -> None:
+    """프로바이더 등록 (같은 이름이면 교체)"""
+    _PROVIDERS[provider.name] = provider
+
+
+def get_provider(model_type: str) -> LLMProvider:
+    provider = _PROVIDERS.get(model_type)
+    if provider is None:
+        raise LLMConfigError(f"지원하지 않는 모델 타입: {model_type}", provider=model_type)
+    return provider
+
+
+def list_providers() -> list:
+    return list(_PROVIDERS)
+
+
+register_provider(OpenAIProvider())
+register_provider(GroqProvider())
+register_provider(GeminiProvider())
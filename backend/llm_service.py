@@ -1,247 +1,303 @@
 """
 Multi-LLM 서비스 통합
 OpenAI GPT-5 Nano, Groq (Llama), Gemini 2.5 Flash-Lite 지원
+
+모든 생성 함수는 async 함수이며 llm_providers에 등록된 프로바이더를 통해 호출합니다.
+프로바이더별 분기 없이 complete_text / stream_text 엔진을 거치므로
+캐시 같은 공통 기능은 엔진에 한 번만 추가하면 모든 생성 함수에 적용됩니다.
 """
-import os
+import asyncio
 import json
+import logging
+import os
 import re
-import ast
-from typing import Optional
-
-# OpenAI 에러 타입
-try:
-    from openai import APIError, RateLimitError, APIConnectionError, AuthenticationError
-    OPENAI_ERROR_TYPES_AVAILABLE = True
-except ImportError:
-    OPENAI_ERROR_TYPES_AVAILABLE = False
-
-# Groq 에러 타입
-try:
-    from groq import APIError as GroqAPIError, RateLimitError as GroqRateLimitError
-    GROQ_ERROR_TYPES_AVAILABLE = True
-except ImportError:
-    GROQ_ERROR_TYPES_AVAILABLE = False
-
-
-def parse_error_dict(error_str: str) -> dict:
-    """에러 문자열에서 딕셔너리 추출"""
-    error_dict = {}
-    
-    # Python 딕셔너리 문자열 찾기 (예: "{'error': {'message': '...', 'code': '...'}}")
-    dict_patterns = [
-        r"\{'error':\s*\{[^}]+\}\}",  # {'error': {...}}
-        r'\{"error":\s*\{[^}]+\}\}',  # {"error": {...}}
-        r"Error code: \d+ - (\{.*\})",  # Error code: 429 - {...}
-    ]
-    
-    for pattern in dict_patterns:
-        match = re.search(pattern, error_str, re.DOTALL)
-        if match:
-            try:
-                dict_str = match.group(1) if match.groups() else match.group()
-                # Python 딕셔너리 문자열을 실제 딕셔너리로 변환
-                error_dict = ast.literal_eval(dict_str)
-                break
-            except:
-                try:
-                    # JSON 형식으로 시도
-                    dict_str = dict_str.replace("'", '"')
-                    error_dict = json.loads(dict_str)
-                    break
-                except:
-                    continue
+import time
+from collections import deque
+from typing import Optional, AsyncIterator
+
+from llm_cache import llm_response_cache
+from llm_providers import get_provider
+from metrics import llm_first_token_seconds, llm_request_duration_seconds, llm_requests_in_flight, llm_tokens_total
+from prompts import get_prompt
+from prompt_compaction import compact_final_inputs, count_tokens
+from resilience import provider_guard
+from tracing import start_detached_span, start_span
+from text_sanitizer import StreamingTextCleaner, remove_non_korean, sanitize_draft, sanitize_final
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# 후처리 (마크다운/비한글 문자 제거는 text_sanitizer)
+# ---------------------------------------------------------------------------
+
+_JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def _parse_analysis(text: str) -> dict:
+    """분석 응답에서 JSON 추출 (JSON 형식이 아니면 전체를 개선사항으로 사용)"""
+    try:
+        result = json.loads(text)
+    except ValueError:
+        json_match = _JSON_OBJECT_PATTERN.search(text)
+        try:
+            result = json.loads(json_match.group()) if json_match else None
+        except ValueError:
+            result = None
+    if not isinstance(result, dict):
+        result = {"pros": [], "cons": [], "improvement": text}
+
+    # 비한국어 문자 제거 (pros, cons, improvement)
+    if "pros" in result and isinstance(result["pros"], list):
+        result["pros"] = [remove_non_korean(item) for item in result["pros"]]
+    if "cons" in result and isinstance(result["cons"], list):
+        result["cons"] = [remove_non_korean(item) for item in result["cons"]]
+    if "improvement" in result and isinstance(result["improvement"], str):
+        result["improvement"] = remove_non_korean(result["improvement"])
+    return result
+
+
+# ---------------------------------------------------------------------------
+# 생성 엔진
+# ---------------------------------------------------------------------------
+
+async def complete_text(
+    model_type: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    api_key: Optional[str] = None,
+    json_mode: bool = False,
+    use_cache: bool = True,
+    system: Optional[str] = None
+) -> str:
+    """
+    모든 비스트리밍 생성이 거치는 공통 경로
+
+    프로바이더 선택 → 응답 캐시 조회 → (서킷 브레이커/동시성 제한) 호출 → 캐시 저장 순서로 처리합니다.
+    use_cache=False면 캐시 조회만 건너뛰고 새 결과로 갱신합니다.
+    system은 prompts 템플릿의 고정 지시문 (프롬프트 맨 앞에 system 메시지로 전달)
+    """
+    provider = get_provider(model_type)
+    if not llm_response_cache.enabled:
+        return await _guarded_complete(provider, prompt, temperature, max_tokens, api_key, json_mode, system)
+
+    key = llm_response_cache.make_key(provider.name, provider.model, prompt, temperature, max_tokens, system)
+    if use_cache:
+        cached = await llm_response_cache.get(key)
+        if cached is not None:
+            return cached
+    else:
+        llm_response_cache.bypasses += 1
+    result = await _guarded_complete(provider, prompt, temperature, max_tokens, api_key, json_mode, system)
+    await llm_response_cache.set(key, result)
+    return result
+
+
+def _record_tokens(provider, system: Optional[str], prompt: str, output_tokens: int) -> None:
+    """메트릭용 입력/출력 토큰 수 기록 (SDK usage 대신 prompt_compaction.count_tokens로 계산)"""
+    labels = {"provider": provider.name, "model": provider.model}
+    llm_tokens_total.inc(count_tokens((system or "") + prompt, provider.name), kind="prompt", **labels)
+    llm_tokens_total.inc(output_tokens, kind="completion", **labels)
+
+
+async def _guarded_complete(provider, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str], json_mode: bool, system: Optional[str] = None) -> str:
+    """서킷 브레이커 / 동시성 제한을 거쳐 프로바이더 호출 (소요 시간/토큰 수는 metrics에 기록)"""
+    start = time.monotonic()
+    outcome = "error"
+    try:
+        with start_span("llm.complete", kind="client", **{"llm.provider": provider.name, "llm.model": provider.model, "llm.max_tokens": max_tokens}) as span:
+            async with provider_guard(provider.name, api_key or os.getenv(provider.api_key_env, "")):
+                with llm_requests_in_flight.track_inflight(provider=provider.name):
+                    result = await provider.complete(prompt, temperature, max_tokens, api_key=api_key, json_mode=json_mode, system=system)
+            span.set_attribute("llm.output_chars", len(result))
+        outcome = "ok"
+        _record_tokens(provider, system, prompt, count_tokens(result, provider.name))
+        return result
+    finally:
+        llm_request_duration_seconds.observe(
+            time.monotonic() - start, provider=provider.name, model=provider.model, mode="complete", outcome=outcome
+        )
+
+
+async def stream_text(model_type: str, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str] = None, system: Optional[str] = None) -> AsyncIterator[str]:
+    """모든 스트리밍 생성이 거치는 공통 경로 (프로바이더별 텍스트 조각을 순서대로 반환, 첫 토큰 지연 기록)"""
+    provider = get_provider(model_type)
+    start = time.monotonic()
+    first = True
+    outcome = "error"
+    output_tokens = 0
+    try:
+        with start_detached_span("llm.stream", kind="client", **{"llm.provider": provider.name, "llm.model": provider.model, "llm.max_tokens": max_tokens}) as span:
+            async with provider_guard(provider.name, api_key or os.getenv(provider.api_key_env, "")):
+                with llm_requests_in_flight.track_inflight(provider=provider.name):
+                    async for piece in provider.stream(prompt, temperature, max_tokens, api_key=api_key, system=system):
+                        if first:
+                            elapsed = time.monotonic() - start
+                            _first_token_latency.record(provider.name, elapsed)
+                            llm_first_token_seconds.observe(elapsed, provider=provider.name, model=provider.model)
+                            span.add_event("first_token", {"llm.first_token_seconds": elapsed})
+                            first = False
+                        output_tokens += count_tokens(piece, provider.name)
+                        yield piece
+            span.set_attribute("llm.output_tokens", output_tokens)
+        outcome = "ok"
+        _record_tokens(provider, system, prompt, output_tokens)
+    except (asyncio.CancelledError, GeneratorExit):
+        # hedged 요청에서 진 쪽이 취소되거나 클라이언트가 스트림을 끊은 경우
+        outcome = "cancelled"
+        raise
+    finally:
+        llm_request_duration_seconds.observe(
+            time.monotonic() - start, provider=provider.name, model=provider.model, mode="stream", outcome=outcome
+        )
+
+
+# ---------------------------------------------------------------------------
+# Hedged 요청 (첫 토큰이 늦으면 다른 모델로 백업 요청)
+# ---------------------------------------------------------------------------
+
+# 백업 요청을 보내는 기준 (프로바이더별 최근 첫 토큰 지연의 백분위수)
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+# 표본이 부족할 때 사용하는 기준 지연 (초)
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "5"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+
+class LatencyTracker:
+    """프로바이더별 최근 지연 표본 (고정 길이 deque)"""
+
+    def __init__(self, window: int = 200):
+        self._samples: dict = {}
+        self.window = window
+
+    def record(self, name: str, seconds: float) -> None:
+        self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, name: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        samples = sorted(self._samples.get(name, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "samples": len(samples),
+                "p50": round(self.percentile(name, 50), 3),
+                "p95": round(self.percentile(name, 95), 3),
+            }
+            for name, samples in self._samples.items() if samples
+        }
+
+
+_first_token_latency = LatencyTracker()
+_hedge_counters = {"requests": 0, "backups_fired": 0, "backup_wins": 0, "failovers": 0}
+
+
+def get_llm_latency_stats() -> dict:
+    return {
+        "first_token": _first_token_latency.stats(),
+        "hedge": dict(_hedge_counters),
+    }
+
+
+def hedge_delay(model_type: str) -> float:
+    """백업 요청까지 기다릴 시간 (표본이 부족하면 기본값)"""
+    delay = _first_token_latency.percentile(model_type, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES)
+    return LLM_HEDGE_DEFAULT_DELAY if delay is None else delay
+
+
+async def _collect_stream(model_type: str, prompt: str, temperature: float, max_tokens: int, api_key: Optional[str], first_token: asyncio.Event, system: Optional[str] = None) -> str:
+    parts = []
+    async for piece in stream_text(model_type, prompt, temperature, max_tokens, api_key=api_key, system=system):
+        first_token.set()
+        parts.append(piece)
+    return "".join(parts).strip()
+
+
+async def hedged_complete_text(
+    candidates: list,
+    prompt: str,
+    temperature: float,
+    max_tokens: int,
+    system: Optional[str] = None
+) -> tuple:
+    """
+    첫 번째 후보로 요청하고, 첫 토큰이 hedge_delay 안에 오지 않거나 실패하면 다음 후보로 백업 요청
+
+    Args:
+        candidates: [(model_type, api_key), ...] 우선순위 순서
     
-    return error_dict
-
-# OpenAI
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-# Groq (Llama 모델)
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
-
-# Google Gemini
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-
-
-def get_openai_client(api_key: Optional[str] = None):
-    """OpenAI 클라이언트 생성"""
-    if not api_key:
-        api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
-    return OpenAI(api_key=api_key)
-
-
-def get_groq_client(api_key: Optional[str] = None):
-    """Groq 클라이언트 생성"""
-    if not api_key:
-        api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY 환경변수가 설정되지 않았습니다.")
-    return Groq(api_key=api_key)
-
-
-def get_gemini_client(api_key: Optional[str] = None):
-    """Gemini 클라이언트 생성"""
-    if not api_key:
-        api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel('gemini-2.5-flash-lite')
-
-
-def generate_title(keyword: str, model_type: str = "openai") -> str:
+    Returns:
+        (응답 텍스트, 응답한 model_type) - 먼저 끝난 쪽을 사용하고 나머지 요청은 취소
+    """
+    _hedge_counters["requests"] += 1
+    pending_candidates = list(candidates)
+    running = {}  # task -> (model_type, first_token 이벤트)
+    errors = []
+
+    def launch() -> None:
+        model_type, api_key = pending_candidates.pop(0)
+        first_token = asyncio.Event()
+        task = asyncio.create_task(_collect_stream(model_type, prompt, temperature, max_tokens, api_key, first_token, system))
+        running[task] = (model_type, first_token)
+
+    launch()
+    primary = candidates[0][0]
+    try:
+        while running:
+            # 아직 첫 토큰을 못 받은 요청이 있으면 hedge 지연까지만 기다림
+            waiting = [m for m, ev in running.values() if not ev.is_set()]
+            timeout = hedge_delay(waiting[0]) if waiting and pending_candidates else None
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # 첫 토큰이 기준보다 늦음 → 백업 요청 (기존 요청도 계속 진행)
+                if any(not ev.is_set() for _, ev in running.values()):
+                    _hedge_counters["backups_fired"] += 1
+                    launch()
+                continue
+
+            for task in done:
+                model_type, _ = running.pop(task)
+                if task.exception() is None:
+                    if model_type != primary:
+                        _hedge_counters["backup_wins"] += 1
+                    return task.result(), model_type
+                errors.append(task.exception())
+                # 실패한 요청은 즉시 다음 후보로 대체 (failover)
+                if pending_candidates:
+                    _hedge_counters["failovers"] += 1
+                    launch()
+        raise errors[0]
+    finally:
+        for task in running:
+            task.cancel()
+
+
+# ---------------------------------------------------------------------------
+# 생성 함수
+# ---------------------------------------------------------------------------
+
+async def generate_title(keyword: str, model_type: str = "openai", use_cache: bool = True) -> str:
     """
     키워드로부터 블로그 제목 생성
     
     Args:
         keyword: 블로그 키워드
         model_type: 'openai', 'groq', 'gemini'
+        use_cache: False면 응답 캐시 조회를 건너뜀 (결과는 캐시에 갱신)
     
     Returns:
         생성된 제목
     """
-    prompt = f"""다음 키워드를 기반으로 SEO 최적화된 블로그 제목을 1개만 생성해주세요.
-
-키워드: {keyword}
-
-요구사항:
-1. 제목은 30-50자 정도로 작성
-2. 클릭을 유도하는 매력적인 제목
-3. 키워드를 자연스럽게 포함
-4. 숫자나 질문형 제목 권장
-5. 한국어로만 작성
-
-제목만 출력하세요 (설명 없이):"""
-
-    if model_type == "openai":
-        if not OPENAI_AVAILABLE:
-            raise ValueError("OpenAI 라이브러리가 설치되지 않았습니다. pip install openai")
-        try:
-            client = get_openai_client()
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # GPT-5 Nano는 아직 없으므로 최신 모델 사용
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=100
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            error_str = str(e)
-            error_dict = parse_error_dict(error_str)
-            
-            # OpenAI APIError 객체에서 에러 정보 추출
-            if OPENAI_ERROR_TYPES_AVAILABLE and isinstance(e, APIError):
-                if hasattr(e, 'response') and e.response:
-                    try:
-                        error_dict = e.response.json() if hasattr(e.response, 'json') else {}
-                    except:
-                        pass
-                if hasattr(e, 'body'):
-                    try:
-                        if isinstance(e.body, dict):
-                            error_dict = e.body
-                        elif isinstance(e.body, str):
-                            error_dict = json.loads(e.body)
-                    except:
-                        pass
-            
-            # 에러 메시지에서 정보 추출
-            error_code = error_dict.get('error', {}).get('code', '')
-            error_type = error_dict.get('error', {}).get('type', '')
-            
-            if ("insufficient_quota" in error_str or "quota" in error_str.lower() or 
-                error_code == 'insufficient_quota' or error_type == 'insufficient_quota'):
-                raise ValueError("OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage")
-            elif ("rate_limit" in error_str.lower() or "429" in error_str or 
-                  (OPENAI_ERROR_TYPES_AVAILABLE and isinstance(e, RateLimitError))):
-                raise ValueError("OpenAI API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif ("invalid_api_key" in error_str.lower() or "authentication" in error_str.lower() or
-                  (OPENAI_ERROR_TYPES_AVAILABLE and isinstance(e, AuthenticationError))):
-                raise ValueError("OpenAI API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                # 원본 에러 메시지에서 핵심 정보만 추출
-                if error_dict.get('error', {}).get('message'):
-                    raise ValueError(f"OpenAI API 오류: {error_dict['error']['message']}")
-                else:
-                    raise ValueError(f"OpenAI API 오류: {error_str}")
-    
-    elif model_type == "groq":
-        if not GROQ_AVAILABLE:
-            raise ValueError("Groq 라이브러리가 설치되지 않았습니다. pip install groq")
-        try:
-            client = get_groq_client()
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",  # Groq의 최신 Llama 모델 (llama-3.1-70b-versatile은 2025-01-24 폐기됨)
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=100
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            error_str = str(e)
-            error_dict = parse_error_dict(error_str)
-            
-            # Groq APIError 객체에서 에러 정보 추출
-            if GROQ_ERROR_TYPES_AVAILABLE and isinstance(e, GroqAPIError):
-                if hasattr(e, 'response') and e.response:
-                    try:
-                        error_dict = e.response.json() if hasattr(e.response, 'json') else {}
-                    except:
-                        pass
-                if hasattr(e, 'body'):
-                    try:
-                        if isinstance(e.body, dict):
-                            error_dict = e.body
-                        elif isinstance(e.body, str):
-                            error_dict = json.loads(e.body)
-                    except:
-                        pass
-            
-            # 에러 메시지에서 정보 추출
-            error_code = error_dict.get('error', {}).get('code', '')
-            error_type = error_dict.get('error', {}).get('type', '')
-            
-            if ("model_decommissioned" in error_str or "decommissioned" in error_str.lower() or
-                error_code == 'model_decommissioned' or "llama-3.1-70b-versatile" in error_str):
-                raise ValueError("사용 중인 Groq 모델(llama-3.1-70b-versatile)이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델로 업데이트되었습니다. https://console.groq.com/docs/deprecations")
-            elif ("rate_limit" in error_str.lower() or "429" in error_str or
-                  (GROQ_ERROR_TYPES_AVAILABLE and isinstance(e, GroqRateLimitError))):
-                raise ValueError("Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif ("invalid_api_key" in error_str.lower() or "authentication" in error_str.lower()):
-                raise ValueError("Groq API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                # 원본 에러 메시지에서 핵심 정보만 추출
-                if error_dict.get('error', {}).get('message'):
-                    raise ValueError(f"Groq API 오류: {error_dict['error']['message']}")
-                else:
-                    raise ValueError(f"Groq API 오류: {error_str}")
-    
-    elif model_type == "gemini":
-        if not GEMINI_AVAILABLE:
-            raise ValueError("Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai")
-        model = get_gemini_client()
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    
-    else:
-        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+    system, prompt = get_prompt("title").render(keyword=keyword)
+    return await complete_text(model_type, prompt, 0.7, 100, use_cache=use_cache, system=system)
 
 
-def generate_content(title: str, keyword: str = "", model_type: str = "openai") -> str:
+async def generate_content(title: str, keyword: str = "", model_type: str = "openai", use_cache: bool = True) -> str:
     """
     제목으로부터 블로그 본문 생성
     
@@ -249,114 +305,30 @@ def generate_content(title: str, keyword: str = "", model_type: str = "openai")
         title: 블로그 제목
         keyword: 관련 키워드 (선택)
         model_type: 'openai', 'groq', 'gemini'
+        use_cache: False면 응답 캐시 조회를 건너뜀 (결과는 캐시에 갱신)
     
     Returns:
         생성된 본문
     """
-    prompt = f"""다음 제목을 기반으로 SEO 최적화된 블로그 본문을 작성해주세요.
-
-제목: {title}
-{f'키워드: {keyword}' if keyword else ''}
+    keyword_line = f"\n키워드: {keyword}" if keyword else ""
+    system, prompt = get_prompt("content").render(title=title, keyword_line=keyword_line)
+    return await complete_text(model_type, prompt, 0.4, 4000, use_cache=use_cache, system=system)
 
-중요 지시사항:
-1. 반드시 한국어(한글)로만 작성하세요. 한자, 아랍어, 기타 외국어는 절대 사용하지 마세요.
-2. 한국어 맞춤법과 띄어쓰기 규칙을 정확히 따르세요.
-3. 이모티콘이나 특수문자 사용 금지
-4. 정보 제공 중심의 마케팅 톤 사용 (과장 없이 사실 기반)
-5. "~입니다", "~합니다" 존댓말 사용
-6. 간결하고 읽기 쉬운 문장으로 작성해주세요
 
-요구사항:
-1. 서론: 질문이나 상황 제시로 시작하여 독자의 관심을 끌기 (2-3문단)
-2. 본론: 구체적인 내용을 소제목(##)으로 나누어 설명 (5-7개 소제목)
-   - 각 소제목은 명확한 주제 제시
-   - 각 소제목 아래 2-3개 문단으로 설명
-   - 구체적인 숫자와 예시 반드시 포함
-3. 결론: 타겟 고객층을 명시하고 마무리 (2-3문단)
-4. 제목의 핵심 키워드를 자연스럽게 본문에 3-5회 포함해주세요.
-5. 전체 글자 수는 1500-2500자 정도로 작성해주세요.
-
-다음 형식으로 작성해주세요:
-[서론]
-
-질문이나 상황 제시...
-
-[본론]
-
-## 소제목1
-
-첫 번째 문단 설명...
-
-두 번째 문단 설명...
-
-## 소제목2
-
-첫 번째 문단 설명...
-
-[결론]
-
-타겟 고객층 명시...
-
-마무리 문단..."""
-
-    if model_type == "openai":
-        if not OPENAI_AVAILABLE:
-            raise ValueError("OpenAI 라이브러리가 설치되지 않았습니다. pip install openai")
-        try:
-            client = get_openai_client()
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.4,
-                max_tokens=4000
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            error_str = str(e)
-            if "insufficient_quota" in error_str or "quota" in error_str.lower():
-                raise ValueError("OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("OpenAI API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("OpenAI API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"OpenAI API 오류: {error_str}")
-    
-    elif model_type == "groq":
-        if not GROQ_AVAILABLE:
-            raise ValueError("Groq 라이브러리가 설치되지 않았습니다. pip install groq")
-        try:
-            client = get_groq_client()
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.4,
-                max_tokens=4000
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            error_str = str(e)
-            if "model_decommissioned" in error_str or "decommissioned" in error_str.lower():
-                raise ValueError("사용 중인 Groq 모델이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델을 사용해주세요. https://console.groq.com/docs/deprecations")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("Groq API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"Groq API 오류: {error_str}")
-    
-    elif model_type == "gemini":
-        if not GEMINI_AVAILABLE:
-            raise ValueError("Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai")
-        model = get_gemini_client()
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    
-    else:
-        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+def _build_draft_prompt(topic: str, article_intent: str, target_audience: str, tone_style: str, detailed_keywords: str = "", age_groups: list = None, gender: str = "전체") -> tuple:
+    """초안 생성 프롬프트 구성 → (고정 system 지시문, 요청별 user 내용)"""
+    return get_prompt("draft").render(
+        topic=topic,
+        article_intent=article_intent,
+        target_audience=target_audience,
+        tone_style=tone_style,
+        keywords_line=f"\n세부 키워드: {detailed_keywords}" if detailed_keywords else "",
+        age_groups=", ".join(age_groups) if age_groups else "전체",
+        gender=gender
+    )
 
 
-def generate_draft(topic: str, article_intent: str, target_audience: str, tone_style: str, model_type: str = "openai", detailed_keywords: str = "", age_groups: list = None, gender: str = "전체", api_key: Optional[str] = None) -> str:
+async def generate_draft(topic: str, article_intent: str, target_audience: str, tone_style: str, model_type: str = "openai", detailed_keywords: str = "", age_groups: list = None, gender: str = "전체", api_key: Optional[str] = None, use_cache: bool = True) -> str:
     """
     주제 기반으로 블로그 초안 생성
     
@@ -366,357 +338,96 @@ def generate_draft(topic: str, article_intent: str, target_audience: str, tone_s
         target_audience: 대상 독자
         tone_style: 톤/스타일
         model_type: 'openai', 'groq', 'gemini'
+        use_cache: False면 응답 캐시 조회를 건너뜀 (결과는 캐시에 갱신)
     
     Returns:
         생성된 초안
     """
-    keywords_text = f"\n세부 키워드: {detailed_keywords}" if detailed_keywords else ""
-    age_text = f"\n연령층: {', '.join(age_groups) if age_groups else '전체'}"
-    gender_text = f"\n성별: {gender}"
-    
-    prompt = f"""다음 정보를 바탕으로 블로그 글 초안을 작성해주세요.
-
-주제: {topic}
-글 의도: {article_intent}
-대상 독자: {target_audience}
-톤/스타일: {tone_style}{keywords_text}{age_text}{gender_text}
-
-요구사항:
-1. 주제에 맞는 구체적이고 실용적인 내용 작성
-2. 대상 독자에게 맞는 수준과 톤으로 작성
-3. 글 의도에 맞는 구조로 작성
-   - 정보성: 정보 제공 중심, 객관적 사실 나열
-   - 튜토리얼: 단계별 가이드 형식
-   - 비교/리뷰: 비교 분석과 평가 중심
-   - 방문후기/여행기: 경험 중심의 생생한 묘사
-   - 제품 리뷰/홍보: 제품 특징과 사용 후기
-   - 문제 해결 가이드: 문제-원인-해결책 구조
-   - 교육/강의: 체계적인 학습 내용 전달
-   - 스토리텔링: 이야기 형식의 흥미로운 구성
-   - 브랜딩: 브랜드 가치와 정체성 강조
-   - 설득/마케팅: 설득력 있는 논리와 감성적 어필
-   - 엔터테인먼트: 재미있고 흥미로운 내용
-   - 맛집: 음식과 맛에 대한 상세한 묘사
-   - 일상생각: 개인적 경험과 생각 공유
-   - 상품리뷰: 상품의 장단점과 추천 여부
-   - 경제비즈니스: 경제 동향과 비즈니스 인사이트
-   - IT컴퓨터: 기술적 내용과 사용법
-   - 교육학문: 학술적 내용과 지식 전달
-4. 톤/스타일을 일관되게 유지
-5. **절대적으로 한국어로만 작성**
-   - 한자(漢字, 积累 등) 사용 절대 금지
-   - 일본어(まず, です 등) 사용 절대 금지
-   - 중국어 사용 절대 금지
-   - 영어는 최소한으로만 사용 (필수 전문용어만)
-   - 모든 내용은 한글로만 작성
-   - 숫자는 아라비아 숫자 사용 가능 (1, 2, 3 등)
-6. 1500-2500자 정도로 충실하게 작성
-7. **중요: 마크다운 형식 사용 금지**
-   - **볼드(**텍스트**)**, *이탤릭*, ### 헤딩 등 텍스트 스타일링 마크다운 사용 금지
-   - 해시태그(#컬쳐캐피탈)는 예외로 사용 가능
-   - 일반 텍스트로만 작성 (줄바꿈은 엔터로 구분)
-
-초안:"""
-
-    if model_type == "openai":
-        if not OPENAI_AVAILABLE:
-            raise ValueError("OpenAI 라이브러리가 설치되지 않았습니다. pip install openai")
-        try:
-            client = get_openai_client(api_key=api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            content = response.choices[0].message.content.strip()
-            
-            # 마크다운 스타일링 제거 (해시태그는 유지)
-            import re
-            # **볼드** 제거
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            # *이탤릭* 제거
-            content = re.sub(r'\*(.+?)\*', r'\1', content)
-            # ### 헤딩 제거 (해시태그는 유지하기 위해 공백 뒤에 오는 경우만)
-            content = re.sub(r'^#{1,6}\s+', '', content, flags=re.MULTILINE)
-            
-            # 한자/일본어/중국어/러시아어/베트남어 등 비한글 문자 제거
-            # 한자 범위: \u4e00-\u9fff (CJK 통합 한자)
-            # 히라가나: \u3040-\u309f
-            # 가타카나: \u30a0-\u30ff
-            # 키릴 문자(러시아어): \u0400-\u04ff
-            # 베트남어 확장: \u1e00-\u1eff
-            # 태국어: \u0e00-\u0e7f
-            # 아랍어: \u0600-\u06ff
-            
-            # 한자 제거
-            content = re.sub(r'[\u4e00-\u9fff]+', '', content)
-            # 일본어 히라가나/가타카나 제거
-            content = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', content)
-            # 러시아어 키릴 문자 제거
-            content = re.sub(r'[\u0400-\u04ff]+', '', content)
-            # 베트남어/태국어/아랍어 등 기타 문자 제거
-            content = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', content)
-            
-            return content
-        except Exception as e:
-            error_str = str(e)
-            if "insufficient_quota" in error_str or "quota" in error_str.lower():
-                raise ValueError("OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("OpenAI API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("OpenAI API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"OpenAI API 오류: {error_str}")
-    
-    elif model_type == "groq":
-        if not GROQ_AVAILABLE:
-            raise ValueError("Groq 라이브러리가 설치되지 않았습니다. pip install groq")
-        try:
-            client = get_groq_client(api_key=api_key)
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            content = response.choices[0].message.content.strip()
-            
-            # 마크다운 스타일링 제거 (해시태그는 유지)
-            import re
-            # **볼드** 제거
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            # *이탤릭* 제거
-            content = re.sub(r'\*(.+?)\*', r'\1', content)
-            # ### 헤딩 제거 (해시태그는 유지하기 위해 공백 뒤에 오는 경우만)
-            content = re.sub(r'^#{1,6}\s+', '', content, flags=re.MULTILINE)
-            
-            # 한자/일본어/중국어/러시아어/베트남어 등 비한글 문자 제거
-            # 한자 범위: \u4e00-\u9fff (CJK 통합 한자)
-            # 히라가나: \u3040-\u309f
-            # 가타카나: \u30a0-\u30ff
-            # 키릴 문자(러시아어): \u0400-\u04ff
-            # 베트남어 확장: \u1e00-\u1eff
-            # 태국어: \u0e00-\u0e7f
-            # 아랍어: \u0600-\u06ff
-            
-            # 한자 제거
-            content = re.sub(r'[\u4e00-\u9fff]+', '', content)
-            # 일본어 히라가나/가타카나 제거
-            content = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', content)
-            # 러시아어 키릴 문자 제거
-            content = re.sub(r'[\u0400-\u04ff]+', '', content)
-            # 베트남어/태국어/아랍어 등 기타 문자 제거
-            content = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', content)
-            
-            return content
-        except Exception as e:
-            error_str = str(e)
-            if "model_decommissioned" in error_str or "decommissioned" in error_str.lower():
-                raise ValueError("사용 중인 Groq 모델이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델을 사용해주세요. https://console.groq.com/docs/deprecations")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("Groq API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"Groq API 오류: {error_str}")
-    
-    elif model_type == "gemini":
-        if not GEMINI_AVAILABLE:
-            raise ValueError("Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai")
-        try:
-            model = get_gemini_client(api_key=api_key)
-            response = model.generate_content(prompt)
-            content = response.text.strip()
-            
-            # 마크다운 스타일링 제거 (해시태그는 유지)
-            import re
-            # **볼드** 제거
-            content = re.sub(r'\*\*(.+?)\*\*', r'\1', content)
-            # *이탤릭* 제거
-            content = re.sub(r'\*(.+?)\*', r'\1', content)
-            # ### 헤딩 제거 (해시태그는 유지하기 위해 공백 뒤에 오는 경우만)
-            content = re.sub(r'^#{1,6}\s+', '', content, flags=re.MULTILINE)
-            
-            return content
-        except Exception as e:
-            error_str = str(e)
-            if "quota" in error_str.lower() or "429" in error_str:
-                raise ValueError("Gemini API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower() or "API key" in error_str:
-                raise ValueError("Gemini API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"Gemini API 오류: {error_str}")
-    
-    else:
-        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+    system, prompt = _build_draft_prompt(topic, article_intent, target_audience, tone_style, detailed_keywords, age_groups, gender)
+    content = await complete_text(model_type, prompt, 0.7, 2000, api_key=api_key, use_cache=use_cache, system=system)
+    return _postprocess_draft(content, model_type)
+
+
+def _postprocess_draft(content: str, model_type: str) -> str:
+    # 마크다운 스타일링 제거 (해시태그는 유지), Gemini 초안은 기존과 동일하게 비한글 문자 제거를 하지 않음
+    return sanitize_draft(content, strip_non_korean=(model_type != "gemini"))
 
 
-def analyze_draft(draft_content: str, model_type: str = "openai", api_key: Optional[str] = None) -> dict:
+async def generate_draft_hedged(topic: str, article_intent: str, target_audience: str, tone_style: str, candidates: list, detailed_keywords: str = "", age_groups: list = None, gender: str = "전체", use_cache: bool = True) -> tuple:
+    """
+    generate_draft의 hedged 버전 (응답이 늦거나 실패한 모델은 다음 후보 모델로 대체)
+    
+    Args:
+        candidates: [(model_type, api_key), ...] 첫 항목이 요청한 모델, 나머지는 백업 순서
+    
+    Returns:
+        (생성된 초안, 실제로 응답한 model_type)
+    """
+    system, prompt = _build_draft_prompt(topic, article_intent, target_audience, tone_style, detailed_keywords, age_groups, gender)
+    primary, primary_key = candidates[0]
+    if use_cache and llm_response_cache.enabled:
+        provider = get_provider(primary)
+        cached = await llm_response_cache.get(llm_response_cache.make_key(provider.name, provider.model, prompt, 0.7, 2000, system))
+        if cached is not None:
+            return _postprocess_draft(cached, primary), primary
+
+    content, model_type = await hedged_complete_text(candidates, prompt, 0.7, 2000, system=system)
+    if llm_response_cache.enabled:
+        provider = get_provider(model_type)
+        await llm_response_cache.set(llm_response_cache.make_key(provider.name, provider.model, prompt, 0.7, 2000, system), content)
+    return _postprocess_draft(content, model_type), model_type
+
+
+async def analyze_draft(draft_content: str, model_type: str = "openai", api_key: Optional[str] = None, use_cache: bool = True) -> dict:
     """
     초안의 장단점 분석
     
     Args:
         draft_content: 분석할 초안 내용
         model_type: 'openai', 'groq', 'gemini'
+        use_cache: False면 응답 캐시 조회를 건너뜀 (결과는 캐시에 갱신)
     
     Returns:
         {'pros': [...], 'cons': [...], 'improvement': '...'}
     """
-    prompt = f"""다음 블로그 글 초안을 분석하여 장점, 단점, 개선사항을 제시해주세요.
-
-초안 내용:
-{draft_content}
-
-다음 형식으로 JSON 형태로 응답해주세요:
-{{
-  "pros": ["장점1", "장점2"],
-  "cons": ["단점1", "단점2"],
-  "improvement": "개선 방안을 한 문장으로 제시"
-}}
-
-요구사항:
-1. 장점은 2-3개 정도로 구체적으로 제시
-2. 단점은 1-2개 정도로 구체적으로 제시
-3. 개선사항은 실용적이고 구체적으로 제시
-4. 한국어로만 작성"""
-
-    if model_type == "openai":
-        if not OPENAI_AVAILABLE:
-            raise ValueError("OpenAI 라이브러리가 설치되지 않았습니다. pip install openai")
-        try:
-            client = get_openai_client(api_key=api_key)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            result = json.loads(response.choices[0].message.content.strip())
-            
-            # 비한국어 문자 제거 (pros, cons, improvement)
-            # 파일 상단에서 이미 import re를 했으므로 함수 내부에서 다시 import할 필요 없음
-            def remove_non_korean(text: str) -> str:
-                if not isinstance(text, str):
-                    return text
-                text = re.sub(r'[\u4e00-\u9fff]+', '', text)  # 한자
-                text = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', text)  # 일본어
-                text = re.sub(r'[\u0400-\u04ff]+', '', text)  # 러시아어
-                text = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', text)  # 기타
-                return text
-            
-            if "pros" in result and isinstance(result["pros"], list):
-                result["pros"] = [remove_non_korean(item) for item in result["pros"]]
-            if "cons" in result and isinstance(result["cons"], list):
-                result["cons"] = [remove_non_korean(item) for item in result["cons"]]
-            if "improvement" in result and isinstance(result["improvement"], str):
-                result["improvement"] = remove_non_korean(result["improvement"])
-            
-            return result
-        except Exception as e:
-            error_str = str(e)
-            if "insufficient_quota" in error_str or "quota" in error_str.lower():
-                raise ValueError("OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("OpenAI API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("OpenAI API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"OpenAI API 오류: {error_str}")
-    
-    elif model_type == "groq":
-        if not GROQ_AVAILABLE:
-            raise ValueError("Groq 라이브러리가 설치되지 않았습니다. pip install groq")
-        try:
-            client = get_groq_client(api_key=api_key)
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            result = json.loads(response.choices[0].message.content.strip())
-            
-            # 비한국어 문자 제거 (pros, cons, improvement)
-            # 파일 상단에서 이미 import re를 했으므로 함수 내부에서 다시 import할 필요 없음
-            def remove_non_korean(text: str) -> str:
-                if not isinstance(text, str):
-                    return text
-                text = re.sub(r'[\u4e00-\u9fff]+', '', text)  # 한자
-                text = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', text)  # 일본어
-                text = re.sub(r'[\u0400-\u04ff]+', '', text)  # 러시아어
-                text = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', text)  # 기타
-                return text
-            
-            if "pros" in result and isinstance(result["pros"], list):
-                result["pros"] = [remove_non_korean(item) for item in result["pros"]]
-            if "cons" in result and isinstance(result["cons"], list):
-                result["cons"] = [remove_non_korean(item) for item in result["cons"]]
-            if "improvement" in result and isinstance(result["improvement"], str):
-                result["improvement"] = remove_non_korean(result["improvement"])
-            
-            return result
-        except Exception as e:
-            error_str = str(e)
-            if "model_decommissioned" in error_str or "decommissioned" in error_str.lower():
-                raise ValueError("사용 중인 Groq 모델이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델을 사용해주세요. https://console.groq.com/docs/deprecations")
-            elif "rate_limit" in error_str.lower() or "429" in error_str:
-                raise ValueError("Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-            elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower():
-                raise ValueError("Groq API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-            else:
-                raise ValueError(f"Groq API 오류: {error_str}")
-    
-    elif model_type == "gemini":
-        if not GEMINI_AVAILABLE:
-            raise ValueError("Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai")
-        model = get_gemini_client(api_key=api_key)
-        response = model.generate_content(prompt)
-        # JSON 추출
-        text = response.text.strip()
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
-        if json_match:
-            result = json.loads(json_match.group())
-        else:
-            # JSON 형식이 아니면 파싱 시도
-            result = {"pros": [], "cons": [], "improvement": text}
-        
-        # 비한국어 문자 제거 (pros, cons, improvement)
-        # 한자/일본어/중국어/러시아어/베트남어 등 비한글 문자 제거
-        # 파일 상단에서 이미 import re를 했으므로 함수 내부에서 다시 import할 필요 없음
-        def remove_non_korean(text: str) -> str:
-            if not isinstance(text, str):
-                return text
-            # 한자 제거
-            text = re.sub(r'[\u4e00-\u9fff]+', '', text)
-            # 일본어 히라가나/가타카나 제거
-            text = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', text)
-            # 러시아어 키릴 문자 제거
-            text = re.sub(r'[\u0400-\u04ff]+', '', text)
-            # 베트남어/태국어/아랍어 등 기타 문자 제거
-            text = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', text)
-            return text
-        
-        # pros 리스트에서 비한국어 문자 제거
-        if "pros" in result and isinstance(result["pros"], list):
-            result["pros"] = [remove_non_korean(item) for item in result["pros"]]
-        # cons 리스트에서 비한국어 문자 제거
-        if "cons" in result and isinstance(result["cons"], list):
-            result["cons"] = [remove_non_korean(item) for item in result["cons"]]
-        # improvement 문자열에서 비한국어 문자 제거
-        if "improvement" in result and isinstance(result["improvement"], str):
-            result["improvement"] = remove_non_korean(result["improvement"])
-        
-        return result
-    
-    else:
-        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+    system, prompt = get_prompt("analysis").render(draft_content=draft_content)
+    text = await complete_text(model_type, prompt, 0.7, 1000, api_key=api_key, json_mode=True, use_cache=use_cache, system=system)
+    return _parse_analysis(text)
+
 
+def _build_final_prompt(topic: str, article_intent: str, target_audience: str, tone_style: str, drafts: list, analyses: list, report: Optional[dict] = None) -> tuple:
+    """
+    최종 글 생성 프롬프트 구성 → (고정 system 지시문, 요청별 user 내용)
+
+    초안은 토큰 예산에 맞게 압축(중복 문단 제거, 필요하면 뒤쪽 문단 제거)한 뒤 넣습니다.
+    report에 dict를 넘기면 압축 결과(줄인 토큰 수, 초안별 제거 문단 수)를 채워줍니다.
+    """
+    analyses_text = "\n\n".join([
+        f"## {a['model']} 분석:\n장점: {', '.join(a['pros'])}\n단점: {', '.join(a['cons'])}\n개선: {a['improvement']}"
+        for a in analyses
+    ])
+    template = get_prompt("final")
+    fields = {
+        "topic": topic,
+        "article_intent": article_intent,
+        "target_audience": target_audience,
+        "tone_style": tone_style,
+        "analyses_text": analyses_text,
+    }
+
+    # 초안을 뺀 나머지 프롬프트 토큰 수 기준으로 초안 압축 (최종 생성은 Gemini)
+    system, without_drafts = template.render(drafts_text="", **fields)
+    drafts, compaction = compact_final_inputs(drafts, count_tokens(system + without_drafts, "gemini"), "gemini")
+    if compaction["duplicate_paragraphs"] or compaction["trimmed_paragraphs"]:
+        logger.info("최종 글 입력 압축", extra={"compaction": compaction})
+    if report is not None:
+        report.update(compaction)
 
-def generate_final(topic: str, article_intent: str, target_audience: str, tone_style: str, drafts: list, analyses: list, api_key: Optional[str] = None) -> str:
+    drafts_text = "\n\n".join([f"## {d['model']} 초안:\n{d['content']}" for d in drafts])
+    return template.render(drafts_text=drafts_text, **fields)
+
+
+async def generate_final(topic: str, article_intent: str, target_audience: str, tone_style: str, drafts: list, analyses: list, api_key: Optional[str] = None, report: Optional[dict] = None) -> str:
     """
     3개 모델의 강점을 조합하여 최종 고품질 글 생성
     
@@ -727,125 +438,58 @@ def generate_final(topic: str, article_intent: str, target_audience: str, tone_s
         tone_style: 톤/스타일
         drafts: 초안 리스트 [{'model': '...', 'content': '...'}, ...]
         analyses: 분석 리스트 [{'model': '...', 'pros': [...], 'cons': [...], 'improvement': '...'}, ...]
+        report: dict를 넘기면 입력 압축 결과를 채워줌 (prompt_compaction.compact_final_inputs 참고)
     
     Returns:
         최종 완성 글
     """
-    # 초안과 분석 내용 정리
-    drafts_text = "\n\n".join([f"## {d['model']} 초안:\n{d['content']}" for d in drafts])
-    analyses_text = "\n\n".join([
-        f"## {a['model']} 분석:\n장점: {', '.join(a['pros'])}\n단점: {', '.join(a['cons'])}\n개선: {a['improvement']}"
-        for a in analyses
-    ])
-    
-    prompt = f"""다음 정보를 바탕으로 세 AI 모델의 강점을 모두 조합하여 최고 품질의 블로그 글을 작성해주세요.
-
-주제: {topic}
-글 의도: {article_intent}
-대상 독자: {target_audience}
-톤/스타일: {tone_style}
-
-세 모델의 초안:
-{drafts_text}
-
-세 모델의 장단점 분석:
-{analyses_text}
-
-요구사항:
-1. 세 모델의 장점을 모두 반영하여 작성
-   - ChatGPT의 장점 활용
-   - Gemini의 장점 활용
-   - Groq의 장점 활용
-2. 각 모델의 단점을 보완하여 작성
-3. 각 모델의 개선사항을 반영
-4. 대상 독자에게 맞는 수준과 톤으로 작성
-5. 글 의도에 맞는 구조로 작성
-6. 톤/스타일을 일관되게 유지
-7. 한국어로만 작성 (한자, 외국어 사용 금지)
-8. 3000-5000자 정도로 충실하게 작성
-9. **중요: 마크다운 형식 사용 금지**
-   - **볼드(**텍스트**)**, *이탤릭*, ### 헤딩, ## 소제목 등 텍스트 스타일링 마크다운 사용 금지
-   - 해시태그(#컬쳐캐피탈)는 예외로 사용 가능
-   - 일반 텍스트로만 작성 (줄바꿈은 엔터로 구분)
-
-필수 구조:
-1. 제목: 일반 텍스트로 제목 작성 (마크다운 # 사용 금지)
-2. 서론: 2-3문단으로 독자의 관심을 끌고 주제를 소개
-3. 본론: 
-   - 일반 텍스트로 소제목 작성 (마크다운 ##, ### 사용 금지)
-   - 구체적인 예시, 숫자, 사례 포함
-   - 표는 일반 텍스트로 작성 (마크다운 테이블 형식 사용 금지)
-   - 체크리스트나 불릿 포인트는 일반 텍스트로 작성
-4. 핵심 요약: 불릿 포인트로 주요 내용 정리 (마크다운 사용 금지)
-5. 결론: 2-3문단으로 마무리
-6. 자주 묻는 질문 (FAQ): Q&A 형식으로 3-6개 질문과 답변
-7. 태그: 해시태그 형식으로 5-10개 태그 (#컬쳐캐피탈 형식으로 작성)
-
-글 흐름:
-- 서론에서 독자의 문제나 관심사 제시
-- 본론에서 단계별로 해결책 제시
-- 구체적인 예시와 사례 포함
-- 실전 팁과 체크리스트 제공
-- 표를 활용한 정보 정리
-- 친절하고 명확한 설명
-
-최종 완성 글:"""
+    system, prompt = _build_final_prompt(topic, article_intent, target_audience, tone_style, drafts, analyses, report)
 
     # 최종 생성은 Gemini 사용
-    if not GEMINI_AVAILABLE:
-        raise ValueError("Google Generative AI 라이브러리가 설치되지 않았습니다. pip install google-generativeai")
-    try:
-        model = get_gemini_client(api_key=api_key)
-        response = model.generate_content(prompt)
-        content = response.text.strip()
-        
-        # 마크다운 스타일링 제거 (해시태그는 유지)
-        import re
-        # **볼드** 제거 (여러 줄에 걸쳐 있어도 처리)
-        content = re.sub(r'\*\*([^*]+)\*\*', r'\1', content, flags=re.DOTALL)
-        # *이탤릭* 제거 (단, **볼드**가 아닌 경우만)
-        content = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', r'\1', content)
-        # ### 헤딩 제거 (해시태그는 유지하기 위해 줄 시작에 #이 오는 경우만)
-        content = re.sub(r'^#{1,6}\s+', '', content, flags=re.MULTILINE)
-        # ## 소제목 제거
-        content = re.sub(r'^##\s+', '', content, flags=re.MULTILINE)
-        # ### 하위 소제목 제거
-        content = re.sub(r'^###\s+', '', content, flags=re.MULTILINE)
-        # #### 하위 소제목 제거
-        content = re.sub(r'^####\s+', '', content, flags=re.MULTILINE)
-        # ##### 하위 소제목 제거
-        content = re.sub(r'^#####\s+', '', content, flags=re.MULTILINE)
-        # ###### 하위 소제목 제거
-        content = re.sub(r'^######\s+', '', content, flags=re.MULTILINE)
-        # 남은 단독 * 제거 (볼드/이탤릭 마크다운)
-        content = re.sub(r'\*([^*\n]+)\*', r'\1', content)
-        # 남은 단독 ** 제거
-        content = re.sub(r'\*\*([^*\n]+)\*\*', r'\1', content)
-        
-        # 한자/일본어/중국어/러시아어/베트남어 등 비한글 문자 제거
-        # 한자 범위: \u4e00-\u9fff (CJK 통합 한자)
-        # 히라가나: \u3040-\u309f
-        # 가타카나: \u30a0-\u30ff
-        # 키릴 문자(러시아어): \u0400-\u04ff
-        # 베트남어 확장: \u1e00-\u1eff
-        # 태국어: \u0e00-\u0e7f
-        # 아랍어: \u0600-\u06ff
-        
-        # 한자 제거
-        content = re.sub(r'[\u4e00-\u9fff]+', '', content)
-        # 일본어 히라가나/가타카나 제거
-        content = re.sub(r'[\u3040-\u309f\u30a0-\u30ff]+', '', content)
-        # 러시아어 키릴 문자 제거
-        content = re.sub(r'[\u0400-\u04ff]+', '', content)
-        # 베트남어/태국어/아랍어 등 기타 문자 제거
-        content = re.sub(r'[\u1e00-\u1eff\u0e00-\u0e7f\u0600-\u06ff]+', '', content)
-        
-        return content
-    except Exception as e:
-        error_str = str(e)
-        if "quota" in error_str.lower() or "429" in error_str:
-            raise ValueError("Gemini API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요.")
-        elif "invalid_api_key" in error_str.lower() or "authentication" in error_str.lower() or "API key" in error_str:
-            raise ValueError("Gemini API 키가 유효하지 않습니다. API 키를 확인해주세요.")
-        else:
-            raise ValueError(f"Gemini API 오류: {error_str}")
+    content = await complete_text("gemini", prompt, 0.7, 8192, api_key=api_key, use_cache=False, system=system)  # 최종 글은 응답 캐시 조회 안 함
+
+    # 마크다운 스타일링 제거 (해시태그는 유지) 후 비한글 문자 제거
+    return sanitize_final(content)
+
+
+# ---------------------------------------------------------------------------
+# 스트리밍 생성 (SSE 엔드포인트용)
+# ---------------------------------------------------------------------------
+
+async def stream_draft(topic: str, article_intent: str, target_audience: str, tone_style: str, model_type: str = "openai", detailed_keywords: str = "", age_groups: list = None, gender: str = "전체", api_key: Optional[str] = None) -> AsyncIterator[str]:
+    """
+    generate_draft의 스트리밍 버전
+
+    Yields:
+        마크다운/비한글 문자가 제거된 텍스트 조각
+    """
+    system, prompt = _build_draft_prompt(topic, article_intent, target_audience, tone_style, detailed_keywords, age_groups, gender)
+    # generate_draft와 동일하게 Gemini 초안은 비한글 문자 제거를 하지 않음
+    cleaner = StreamingTextCleaner(remove_non_korean=(model_type != "gemini"))
+    async for piece in stream_text(model_type, prompt, temperature=0.7, max_tokens=2000, api_key=api_key, system=system):
+        text = cleaner.feed(piece)
+        if text:
+            yield text
+    tail = cleaner.flush()
+    if tail:
+        yield tail
+
+
+async def stream_final(topic: str, article_intent: str, target_audience: str, tone_style: str, drafts: list, analyses: list, api_key: Optional[str] = None, report: Optional[dict] = None) -> AsyncIterator[str]:
+    """
+    generate_final의 스트리밍 버전 (Gemini)
+
+    report에 dict를 넘기면 첫 조각을 보내기 전에 입력 압축 결과를 채워줍니다.
+
+    Yields:
+        마크다운/비한글 문자가 제거된 텍스트 조각
+    """
+    system, prompt = _build_final_prompt(topic, article_intent, target_audience, tone_style, drafts, analyses, report)
+    cleaner = StreamingTextCleaner()
+    async for piece in stream_text("gemini", prompt, temperature=0.7, max_tokens=8192, api_key=api_key, system=system):
+        text = cleaner.feed(piece)
+        if text:
+            yield text
+    tail = cleaner.flush()
+    if tail:
+        yield tail
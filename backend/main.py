@@ -1,24 +1,80 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional
-import sys
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional
+from contextlib import asynccontextmanager
 import os
-import jwt
-import time
-from datetime import datetime, timedelta
+import json
+import logging
+import math
+import asyncio
 from dotenv import load_dotenv
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
+# 구조화 로깅 (다른 모듈이 로그를 남기기 전에 설정)
+from app_logging import setup_logging, shutdown_logging, get_logging_stats
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # 현재 디렉토리의 notion 모듈 import
-from notion.auth import check_login, save_article_to_notion, save_usage_log_to_notion, get_user_articles, get_user_api_keys_from_notion, save_user_api_keys_to_notion
-from notion.article_db import save_article_to_notion_db, get_user_articles_from_notion_db
-from llm_service import generate_title, generate_content, generate_draft, analyze_draft, generate_final
+from notion.auth import check_login, save_article_to_notion, get_user_api_keys_from_notion, save_user_api_keys_to_notion, get_api_key_cache_stats, get_user_index_stats, run_user_index_refresher
+from notion.article_db import ArticleQueryError, get_user_articles_from_notion_db, get_user_articles_page_from_notion_db, iter_user_articles_from_notion_db, get_article_from_notion_db, get_article_content_cache_stats
+from notion.http_client import init_notion_http, close_notion_http
+from notion.write_queue import notion_write_queue
+from llm_cache import llm_response_cache, get_llm_cache_stats
+from resilience import get_resilience_stats
+from prompt_compaction import get_prompt_compaction_stats
+from request_limits import RequestBodyLimitMiddleware, get_request_limit_stats
+from metrics import MetricsMiddleware, register_collector, render_metrics
+from jwt_auth import JWTAuth, get_jwt_cache_stats
+from tracing import TracingMiddleware, init_tracing, shutdown_tracing
+from shared_state import init_state_backend, close_state_backend, get_state_backend_stats
+from jobs import final_jobs, get_job_stats, JobError, JobConflictError, TERMINAL_STATUSES, SUCCEEDED, public_view, request_fingerprint, validate_webhook_url
+from llm_errors import LLMError
+from llm_clients import close_llm_clients, get_llm_client_pool_stats
+from llm_service import generate_title, generate_content, generate_draft, generate_draft_hedged, analyze_draft, get_llm_latency_stats, generate_final, stream_draft, stream_final
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 공용 리소스 관리"""
+    # OpenTelemetry 트레이싱 (OTEL_TRACES_EXPORTER 설정 시)
+    init_tracing()
+    # 워커 간 공유 상태 (STATE_BACKEND=redis면 연결 실패 시 시작 중단)
+    await init_state_backend()
+    # Notion 공용 HTTP 클라이언트 (keep-alive 연결 풀 재사용)
+    await init_notion_http()
+    # 로그인용 사용자 인덱스 백그라운드 갱신
+    user_index_task = asyncio.create_task(run_user_index_refresher())
+    # 생성 결과 Notion 저장 워커 (SQLite write-behind 큐)
+    await notion_write_queue.start()
+    try:
+        yield
+    finally:
+        user_index_task.cancel()
+        await asyncio.gather(user_index_task, return_exceptions=True)
+        # 실행 중인 최종 글 작업 (끝나지 않으면 취소 후 failed로 기록 → 재요청 시 다시 실행)
+        await final_jobs.stop()
+        await notion_write_queue.stop()
+        await close_notion_http()
+        await close_llm_clients()
+        llm_response_cache.close()
+        await close_state_backend()
+        shutdown_tracing()
+        shutdown_logging()
 
-app = FastAPI(title="YNK 블로그 자동화")
+
+app = FastAPI(title="YNK 블로그 자동화", lifespan=lifespan)
+
+# 요청 본문 크기 제한 (CORS보다 안쪽에 두어 413 응답에도 CORS 헤더가 붙도록 먼저 등록)
+app.add_middleware(RequestBodyLimitMiddleware)
+# 요청 수/처리 시간 메트릭 (413으로 거절된 요청도 기록되도록 크기 제한보다 바깥에 등록)
+app.add_middleware(MetricsMiddleware)
+# 요청별 server span (X-Workflow-ID 헤더로 글 하나의 호출들을 한 trace로 묶음)
+app.add_middleware(TracingMiddleware)
 
 # CORS 설정
 app.add_middleware(
@@ -33,10 +89,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# JWT 설정
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "ynk-blog-automation-secret-key-change-in-production")  # 프로덕션에서는 환경 변수로 설정
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRATION_HOURS = 24 * 7  # 7일
+# 초안 일괄 생성 시 모델별 응답 제한 시간 (초)
+DRAFT_PROVIDER_TIMEOUT = float(os.getenv("DRAFT_PROVIDER_TIMEOUT", "90"))
+SUPPORTED_MODELS = ("openai", "groq", "gemini")
+# 단일 초안 생성 시 hedged 요청 기본 사용 여부
+DRAFT_HEDGE_ENABLED = os.getenv("DRAFT_HEDGE_ENABLED", "0").lower() in ("1", "true", "yes")
+
+# 요청 필드 길이 제한 (최대 크기 요청도 MAX_REQUEST_BODY_BYTES 안에 들어가도록 맞춤, 초안은 2500자 안팎이지만 모델이 넘길 때를 대비해 여유를 둠)
+MAX_DRAFT_CHARS = int(os.getenv("MAX_DRAFT_CHARS", "8000"))
+MAX_ANALYSIS_ITEM_CHARS = int(os.getenv("MAX_ANALYSIS_ITEM_CHARS", "500"))
+MAX_ARTICLE_CHARS = int(os.getenv("MAX_ARTICLE_CHARS", "20000"))
 
 # 참고: API 키는 이제 Notion Database에 저장됩니다 (user_api_keys 딕셔너리는 사용하지 않음)
 
@@ -44,17 +106,20 @@ JWT_EXPIRATION_HOURS = 24 * 7  # 7일
 class LoginRequest(BaseModel):
     user_id: str
     user_pw: str
+    short_lived: Optional[bool] = False  # True면 JWT_SHORT_EXPIRATION_MINUTES 동안만 유효한 토큰 발급
 
 
 class GenerateTitleRequest(BaseModel):
     keyword: str
     model: str  # 'openai', 'groq', 'gemini'
+    cache: Optional[str] = None  # "bypass"면 응답 캐시를 조회하지 않고 새로 생성
 
 
 class GenerateContentRequest(BaseModel):
     title: str
     keyword: Optional[str] = ""
     model: str  # 'openai', 'groq', 'gemini'
+    cache: Optional[str] = None  # "bypass"면 응답 캐시를 조회하지 않고 새로 생성
 
 
 class GenerateDraftRequest(BaseModel):
@@ -67,12 +132,45 @@ class GenerateDraftRequest(BaseModel):
     gender: Optional[str] = "전체"
     model: str  # 'openai', 'groq', 'gemini'
     api_key: Optional[str] = ""
+    cache: Optional[str] = None  # "bypass"면 응답 캐시를 조회하지 않고 새로 생성
+    hedge: Optional[bool] = None  # 첫 토큰이 늦거나 실패하면 백업 모델로 요청 (없으면 DRAFT_HEDGE_ENABLED)
+    backup_models: Optional[list[str]] = None  # 백업 모델 순서 (없으면 나머지 지원 모델)
+
+
+class GenerateDraftsRequest(BaseModel):
+    topic: str
+    article_intent: str
+    target_audience: str
+    tone_style: str
+    detailed_keywords: Optional[str] = ""
+    age_groups: Optional[list] = []
+    gender: Optional[str] = "전체"
+    models: Optional[list[str]] = list(SUPPORTED_MODELS)  # 동시에 실행할 모델 목록
+    api_keys: Optional[dict[str, str]] = {}  # 모델별 API 키 (없으면 Notion 저장 키 사용)
+    timeout: Optional[float] = None  # 모델별 제한 시간 (초, 없으면 DRAFT_PROVIDER_TIMEOUT)
+    cache: Optional[str] = None  # "bypass"면 응답 캐시를 조회하지 않고 새로 생성
 
 
 class AnalyzeDraftRequest(BaseModel):
     draft_content: str
     model: str  # 'openai', 'groq', 'gemini'
     api_key: Optional[str] = ""
+    cache: Optional[str] = None  # "bypass"면 응답 캐시를 조회하지 않고 새로 생성
+
+
+AnalysisItem = Annotated[str, Field(max_length=MAX_ANALYSIS_ITEM_CHARS)]
+
+
+class DraftInput(BaseModel):
+    model: str = Field(max_length=50)
+    content: str = Field(max_length=MAX_DRAFT_CHARS)
+
+
+class AnalysisInput(BaseModel):
+    model: str = Field(max_length=50)
+    pros: list[AnalysisItem] = Field(default=[], max_length=10)
+    cons: list[AnalysisItem] = Field(default=[], max_length=10)
+    improvement: str = Field(default="", max_length=MAX_ANALYSIS_ITEM_CHARS)
 
 
 class GenerateFinalRequest(BaseModel):
@@ -80,49 +178,26 @@ class GenerateFinalRequest(BaseModel):
     article_intent: str
     target_audience: str
     tone_style: str
-    drafts: list[dict]
-    analyses: list[dict]
+    drafts: list[DraftInput] = Field(max_length=len(SUPPORTED_MODELS))
+    analyses: list[AnalysisInput] = Field(max_length=len(SUPPORTED_MODELS))
     api_key: Optional[str] = ""
     model: Optional[str] = "gemini"  # 기본값은 gemini
     save_to_notion: Optional[bool] = False  # Notion에 저장할지 여부
 
 
+class FinalJobRequest(GenerateFinalRequest):
+    webhook_url: Optional[str] = Field(default=None, max_length=500)  # 완료 시 결과를 POST할 주소 (JOB_WEBHOOK_ALLOWED_HOSTS)
+
+
 class SaveArticleRequest(BaseModel):
     topic: str
-    content: str
+    content: str = Field(max_length=MAX_ARTICLE_CHARS)
     article_intent: str
     target_audience: str
     model: str
     database_id: Optional[str] = None  # Notion Database ID (선택사항)
 
 
-class JWTAuth:
-    @staticmethod
-    def create_token(user_id: str) -> str:
-        """JWT 토큰 생성"""
-        payload = {
-            "user_id": user_id,
-            "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-            "iat": datetime.utcnow()
-        }
-        token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-        return token
-    
-    @staticmethod
-    def verify_token(token: str) -> Optional[str]:
-        """JWT 토큰 검증 및 user_id 반환"""
-        try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-            user_id = payload.get("user_id")
-            return user_id
-        except jwt.ExpiredSignatureError:
-            # 토큰 만료
-            return None
-        except jwt.InvalidTokenError:
-            # 토큰 무효
-            return None
-
-
 def get_jwt_token(request: Request) -> Optional[str]:
     """헤더나 쿠키에서 JWT 토큰 가져오기 (X-Session-ID 헤더 우선)"""
     token = request.headers.get("X-Session-ID")  # X-Session-ID 헤더에서 토큰 가져오기
@@ -131,42 +206,89 @@ def get_jwt_token(request: Request) -> Optional[str]:
     return token
 
 
-def require_auth(request: Request):
+async def require_auth(request: Request):
     """인증이 필요한 엔드포인트용 의존성 (JWT 토큰 기반)"""
     token = get_jwt_token(request)
     
-    # 디버깅 로그
-    print(f"🔍 인증 확인: token={'있음' if token else '없음'}, X-Session-ID={request.headers.get('X-Session-ID', '없음')[:30]}...")
-    
     if not token:
-        print(f"❌ 토큰 없음: 로그인이 필요합니다.")
+        logger.info("인증 실패: 토큰 없음", extra={"path": request.url.path})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="로그인이 필요합니다."
         )
     
     # JWT 토큰 검증
-    user_id = JWTAuth.verify_token(token)
+    user_id = await JWTAuth.verify_token(token)
     
     if not user_id:
-        print(f"❌ 토큰 만료 또는 무효: 토큰이 만료되었거나 유효하지 않습니다.")
+        logger.info("인증 실패: 토큰 만료 또는 무효", extra={"path": request.url.path})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="세션이 만료되었습니다. 다시 로그인해주세요."
         )
     
-    print(f"✅ 인증 성공: user_id={user_id}")
+    logger.debug("인증 성공", extra={"user_id": user_id, "sample": True})
     return user_id
 
 
+async def _resolve_api_key(user_id: str, model_type: str, request_key: Optional[str] = "") -> str:
+    """요청에 API 키가 없으면 Notion Database에 저장된 사용자별 키 사용"""
+    if request_key:
+        return request_key
+    user_keys = await get_user_api_keys_from_notion(user_id)
+    return user_keys.get(model_type, '')
+
+
+async def _enqueue_article_save(**kwargs) -> None:
+    """생성된 글을 Notion 저장 큐에 추가 (Notion 상태와 무관하게 즉시 반환, 실패해도 응답에 영향 없음)"""
+    try:
+        job_id = await notion_write_queue.enqueue_article(**kwargs)
+        logger.info("Notion 저장 대기열 추가", extra={"job_id": job_id, "user_id": kwargs.get("user_id"), "topic": kwargs.get("topic"), "sample": True})
+    except Exception:
+        logger.exception("Notion 저장 대기열 추가 실패", extra={"user_id": kwargs.get("user_id"), "topic": kwargs.get("topic")})
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# SSE 응답 헤더 (프록시 버퍼링 방지)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _llm_http_exception(e: Exception, action: str) -> HTTPException:
+    """
+    LLM 호출 예외를 HTTPException으로 변환
+
+    프로바이더 SDK 예외는 llm_providers에서 이미 llm_errors 타입으로 변환되어 오므로
+    에러 문자열을 파싱하지 않고 타입별 status_code / 안내 메시지 / Retry-After를 그대로 사용합니다.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, LLMError):
+        detail = str(e) if e.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR else f"{action} 중 오류: {e}"
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after is not None else None
+        return HTTPException(status_code=e.status_code, detail=detail, headers=headers)
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"{action} 중 오류: {str(e)}")
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"{action} 중 오류: {str(e)}"
+    )
+
+
 @app.post("/api/auth/login")
 async def login(request: LoginRequest):
     """노션 기반 로그인"""
     try:
-        if check_login(request.user_id, request.user_pw):
-            # JWT 토큰 생성 (7일 유효)
-            token = JWTAuth.create_token(request.user_id)
-            print(f"✅ 로그인 성공: user_id={request.user_id}, JWT 토큰 생성됨 (7일 유효)")
+        if await check_login(request.user_id, request.user_pw):
+            # JWT 토큰 생성 (기본 7일, short_lived면 짧게)
+            token = JWTAuth.create_token(request.user_id, short_lived=bool(request.short_lived))
+            logger.info("로그인 성공", extra={"user_id": request.user_id})
             
             response = JSONResponse({
                 "success": True,
@@ -179,7 +301,7 @@ async def login(request: LoginRequest):
                 httponly=True,
                 samesite="none",  # 다른 도메인 간 요청을 위해 "none" 필요
                 secure=True,  # HTTPS 환경을 위해 필요
-                max_age=JWT_EXPIRATION_HOURS * 3600,  # 7일 (초 단위)
+                max_age=int(JWTAuth.lifetime_seconds(bool(request.short_lived))),  # 토큰 유효 시간 (초 단위)
                 domain=None  # 도메인을 명시하지 않으면 요청 도메인에 자동 설정
             )
             return response
@@ -197,11 +319,13 @@ async def login(request: LoginRequest):
 
 @app.post("/api/auth/logout")
 async def logout(request: Request):
-    """로그아웃"""
-    session_id = get_session_id(request)
-    if session_id:
-        SessionManager.delete_session(session_id)
-    return {"success": True, "message": "로그아웃 완료"}
+    """로그아웃 (토큰을 만료 시각까지 폐기 목록에 추가하고 쿠키 삭제)"""
+    token = get_jwt_token(request)
+    if token:
+        await JWTAuth.revoke_token(token)
+    response = JSONResponse({"success": True, "message": "로그아웃 완료"})
+    response.delete_cookie(key="session_id", httponly=True, samesite="none", secure=True)
+    return response
 
 
 @app.get("/api/auth/check")
@@ -217,13 +341,10 @@ async def generate_title_endpoint(
 ):
     """제목 생성"""
     try:
-        title = generate_title(request.keyword, request.model)
+        title = await generate_title(request.keyword, request.model, use_cache=request.cache != "bypass")
         return {"title": title}
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"제목 생성 중 오류: {str(e)}"
-        )
+        raise _llm_http_exception(e, "제목 생성")
 
 
 @app.post("/api/generate/content")
@@ -233,13 +354,10 @@ async def generate_content_endpoint(
 ):
     """본문 생성"""
     try:
-        content = generate_content(request.title, request.keyword, request.model)
+        content = await generate_content(request.title, request.keyword, request.model, use_cache=request.cache != "bypass")
         return {"content": content}
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"본문 생성 중 오류: {str(e)}"
-        )
+        raise _llm_http_exception(e, "본문 생성")
 
 
 @app.post("/api/generate/draft")
@@ -249,168 +367,220 @@ async def generate_draft_endpoint(
 ):
     """초안 생성 (주제 기반)"""
     try:
-        print(f"📝 초안 생성 요청: user_id={user_id}, model={request.model}, topic={request.topic[:50]}...")
+        logger.info("초안 생성 요청", extra={"user_id": user_id, "model": request.model, "topic": request.topic[:50], "sample": True})
         
         # API 키 가져오기 (사용자별 저장된 키 또는 요청에서 제공된 키)
-        api_key = request.api_key
-        if not api_key:
-            # Notion Database에서 사용자별 저장된 API 키 확인
-            user_keys = get_user_api_keys_from_notion(user_id)
-            if request.model == 'openai':
-                api_key = user_keys.get('openai', '')
-            elif request.model == 'groq':
-                api_key = user_keys.get('groq', '')
-            elif request.model == 'gemini':
-                api_key = user_keys.get('gemini', '')
-        
-        if api_key:
-            print(f"   {request.model.upper()} API 키 사용: {api_key[:10]}...")
+        api_key = await _resolve_api_key(user_id, request.model, request.api_key)
         
-        content = generate_draft(
-            request.topic,
-            request.article_intent,
-            request.target_audience,
-            request.tone_style,
-            request.model,
-            request.detailed_keywords or "",
-            request.age_groups or [],
-            request.gender or "전체",
-            api_key=api_key  # API 키 직접 전달
-        )
+        hedge = DRAFT_HEDGE_ENABLED if request.hedge is None else request.hedge
+        if hedge:
+            # 요청 모델 + 백업 모델 (백업은 사용자별 저장 키 사용)
+            user_keys = await get_user_api_keys_from_notion(user_id)
+            backups = request.backup_models or [m for m in SUPPORTED_MODELS if m != request.model]
+            candidates = [(request.model, api_key)] + [
+                (m, user_keys.get(m, '')) for m in backups if m != request.model and m in SUPPORTED_MODELS
+            ]
+            content, used_model = await generate_draft_hedged(
+                request.topic,
+                request.article_intent,
+                request.target_audience,
+                request.tone_style,
+                candidates,
+                request.detailed_keywords or "",
+                request.age_groups or [],
+                request.gender or "전체",
+                use_cache=request.cache != "bypass"
+            )
+        else:
+            used_model = request.model
+            content = await generate_draft(
+                request.topic,
+                request.article_intent,
+                request.target_audience,
+                request.tone_style,
+                request.model,
+                request.detailed_keywords or "",
+                request.age_groups or [],
+                request.gender or "전체",
+                api_key=api_key,  # API 키 직접 전달
+                use_cache=request.cache != "bypass"
+            )
         
-        print(f"✅ 초안 생성 성공: user_id={user_id}, model={request.model}, content_length={len(content)}")
+        logger.info("초안 생성 성공", extra={"user_id": user_id, "model": used_model, "content_length": len(content), "sample": True})
         
-        # 초안을 Notion 기록용 Database에 저장 (백그라운드, 실패해도 계속 진행)
-        try:
-            success = save_article_to_notion_db(
-                user_id=user_id,
-                topic=request.topic,
-                content=content,
-                article_intent=request.article_intent,
-                target_audience=request.target_audience,
-                model=request.model,
-                article_type="초안"
-            )
-            if success:
-                print(f"✅ 초안 Notion 저장 성공: {user_id} - {request.topic}")
-            else:
-                print(f"❌ 초안 Notion 저장 실패: {user_id} - {request.topic}")
-        except Exception as e:
-            print(f"❌ 초안 Notion 저장 중 예외 발생: {user_id} - {request.topic}")
-            print(f"   에러 상세: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        # 초안을 Notion 기록용 Database 저장 큐에 추가 (워커가 백그라운드로 저장)
+        await _enqueue_article_save(
+            user_id=user_id,
+            topic=request.topic,
+            content=content,
+            article_intent=request.article_intent,
+            target_audience=request.target_audience,
+            model=used_model,
+            article_type="초안"
+        )
         
         # 사용 기록 저장은 별도 Database가 필요하므로 일단 비활성화
         # 필요시 별도 Database를 설정하고 활성화하세요
         # try:
-        #     save_usage_log_to_notion(
+        #     await save_usage_log_to_notion(
         #         user_id=user_id,
         #         action_type="초안생성",
         #         model=request.model,
         #         topic=request.topic
         #     )
         # except Exception as e:
-        #     print(f"사용 기록 저장 실패 (무시): {e}")
+        #     logger.warning(f"사용 기록 저장 실패 (무시): {e}")
         
-        return {"content": content}
+        return {"content": content, "model": used_model}
     except HTTPException:
         # HTTPException은 그대로 전달
         raise
     except Exception as e:
-        error_msg = str(e)
-        error_dict = {}
-        
         # 디버깅 로그
-        print(f"❌ 초안 생성 실패: user_id={user_id}, model={request.model}, error={error_msg}")
-        import traceback
-        traceback.print_exc()
-        
-        # 에러 메시지에서 딕셔너리 추출 시도
-        import json
-        import re
-        import ast
-        # Python 딕셔너리 문자열 찾기 (예: "Error code: 429 - {'error': {...}}")
-        dict_match = re.search(r"Error code: \d+ - (\{.*\})", error_msg, re.DOTALL)
-        if dict_match:
-            try:
-                error_dict = ast.literal_eval(dict_match.group(1))
-            except:
-                try:
-                    # JSON 형식으로 시도
-                    dict_str = dict_match.group(1).replace("'", '"')
-                    error_dict = json.loads(dict_str)
-                except:
-                    pass
-        
-        # OpenAI 할당량 초과 에러 처리 (OpenAI 모델일 때만)
-        error_code = error_dict.get('error', {}).get('code', '')
-        error_type = error_dict.get('error', {}).get('type', '')
-        
-        # 모델 타입에 따라 다른 에러 메시지 표시
-        model_type = getattr(request, 'model', 'unknown')
-        
-        if model_type == 'openai':
-            if ("insufficient_quota" in error_msg or "quota" in error_msg.lower() or 
-                error_code == 'insufficient_quota' or error_type == 'insufficient_quota'):
-                raise HTTPException(
-                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                    detail="OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage"
-                )
-        elif model_type == 'gemini':
-            if ("quota" in error_msg.lower() or "429" in error_msg):
-                raise HTTPException(
-                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                    detail="Gemini API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요. https://ai.google.dev/pricing"
-                )
-            elif ("invalid_api_key" in error_msg.lower() or "authentication" in error_msg.lower() or "API key" in error_msg):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Gemini API 키가 유효하지 않습니다. API 키를 확인해주세요. https://ai.google.dev/"
-                )
-        elif model_type == 'groq':
-            if ("model_decommissioned" in error_msg or "decommissioned" in error_msg.lower() or
-                error_code == 'model_decommissioned' or "llama-3.1-70b-versatile" in error_msg):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="사용 중인 Groq 모델(llama-3.1-70b-versatile)이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델로 업데이트되었습니다. https://console.groq.com/docs/deprecations"
-                )
-            elif ("quota" in error_msg.lower() or "429" in error_msg):
-                raise HTTPException(
-                    status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                    detail="Groq API 요청 한도가 초과되었습니다. 잠시 후 다시 시도해주세요. https://console.groq.com/limits"
-                )
-            elif ("invalid_api_key" in error_msg.lower() or "authentication" in error_msg.lower()):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Groq API 키가 유효하지 않습니다. API 키를 확인해주세요. https://console.groq.com/keys"
-                )
-        
-        # ValueError는 그대로 전달 (API 키 오류 등)
-        if isinstance(e, ValueError):
-            # API 키 관련 오류인지 확인
-            if "API_KEY" in error_msg or "API key" in error_msg or "환경변수" in error_msg:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"{model_type.upper()} API 키가 설정되지 않았습니다. 설정 페이지에서 API 키를 입력해주세요."
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"초안 생성 중 오류: {error_msg}"
-                )
+        logger.exception("초안 생성 실패", extra={"user_id": user_id, "model": request.model})
+        raise _llm_http_exception(e, "초안 생성")
+
+
+@app.post("/api/generate/drafts")
+async def generate_drafts_endpoint(
+    request: GenerateDraftsRequest,
+    user_id: str = Depends(require_auth)
+):
+    """
+    초안 일괄 생성 (여러 모델 동시 실행)
+    
+    사용자 API 키를 한 번만 조회한 뒤 모델별 초안을 asyncio로 동시에 생성하고,
+    먼저 끝난 모델부터 NDJSON 한 줄씩 응답합니다.
+    성공: {"model": "...", "content": "..."} / 실패: {"model": "...", "error": "...", "status_code": ...}
+    """
+    models = list(dict.fromkeys(request.models or SUPPORTED_MODELS))
+    unsupported = [m for m in models if m not in SUPPORTED_MODELS]
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 모델 타입: {', '.join(unsupported)}"
+        )
+    
+    logger.info("초안 일괄 생성 요청", extra={"user_id": user_id, "models": models, "topic": request.topic[:50], "sample": True})
+    
+    # API 키는 요청 단위로 한 번만 조회
+    request_keys = request.api_keys or {}
+    user_keys = {}
+    if any(not request_keys.get(m) for m in models):
+        user_keys = await get_user_api_keys_from_notion(user_id)
+    
+    timeout = request.timeout or DRAFT_PROVIDER_TIMEOUT
+    
+    async def run_one(model_type: str) -> dict:
+        api_key = request_keys.get(model_type) or user_keys.get(model_type, '')
+        try:
+            content = await asyncio.wait_for(
+                generate_draft(
+                    request.topic,
+                    request.article_intent,
+                    request.target_audience,
+                    request.tone_style,
+                    model_type,
+                    request.detailed_keywords or "",
+                    request.age_groups or [],
+                    request.gender or "전체",
+                    api_key=api_key,
+                    use_cache=request.cache != "bypass"
+                ),
+                timeout=timeout
+            )
+            logger.info("초안 생성 성공", extra={"user_id": user_id, "model": model_type, "content_length": len(content), "sample": True})
+            return {"model": model_type, "content": content}
+        except asyncio.TimeoutError:
+            logger.warning("초안 생성 시간 초과", extra={"user_id": user_id, "model": model_type, "timeout": timeout})
+            return {
+                "model": model_type,
+                "error": f"{model_type.upper()} 응답 시간이 초과되었습니다 ({timeout:.0f}초). 잠시 후 다시 시도해주세요.",
+                "status_code": status.HTTP_504_GATEWAY_TIMEOUT
+            }
+        except Exception as e:
+            logger.warning("초안 생성 실패", extra={"user_id": user_id, "model": model_type, "error": str(e)})
+            http_exc = _llm_http_exception(e, "초안 생성")
+            return {"model": model_type, "error": http_exc.detail, "status_code": http_exc.status_code}
+    
+    async def stream_results():
+        tasks = [asyncio.create_task(run_one(m)) for m in models]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+                # Notion 저장은 큐에만 넣고 다음 결과를 바로 전송
+                if "content" in result:
+                    await _enqueue_article_save(
+                        user_id=user_id,
+                        topic=request.topic,
+                        content=result["content"],
+                        article_intent=request.article_intent,
+                        target_audience=request.target_audience,
+                        model=result["model"],
+                        article_type="초안"
+                    )
+        finally:
+            # 클라이언트 연결이 끊기면 남은 생성 작업 취소
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/api/generate/draft/stream")
+async def generate_draft_stream_endpoint(
+    request: GenerateDraftRequest,
+    user_id: str = Depends(require_auth)
+):
+    """
+    초안 생성 스트리밍 (SSE)
+    
+    이벤트: chunk {"text": "..."} → done {"content_length": N} / 실패 시 error {"detail": "...", "status_code": N}
+    """
+    logger.info("초안 스트리밍 요청", extra={"user_id": user_id, "model": request.model, "topic": request.topic[:50], "sample": True})
+    api_key = await _resolve_api_key(user_id, request.model, request.api_key)
+    
+    async def event_stream():
+        # 연결 직후 주석 라인을 보내 첫 바이트를 즉시 전송
+        yield ": connected\n\n"
+        parts = []
+        try:
+            async for text in stream_draft(
+                request.topic,
+                request.article_intent,
+                request.target_audience,
+                request.tone_style,
+                request.model,
+                request.detailed_keywords or "",
+                request.age_groups or [],
+                request.gender or "전체",
+                api_key=api_key
+            ):
+                parts.append(text)
+                yield _sse_event("chunk", {"text": text})
+        except Exception as e:
+            logger.warning("초안 스트리밍 실패", extra={"user_id": user_id, "model": request.model, "error": str(e)})
+            http_exc = _llm_http_exception(e, "초안 생성")
+            yield _sse_event("error", {"detail": http_exc.detail, "status_code": http_exc.status_code})
+            return
         
-        # 에러 메시지에서 핵심 정보 추출
-        if error_dict.get('error', {}).get('message'):
-            clean_msg = error_dict['error']['message']
-        else:
-            clean_msg = error_msg
+        content = "".join(parts)
+        yield _sse_event("done", {"content_length": len(content)})
+        logger.info("초안 스트리밍 완료", extra={"user_id": user_id, "model": request.model, "content_length": len(content), "sample": True})
         
-        # 일반적인 서버 오류
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"초안 생성 중 오류: {clean_msg}"
+        # 응답 완료 후 Notion 기록용 Database 저장 큐에 추가
+        await _enqueue_article_save(
+            user_id=user_id,
+            topic=request.topic,
+            content=content,
+            article_intent=request.article_intent,
+            target_audience=request.target_audience,
+            model=request.model,
+            article_type="초안"
         )
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @app.post("/api/analyze/draft")
@@ -421,82 +591,71 @@ async def analyze_draft_endpoint(
     """초안 장단점 분석"""
     try:
         # API 키 가져오기 (사용자별 저장된 키 또는 요청에서 제공된 키)
-        api_key = request.api_key
-        if not api_key:
-            # Notion Database에서 사용자별 저장된 API 키 확인
-            user_keys = get_user_api_keys_from_notion(user_id)
-            if request.model == 'openai':
-                api_key = user_keys.get('openai', '')
-            elif request.model == 'groq':
-                api_key = user_keys.get('groq', '')
-            elif request.model == 'gemini':
-                api_key = user_keys.get('gemini', '')
-        
-        if api_key:
-            print(f"   {request.model.upper()} API 키 사용: {api_key[:10]}...")
+        api_key = await _resolve_api_key(user_id, request.model, request.api_key)
         
-        result = analyze_draft(request.draft_content, request.model, api_key=api_key)
+        result = await analyze_draft(request.draft_content, request.model, api_key=api_key, use_cache=request.cache != "bypass")
         
         # 사용 기록 저장은 별도 Database가 필요하므로 일단 비활성화
         # 필요시 별도 Database를 설정하고 활성화하세요
         # try:
-        #     save_usage_log_to_notion(
+        #     await save_usage_log_to_notion(
         #         user_id=user_id,
         #         action_type="장단점분석",
         #         model=request.model,
         #         topic="분석 완료"
         #     )
         # except Exception as e:
-        #     print(f"사용 기록 저장 실패 (무시): {e}")
+        #     logger.warning(f"사용 기록 저장 실패 (무시): {e}")
         
         return result
     except Exception as e:
-        error_msg = str(e)
-        error_dict = {}
-        
-        # 에러 메시지에서 딕셔너리 추출 시도
-        import json
-        import re
-        import ast
-        # Python 딕셔너리 문자열 찾기 (예: "Error code: 429 - {'error': {...}}")
-        dict_match = re.search(r"Error code: \d+ - (\{.*\})", error_msg, re.DOTALL)
-        if dict_match:
-            try:
-                error_dict = ast.literal_eval(dict_match.group(1))
-            except:
-                try:
-                    # JSON 형식으로 시도
-                    dict_str = dict_match.group(1).replace("'", '"')
-                    error_dict = json.loads(dict_str)
-                except:
-                    pass
-        
-        # OpenAI 할당량 초과 에러 처리
-        error_code = error_dict.get('error', {}).get('code', '')
-        error_type = error_dict.get('error', {}).get('type', '')
-        
-        if ("insufficient_quota" in error_msg or "quota" in error_msg.lower() or 
-            error_code == 'insufficient_quota' or error_type == 'insufficient_quota'):
-            raise HTTPException(
-                status_code=status.HTTP_402_PAYMENT_REQUIRED,
-                detail="OpenAI API 할당량이 초과되었습니다. 계정의 결제 정보와 사용량을 확인해주세요. https://platform.openai.com/usage"
-            )
-        # Groq 모델 에러 처리
-        if ("model_decommissioned" in error_msg or "decommissioned" in error_msg.lower() or
-            error_code == 'model_decommissioned' or "llama-3.1-70b-versatile" in error_msg):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="사용 중인 Groq 모델(llama-3.1-70b-versatile)이 더 이상 지원되지 않습니다. llama-3.3-70b-versatile 모델로 업데이트되었습니다. https://console.groq.com/docs/deprecations"
-            )
-        # 에러 메시지에서 핵심 정보 추출
-        if error_dict.get('error', {}).get('message'):
-            clean_msg = error_dict['error']['message']
-        else:
-            clean_msg = error_msg
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"장단점 분석 중 오류: {clean_msg}"
-        )
+        raise _llm_http_exception(e, "장단점 분석")
+
+
+async def _run_final_generation(user_id: str, request: GenerateFinalRequest) -> dict:
+    """최종 글 생성 후 Notion 저장 큐에 추가 (동기 엔드포인트와 작업 API 공용)"""
+    # API 키 가져오기 (사용자별 저장된 키 또는 요청에서 제공된 키)
+    model = request.model or 'gemini'
+    api_key = await _resolve_api_key(user_id, model, request.api_key)
+    
+    compaction = {}
+    content = await generate_final(
+        request.topic,
+        request.article_intent,
+        request.target_audience,
+        request.tone_style,
+        [d.model_dump() for d in request.drafts],
+        [a.model_dump() for a in request.analyses],
+        api_key=api_key,  # API 키 직접 전달
+        report=compaction  # 토큰 예산에 맞춰 초안을 줄인 내역
+    )
+    
+    logger.info("최종 글 생성 성공", extra={"user_id": user_id, "content_length": len(content), "compaction": compaction})
+    
+    # 최종 글을 Notion 기록용 Database 저장 큐에 추가 (워커가 백그라운드로 저장)
+    await _enqueue_article_save(
+        user_id=user_id,
+        topic=request.topic,
+        content=content,
+        article_intent=request.article_intent,
+        target_audience=request.target_audience,
+        model=model,
+        article_type="최종글"
+    )
+    
+    # 사용 기록 저장은 별도 Database가 필요하므로 일단 비활성화
+    # 필요시 별도 Database를 설정하고 활성화하세요
+    # try:
+    #     await save_usage_log_to_notion(
+    #         user_id=user_id,
+    #         action_type="최종글생성",
+    #         model=request.model or "gemini",
+    #         topic=request.topic
+    #     )
+    # except Exception as e:
+    #     logger.warning(f"사용 기록 저장 실패 (무시): {e}")
+    
+    return {"content": content, "compaction": compaction}
 
 
 @app.post("/api/generate/final")
@@ -506,75 +665,153 @@ async def generate_final_endpoint(
 ):
     """최종 고품질 글 생성 (3개 모델 강점 조합)"""
     try:
-        print(f"📝 최종 글 생성 요청: user_id={user_id}, model={request.model or 'gemini'}")
-        
-        # API 키 가져오기 (사용자별 저장된 키 또는 요청에서 제공된 키)
-        model = request.model or 'gemini'
-        api_key = request.api_key
-        if not api_key:
-            # Notion Database에서 사용자별 저장된 API 키 확인
-            user_keys = get_user_api_keys_from_notion(user_id)
-            if model == 'gemini':
-                api_key = user_keys.get('gemini', '')
-            elif model == 'openai':
-                api_key = user_keys.get('openai', '')
-            elif model == 'groq':
-                api_key = user_keys.get('groq', '')
-        
-        if api_key:
-            print(f"   {model.upper()} API 키 사용: {api_key[:10]}...")
-        
-        content = generate_final(
-            request.topic,
-            request.article_intent,
-            request.target_audience,
-            request.tone_style,
-            request.drafts,
-            request.analyses,
-            api_key=api_key  # API 키 직접 전달
-        )
-        
-        print(f"✅ 최종 글 생성 성공: user_id={user_id}, content_length={len(content)}")
-        
-        # 최종 글을 Notion 기록용 Database에 자동 저장 (백그라운드, 실패해도 계속 진행)
+        logger.info("최종 글 생성 요청", extra={"user_id": user_id, "model": request.model or "gemini"})
+        return await _run_final_generation(user_id, request)
+    except Exception as e:
+        raise _llm_http_exception(e, "최종 생성")
+
+
+@app.post("/api/generate/final/stream")
+async def generate_final_stream_endpoint(
+    request: GenerateFinalRequest,
+    user_id: str = Depends(require_auth)
+):
+    """
+    최종 글 생성 스트리밍 (SSE)
+    
+    이벤트: chunk {"text": "..."} → done {"content_length": N, "compaction": {...}} / 실패 시 error {"detail": "...", "status_code": N}
+    """
+    model = request.model or 'gemini'
+    logger.info("최종 글 스트리밍 요청", extra={"user_id": user_id, "model": model})
+    api_key = await _resolve_api_key(user_id, model, request.api_key)
+    
+    async def event_stream():
+        yield ": connected\n\n"
+        parts = []
+        compaction = {}
         try:
-            success = save_article_to_notion_db(
-                user_id=user_id,
-                topic=request.topic,
-                content=content,
-                article_intent=request.article_intent,
-                target_audience=request.target_audience,
-                model=request.model or "gemini",
-                article_type="최종글"
-            )
-            if success:
-                print(f"✅ 최종 글 Notion 저장 성공: {user_id} - {request.topic}")
-            else:
-                print(f"❌ 최종 글 Notion 저장 실패: {user_id} - {request.topic}")
+            async for text in stream_final(
+                request.topic,
+                request.article_intent,
+                request.target_audience,
+                request.tone_style,
+                [d.model_dump() for d in request.drafts],
+                [a.model_dump() for a in request.analyses],
+                api_key=api_key,
+                report=compaction
+            ):
+                parts.append(text)
+                yield _sse_event("chunk", {"text": text})
         except Exception as e:
-            print(f"❌ 최종 글 Notion 저장 중 예외 발생: {user_id} - {request.topic}")
-            print(f"   에러 상세: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("최종 글 스트리밍 실패", extra={"user_id": user_id, "error": str(e)})
+            http_exc = _llm_http_exception(e, "최종 생성")
+            yield _sse_event("error", {"detail": http_exc.detail, "status_code": http_exc.status_code})
+            return
         
-        # 사용 기록 저장은 별도 Database가 필요하므로 일단 비활성화
-        # 필요시 별도 Database를 설정하고 활성화하세요
-        # try:
-        #     save_usage_log_to_notion(
-        #         user_id=user_id,
-        #         action_type="최종글생성",
-        #         model=request.model or "gemini",
-        #         topic=request.topic
-        #     )
-        # except Exception as e:
-        #     print(f"사용 기록 저장 실패 (무시): {e}")
+        content = "".join(parts)
+        yield _sse_event("done", {"content_length": len(content), "compaction": compaction})
+        logger.info("최종 글 스트리밍 완료", extra={"user_id": user_id, "content_length": len(content), "compaction": compaction})
         
-        return {"content": content}
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"최종 생성 중 오류: {str(e)}"
+        await _enqueue_article_save(
+            user_id=user_id,
+            topic=request.topic,
+            content=content,
+            article_intent=request.article_intent,
+            target_audience=request.target_audience,
+            model=model,
+            article_type="최종글"
         )
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.post("/api/jobs/final", status_code=status.HTTP_202_ACCEPTED)
+async def create_final_job_endpoint(
+    request: FinalJobRequest,
+    user_id: str = Depends(require_auth),
+    idempotency_key: Optional[str] = Header(default=None, max_length=200)
+):
+    """
+    최종 글 생성 작업 등록 (연결이 끊겨도 서버에서 계속 실행)
+    
+    같은 Idempotency-Key(없으면 같은 요청 본문)로 다시 보내면 진행 중/완료된 작업을 그대로 반환하고 LLM을 다시 호출하지 않습니다.
+    실패하거나 중단된 작업은 다시 보내면 재실행합니다.
+    결과: GET /api/jobs/{id} (폴링), GET /api/jobs/{id}/events (SSE), webhook_url (완료 시 POST)
+    """
+    if request.webhook_url:
+        try:
+            validate_webhook_url(request.webhook_url)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def run() -> dict:
+        try:
+            return await _run_final_generation(user_id, request)
+        except Exception as e:
+            http_exc = _llm_http_exception(e, "최종 생성")
+            retry_after = (http_exc.headers or {}).get("Retry-After")
+            raise JobError(http_exc.detail, http_exc.status_code, float(retry_after) if retry_after else None)
+    
+    fingerprint = request_fingerprint(request.model_dump(exclude={"api_key", "webhook_url"}))
+    try:
+        job, created = await final_jobs.submit(user_id, fingerprint, run, idempotency_key=idempotency_key, webhook_url=request.webhook_url)
+    except JobConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    logger.info("최종 글 작업 요청", extra={"user_id": user_id, "job_id": job["id"], "new_job": created})
+    return public_view(job)
+
+
+async def _get_job_or_404(job_id: str, user_id: str) -> dict:
+    job = await final_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_endpoint(
+    job_id: str,
+    user_id: str = Depends(require_auth)
+):
+    """작업 상태 조회 (succeeded면 result에 결과, failed/interrupted면 error에 사유)"""
+    return public_view(await _get_job_or_404(job_id, user_id))
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def get_job_events_endpoint(
+    job_id: str,
+    user_id: str = Depends(require_auth)
+):
+    """
+    작업 상태 스트리밍 (SSE)
+    
+    이벤트: status {"status": "..."} → 성공 시 done {작업 정보}, 실패/중단 시 error {"detail": "...", "status_code": N}
+    연결이 끊기면 같은 주소로 다시 연결하면 됩니다. (작업은 연결과 관계없이 계속 실행)
+    """
+    job = await _get_job_or_404(job_id, user_id)
+    
+    async def event_stream():
+        yield ": connected\n\n"
+        current = job
+        last_status = None
+        while True:
+            if current is None:
+                yield _sse_event("error", {"detail": "작업을 찾을 수 없습니다.", "status_code": 404})
+                return
+            if current["status"] != last_status:
+                last_status = current["status"]
+                yield _sse_event("status", {"status": last_status})
+            if last_status == SUCCEEDED:
+                yield _sse_event("done", public_view(current))
+                return
+            if last_status in TERMINAL_STATUSES:
+                yield _sse_event("error", current.get("error") or {"detail": "작업 실패", "status_code": 500})
+                return
+            yield ": waiting\n\n"
+            await final_jobs.wait_for_change(job_id)
+            current = await final_jobs.get(job_id, user_id)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
 @app.post("/api/save/article")
@@ -584,7 +821,7 @@ async def save_article_endpoint(
 ):
     """생성된 글을 Notion에 저장"""
     try:
-        success = save_article_to_notion(
+        success = await save_article_to_notion(
             user_id=user_id,
             topic=request.topic,
             content=request.content,
@@ -610,13 +847,55 @@ async def save_article_endpoint(
 @app.get("/api/history/articles")
 async def get_user_articles_endpoint(
     user_id: str = Depends(require_auth),
-    database_id: Optional[str] = None
+    database_id: Optional[str] = None,
+    include_content: bool = True,
+    page_size: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """사용자가 생성한 글 목록 조회 (기록용 Database)"""
+    """
+    사용자가 생성한 글 목록 조회 (기록용 Database)
+    
+    - 기본: 전체 목록을 {"articles": [...]}로 반환
+    - page_size/cursor: Notion 커서를 그대로 사용해 한 페이지만 반환 ({"articles", "next_cursor", "has_more"})
+    - format=ndjson: 글을 한 줄씩 스트리밍 (Notion에서 한 페이지씩 읽으므로 메모리 사용량이 일정)
+      중간에 Notion 조회가 실패하면 마지막 줄로 {"error", "status_code"}를 보냄
+    Notion 조회 실패는 빈 목록 대신 502로 응답
+    include_content=false면 메타데이터와 미리보기만 반환하고 본문은 /api/history/articles/{article_id}로 조회
+    """
     try:
+        if format == "ndjson":
+            async def stream_articles():
+                try:
+                    async for article in iter_user_articles_from_notion_db(
+                        user_id, database_id,
+                        include_content=include_content,
+                        page_size=page_size or 100,
+                        cursor=cursor
+                    ):
+                        yield json.dumps(article, ensure_ascii=False) + "\n"
+                except ArticleQueryError as e:
+                    # 응답 헤더가 이미 전송되었으므로 마지막 줄로 오류를 알려 목록이 잘렸음을 구분
+                    yield json.dumps({"error": str(e), "status_code": 502}, ensure_ascii=False) + "\n"
+            
+            return StreamingResponse(stream_articles(), media_type="application/x-ndjson")
+        
+        if page_size or cursor:
+            return await get_user_articles_page_from_notion_db(
+                user_id, database_id,
+                include_content=include_content,
+                page_size=page_size or 100,
+                cursor=cursor
+            )
+        
         # 기록용 Database에서 조회
-        articles = get_user_articles_from_notion_db(user_id, database_id)
+        articles = await get_user_articles_from_notion_db(user_id, database_id, include_content=include_content)
         return {"articles": articles}
+    except ArticleQueryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -624,6 +903,21 @@ async def get_user_articles_endpoint(
         )
 
 
+@app.get("/api/history/articles/{article_id}")
+async def get_user_article_endpoint(
+    article_id: str,
+    user_id: str = Depends(require_auth)
+):
+    """글 한 개의 전체 본문 조회 (목록 지연 로딩용)"""
+    article = await get_article_from_notion_db(user_id, article_id)
+    if not article:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="글을 찾을 수 없습니다."
+        )
+    return {"article": article}
+
+
 class ApiKeysRequest(BaseModel):
     openai: Optional[str] = ""
     groq: Optional[str] = ""
@@ -652,7 +946,7 @@ async def save_api_keys(
         gemini_key = request.gemini.strip() if (request.gemini and request.gemini.strip()) else ""
         
         # Notion Database에 저장 (save_user_api_keys_to_notion이 빈 문자열 처리)
-        success = save_user_api_keys_to_notion(
+        success = await save_user_api_keys_to_notion(
             user_id=user_id,
             openai_key=openai_key,
             groq_key=groq_key,
@@ -665,19 +959,17 @@ async def save_api_keys(
                 detail="Notion Database에 API 키 저장에 실패했습니다."
             )
         
-        # 저장 후 최종 값 조회 (로그용)
-        final_keys = get_user_api_keys_from_notion(user_id)
+        # 저장 후 최종 값 조회 (로그용, write-through 캐시에서 조회되므로 Notion 호출 없음)
+        final_keys = await get_user_api_keys_from_notion(user_id)
         
         # 디버깅 로그
-        print(f"✅ API 키 저장 완료 (Notion): user_id='{user_id}', openai={'설정됨' if final_keys.get('openai') else '없음'}, groq={'설정됨' if final_keys.get('groq') else '없음'}, gemini={'설정됨' if final_keys.get('gemini') else '없음'}")
+        logger.info("API 키 저장 완료", extra={"user_id": user_id, "configured": [name for name in SUPPORTED_MODELS if final_keys.get(name)]})
         
         return {"success": True, "message": "API 키가 저장되었습니다."}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API 키 저장 실패: user_id='{user_id}', error={str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("API 키 저장 실패", extra={"user_id": user_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"API 키 저장 중 오류: {str(e)}"
@@ -700,24 +992,76 @@ async def get_api_keys(
         user_id = user_id.strip()
         
         # Notion Database에서 조회
-        api_keys = get_user_api_keys_from_notion(user_id)
+        api_keys = await get_user_api_keys_from_notion(user_id)
         
         # 디버깅 로그
-        print(f"🔍 API 키 조회 (Notion): user_id='{user_id}', openai={'설정됨' if api_keys.get('openai') else '없음'}, groq={'설정됨' if api_keys.get('groq') else '없음'}, gemini={'설정됨' if api_keys.get('gemini') else '없음'}")
+        logger.debug("API 키 조회", extra={"user_id": user_id, "configured": [name for name in SUPPORTED_MODELS if api_keys.get(name)]})
         
         return {"api_keys": api_keys}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ API 키 조회 실패: user_id='{user_id}', error={str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("API 키 조회 실패", extra={"user_id": user_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"API 키 조회 중 오류: {str(e)}"
         )
 
 
+@app.get("/api/stats/cache")
+async def get_cache_stats(
+    user_id: str = Depends(require_auth)
+):
+    """프로세스 내 캐시 hit/miss 통계"""
+    return {
+        "state_backend": get_state_backend_stats(),
+        "api_keys": get_api_key_cache_stats(),
+        "jwt": get_jwt_cache_stats(),
+        "user_index": get_user_index_stats(),
+        "article_content": get_article_content_cache_stats(),
+        "notion_write_queue": await notion_write_queue.stats(),
+        "llm_clients": get_llm_client_pool_stats(),
+        "llm_responses": get_llm_cache_stats(),
+        "llm_latency": get_llm_latency_stats(),
+        "llm_resilience": get_resilience_stats(),
+        "llm_prompt_compaction": get_prompt_compaction_stats(),
+        "request_limits": get_request_limit_stats(),
+        "logging": get_logging_stats(),
+        "jobs": get_job_stats(),
+    }
+
+
+def _cache_metrics() -> list:
+    """/metrics용 캐시 적중률 (각 모듈의 stats()를 scrape 시점에 읽음)"""
+    caches = {
+        "api_keys": get_api_key_cache_stats(),
+        "jwt": get_jwt_cache_stats(),
+        "article_content": get_article_content_cache_stats(),
+        "llm_responses": get_llm_cache_stats(),
+    }
+    return [
+        ("cache_hit_ratio", "gauge", "캐시 적중률", [({"cache": name}, stats["hit_rate"]) for name, stats in caches.items()]),
+        ("cache_entries", "gauge", "캐시 항목 수", [
+            ({"cache": name}, stats.get("size", stats.get("memory_size"))) for name, stats in caches.items()
+        ]),
+        ("user_index_entries", "gauge", "로그인 인덱스 사용자 수", [({}, get_user_index_stats()["size"])]),
+    ]
+
+
+register_collector(_cache_metrics)
+
+# 설정하면 /metrics 요청에 "Authorization: Bearer <토큰>" 필요
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint(request: Request):
+    """Prometheus 텍스트 형식 메트릭 (단계별 지연 히스토그램, 토큰 수, 캐시 적중률, 진행 중 요청 수)"""
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="메트릭 토큰이 필요합니다.")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/")
 async def root():
     return {"message": "YNK 블로그 자동화 API"}
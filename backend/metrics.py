@@ -0,0 +1,248 @@
+"""
+프로세스 내 Prometheus 메트릭 (텍스트 exposition 형식)
+
+prometheus_client 없이 Counter / Gauge / Histogram만 직접 구현합니다.
+초안 3개 → 분석 3개 → 최종 글 파이프라인에서 어느 단계가 오래 걸리는지 보기 위해
+HTTP 엔드포인트, JWT 검증, Notion 요청, LLM 첫 토큰/전체 시간을 단계별 히스토그램으로 기록합니다.
+캐시 적중률처럼 다른 모듈이 이미 세고 있는 값은 scrape 시점에 register_collector로 읽어옵니다.
+"""
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# 초 단위 기본 버킷 (JWT 검증 ~ 최종 글 생성까지)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+logger = logging.getLogger(__name__)
+
+_metrics: list = []
+_collectors: list = []
+_lock = threading.Lock()
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: tuple, values: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict = {}
+        with _lock:
+            _metrics.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple, value) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inflight(self, **labels):
+        """블록 실행 중 1 증가"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """블록 실행 시간(초) 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_sample(self, key: tuple, value) -> list:
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def register_collector(collect: Callable[[], list]) -> None:
+    """
+    scrape 시점에 값을 읽어오는 수집 함수 등록
+
+    collect()는 [(이름, 종류, 설명, [(라벨 dict, 값), ...]), ...]를 반환합니다.
+    """
+    _collectors.append(collect)
+
+
+def render_metrics() -> str:
+    """모든 메트릭을 Prometheus 텍스트 형식으로 출력"""
+    lines = []
+    for metric in list(_metrics):
+        lines.extend(metric.render())
+    for collect in list(_collectors):
+        try:
+            families = collect()
+        except Exception as e:
+            logger.warning("메트릭 수집 실패", extra={"collector": collect.__name__, "error": str(e)})
+            continue
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                lines.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 수/처리 시간 기록 (ASGI 미들웨어)
+
+    route 라벨은 매칭된 엔드포인트 함수 이름을 사용합니다. (경로 파라미터별로 라벨이 늘어나지 않도록)
+    스트리밍 응답은 마지막 조각을 보낼 때까지를 처리 시간으로 봅니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            endpoint = scope.get("endpoint")
+            route = getattr(endpoint, "__name__", "unmatched")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start, route=route, method=scope["method"], status=status_code
+            )
+
+        async def tracked_send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        with http_requests_in_flight.track_inflight():
+            try:
+                await self.app(scope, receive, tracked_send)
+            finally:
+                record()
+
+
+# ---------------------------------------------------------------------------
+# 앱 공용 메트릭
+# ---------------------------------------------------------------------------
+
+http_requests_in_flight = Gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수", ())
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 마지막 조각 전송까지)", ("route", "method", "status")
+)
+jwt_verify_duration_seconds = Histogram(
+    "jwt_verify_duration_seconds", "JWT 토큰 검증 시간", ("result",),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+)
+notion_request_duration_seconds = Histogram(
+    "notion_request_duration_seconds", "Notion API 요청 시간", ("operation", "status")
+)
+notion_requests_in_flight = Gauge("notion_requests_in_flight", "진행 중인 Notion API 요청 수", ())
+llm_first_token_seconds = Histogram("llm_first_token_seconds", "LLM 스트리밍 첫 토큰까지 걸린 시간", ("provider", "model"))
+llm_request_duration_seconds = Histogram(
+    "llm_request_duration_seconds", "LLM 호출 전체 시간", ("provider", "model", "mode", "outcome")
+)
+llm_requests_in_flight = Gauge("llm_requests_in_flight", "진행 중인 LLM 호출 수", ("provider",))
+llm_tokens_total = Counter(
+    "llm_tokens_total", "LLM 입력/출력 토큰 수 (prompt_compaction.count_tokens 기준, tiktoken이 없으면 근사치)",
+    ("provider", "model", "kind")
+)
+jobs_total = Counter("jobs_total", "비동기 작업 요청/결과 수", ("kind", "outcome"))
+jobs_running = Gauge("jobs_running", "이 프로세스에서 실행 중인 비동기 작업 수", ("kind",))
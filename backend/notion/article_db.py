@@ -1,36 +1,37 @@
 # notion/article_db.py
 # 기록 저장용 Notion Database 설정
 import os
-import traceback
+import asyncio
+import logging
+from typing import Optional
 from dotenv import load_dotenv
 
+from notion.http_client import get_notion_http, notion_headers
+from ttl_cache import TTLCache
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
-try:
-    from notion_client import Client
-    import httpx
-    
-    ARTICLE_NOTION_AVAILABLE = True
-except ImportError:
-    ARTICLE_NOTION_AVAILABLE = False
-    import httpx
+logger = logging.getLogger(__name__)
 
+# 기록 조회 시 페이지 본문 동시 요청 수
+ARTICLE_CONTENT_CONCURRENCY = int(os.getenv("ARTICLE_CONTENT_CONCURRENCY", "8"))
 
-def _get_article_notion_client():
-    """Notion 클라이언트를 생성합니다 (환경 변수에서 API 키를 읽음)"""
-    if not ARTICLE_NOTION_AVAILABLE:
-        return None
-    
-    api_key = os.getenv("ARTICLE_NOTION_API_KEY", "")
-    if not api_key:
-        return None
-    
-    try:
-        return Client(auth=api_key)
-    except Exception as e:
-        print(f"⚠️ Notion 클라이언트 생성 실패: {e}")
-        return None
+# 페이지 본문 캐시: (page_id, last_edited_time) 키이므로 페이지가 수정되면 자연히 새 항목으로 조회됨
+_page_content_cache = TTLCache(
+    maxsize=int(os.getenv("ARTICLE_CONTENT_CACHE_SIZE", "500")),
+    ttl=float(os.getenv("ARTICLE_CONTENT_CACHE_TTL", "3600")),
+    name="article_content"
+)
+
+
+class ArticleQueryError(Exception):
+    """Notion 기록용 Database 조회 실패 (빈 결과와 구분하기 위해 사용)"""
+
+
+def get_article_content_cache_stats() -> dict:
+    """페이지 본문 캐시 hit/miss 통계"""
+    return _page_content_cache.stats()
 
 
 def _get_article_notion_api_key():
@@ -162,7 +163,7 @@ def _split_content_into_blocks(content: str, max_length: int = 2000) -> list:
     ]
 
 
-def save_article_to_notion_db(
+async def save_article_to_notion_db(
     user_id: str,
     topic: str,
     content: str,
@@ -187,126 +188,24 @@ def save_article_to_notion_db(
     Returns:
         저장 성공 여부
     """
-    if not ARTICLE_NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return False
-    
     # 환경 변수에서 API 키와 Database ID 읽기
     article_api_key = _get_article_notion_api_key()
     article_db_id = _get_article_database_id()
     
     if not article_db_id and not database_id:
-        print("오류: Database ID가 설정되지 않았습니다. ARTICLE_DATABASE_ID를 설정하거나 database_id를 제공하세요.")
+        logger.error("Database ID가 설정되지 않았습니다. ARTICLE_DATABASE_ID를 설정하거나 database_id를 제공하세요.")
         return False
     
     if not article_api_key:
-        print("오류: ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
+        logger.error("ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
         return False
     
     # Database ID가 제공되지 않으면 기본값 사용
     target_db_id = database_id or article_db_id
     
     try:
-        # Notion API로 페이지 생성
         from datetime import datetime
         
-        # 방법 1: notion-client 사용
-        article_notion = _get_article_notion_client()
-        if article_notion:
-            try:
-                article_notion.pages.create(
-                parent={"database_id": target_db_id},
-                properties={
-                    "제목": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": topic[:200]  # 제목은 200자 제한
-                                }
-                            }
-                        ]
-                    },
-                    "주제": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": topic
-                                }
-                            }
-                        ]
-                    },
-                    "내용": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": content[:2000]  # 내용은 2000자로 제한 (더 길면 잘림)
-                                }
-                            }
-                        ]
-                    },
-                    "생성일": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                }
-                            }
-                        ]
-                    },
-                    "사용자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": user_id
-                                }
-                            }
-                        ]
-                    },
-                    "모델": {
-                        "select": {
-                            "name": model
-                        }
-                    },
-                    "글 의도": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": article_intent
-                                }
-                            }
-                        ]
-                    },
-                    "대상 독자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": target_audience
-                                }
-                            }
-                        ]
-                    },
-                    "유형": {
-                        "select": {
-                            "name": article_type
-                        }
-                    }
-                },
-                children=_split_content_into_blocks(content)  # 긴 내용을 여러 블록으로 분할
-                )
-                print(f"✅ notion-client로 저장 성공: {topic[:50]}...")
-                return True
-            except Exception as e:
-                print(f"⚠️ notion-client로 저장 실패, HTTP 직접 호출 시도: {e}")
-                traceback.print_exc()
-                # 방법 2: HTTP 직접 호출로 전환
-        
-        # 방법 2: HTTP 직접 호출 (notion-client 실패 시 또는 article_notion이 None일 때)
-        headers = {
-            "Authorization": f"Bearer {article_api_key}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "parent": {"database_id": target_db_id},
             "properties": {
@@ -314,7 +213,7 @@ def save_article_to_notion_db(
                 "title": [
                     {
                         "text": {
-                            "content": topic[:200]
+                            "content": topic[:200]  # 제목은 200자 제한
                         }
                     }
                 ]
@@ -387,245 +286,373 @@ def save_article_to_notion_db(
         "children": _split_content_into_blocks(content)  # 긴 내용을 여러 블록으로 분할
         }
         
-        url = "https://api.notion.com/v1/pages"
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-        print(f"✅ HTTP 직접 호출로 저장 성공: {topic[:50]}...")
+        client = get_notion_http()
+        response = await client.post("/pages", headers=notion_headers(article_api_key), json=payload)
+        response.raise_for_status()
+        logger.info("Notion 저장 성공", extra={"user_id": user_id, "topic": topic[:50], "sample": True})
         return True
     
-    except Exception as e:
-        print(f"❌ Notion에 글 저장 실패: {e}")
-        print(f"   Database ID: {target_db_id}")
-        print(f"   API Key: {article_api_key[:20] if article_api_key else '(없음)'}...")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Notion에 글 저장 실패", extra={"user_id": user_id, "database_id": target_db_id})
         return False
 
 
-def _get_page_content(page_id: str) -> str:
+def _blocks_to_text(blocks: list, content_parts: list) -> None:
+    """블록 목록에서 텍스트를 추출해 content_parts에 추가"""
+    for block in blocks:
+        block_type = block.get("type", "")
+        if block_type == "paragraph":
+            rich_text = block.get("paragraph", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(text_item.get("text", {}).get("content", ""))
+        elif block_type == "heading_1":
+            rich_text = block.get("heading_1", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(f"# {text_item.get('text', {}).get('content', '')}\n")
+        elif block_type == "heading_2":
+            rich_text = block.get("heading_2", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(f"## {text_item.get('text', {}).get('content', '')}\n")
+        elif block_type == "heading_3":
+            rich_text = block.get("heading_3", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(f"### {text_item.get('text', {}).get('content', '')}\n")
+        elif block_type == "bulleted_list_item":
+            rich_text = block.get("bulleted_list_item", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(f"- {text_item.get('text', {}).get('content', '')}\n")
+        elif block_type == "numbered_list_item":
+            rich_text = block.get("numbered_list_item", {}).get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(f"1. {text_item.get('text', {}).get('content', '')}\n")
+        else:
+            # 기타 블록 타입도 텍스트 추출 시도
+            block_data = block.get(block_type, {})
+            rich_text = block_data.get("rich_text", [])
+            for text_item in rich_text:
+                if text_item.get("type") == "text":
+                    content_parts.append(text_item.get("text", {}).get("content", ""))
+
+
+async def _fetch_page_content(page_id: str, article_api_key: str) -> str:
+    """페이지 본문 블록을 페이지네이션으로 모두 읽어 텍스트로 변환 (실패 시 예외)"""
+    headers = notion_headers(article_api_key)
+    url = f"/blocks/{page_id}/children"
+    content_parts = []
+    
+    client = get_notion_http()
+    # 페이지네이션 처리
+    next_cursor = None
+    while True:
+        params = {}
+        if next_cursor:
+            params["start_cursor"] = next_cursor
+        
+        response = await client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        
+        # 각 블록에서 텍스트 추출
+        _blocks_to_text(data.get("results", []), content_parts)
+        
+        # 다음 페이지 확인
+        if data.get("has_more"):
+            next_cursor = data.get("next_cursor")
+        else:
+            break
+    
+    return "\n".join(content_parts)
+
+
+async def _get_page_content(page_id: str, last_edited_time: str = "") -> str:
     """
     페이지 본문(blocks)에서 전체 내용을 추출
     
     Args:
         page_id: Notion 페이지 ID
+        last_edited_time: 페이지 마지막 수정 시각 (있으면 본문 캐시 사용)
     
     Returns:
         페이지 본문의 전체 텍스트 내용
     """
+    cache_key = (page_id, last_edited_time)
+    if last_edited_time:
+        cached = _page_content_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
     try:
         article_api_key = _get_article_notion_api_key()
         if not article_api_key:
-            print("오류: ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
+            logger.error("ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
             return ""
         
-        headers = {
-            "Authorization": f"Bearer {article_api_key}",
-            "Notion-Version": "2022-06-28",
-        }
-        
-        url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-        content_parts = []
-        
-        with httpx.Client() as client:
-            # 페이지네이션 처리
-            next_cursor = None
-            while True:
-                params = {}
-                if next_cursor:
-                    params["start_cursor"] = next_cursor
-                
-                response = client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                # 각 블록에서 텍스트 추출
-                for block in data.get("results", []):
-                    block_type = block.get("type", "")
-                    if block_type == "paragraph":
-                        rich_text = block.get("paragraph", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(text_item.get("text", {}).get("content", ""))
-                    elif block_type == "heading_1":
-                        rich_text = block.get("heading_1", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(f"# {text_item.get('text', {}).get('content', '')}\n")
-                    elif block_type == "heading_2":
-                        rich_text = block.get("heading_2", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(f"## {text_item.get('text', {}).get('content', '')}\n")
-                    elif block_type == "heading_3":
-                        rich_text = block.get("heading_3", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(f"### {text_item.get('text', {}).get('content', '')}\n")
-                    elif block_type == "bulleted_list_item":
-                        rich_text = block.get("bulleted_list_item", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(f"- {text_item.get('text', {}).get('content', '')}\n")
-                    elif block_type == "numbered_list_item":
-                        rich_text = block.get("numbered_list_item", {}).get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(f"1. {text_item.get('text', {}).get('content', '')}\n")
-                    else:
-                        # 기타 블록 타입도 텍스트 추출 시도
-                        block_data = block.get(block_type, {})
-                        rich_text = block_data.get("rich_text", [])
-                        for text_item in rich_text:
-                            if text_item.get("type") == "text":
-                                content_parts.append(text_item.get("text", {}).get("content", ""))
-                
-                # 다음 페이지 확인
-                if data.get("has_more"):
-                    next_cursor = data.get("next_cursor")
-                else:
-                    break
-        
-        return "\n".join(content_parts)
+        content = await _fetch_page_content(page_id, article_api_key)
+        if last_edited_time:
+            _page_content_cache.set(cache_key, content)
+        return content
     except Exception as e:
-        print(f"페이지 본문 가져오기 실패: {e}")
+        logger.warning("페이지 본문 가져오기 실패", extra={"page_id": page_id, "error": str(e)})
         return ""
 
 
-def get_user_articles_from_notion_db(
+def _parse_article_page(page: dict) -> dict:
+    """기록용 Database 페이지 속성에서 글 정보 추출 (content는 "내용" 속성의 미리보기)"""
+    props = page.get("properties", {})
+    
+    # 제목 추출
+    title_prop = props.get("제목", {}).get("title", [])
+    title = title_prop[0].get("text", {}).get("content", "") if title_prop else ""
+    
+    # 주제 추출
+    topic_prop = props.get("주제", {}).get("rich_text", [])
+    topic = topic_prop[0].get("text", {}).get("content", "") if topic_prop else ""
+    
+    # 속성의 "내용" 필드 (미리보기용)
+    content_prop = props.get("내용", {}).get("rich_text", [])
+    content = content_prop[0].get("text", {}).get("content", "") if content_prop else ""
+    
+    # 생성일 추출 (rich_text 타입)
+    date_prop = props.get("생성일", {}).get("rich_text", [])
+    created_date = date_prop[0].get("text", {}).get("content", "") if date_prop else ""
+    
+    # 모델 추출
+    model_prop = props.get("모델", {}).get("select", {})
+    model = model_prop.get("name", "") if model_prop else ""
+    
+    # 글 의도 추출
+    intent_prop = props.get("글 의도", {}).get("rich_text", [])
+    article_intent = intent_prop[0].get("text", {}).get("content", "") if intent_prop else ""
+    
+    # 대상 독자 추출
+    audience_prop = props.get("대상 독자", {}).get("rich_text", [])
+    target_audience = audience_prop[0].get("text", {}).get("content", "") if audience_prop else ""
+    
+    # 유형 추출
+    type_prop = props.get("유형", {}).get("select", {})
+    article_type = type_prop.get("name", "") if type_prop else ""
+    
+    # 사용자 추출
+    user_prop = props.get("사용자", {}).get("rich_text", [])
+    owner = user_prop[0].get("text", {}).get("content", "") if user_prop else ""
+    
+    return {
+        "id": page.get("id", ""),
+        "title": title,
+        "topic": topic,
+        "content": content,
+        "created_date": created_date,
+        "model": model,
+        "article_intent": article_intent,
+        "target_audience": target_audience,
+        "article_type": article_type,
+        "user_id": owner,
+        "last_edited_time": page.get("last_edited_time", ""),
+        "content_loaded": False
+    }
+
+
+async def _load_full_contents(articles: list) -> None:
+    """글 목록의 페이지 본문을 동시성 제한을 두고 병렬로 가져와 content 교체"""
+    semaphore = asyncio.Semaphore(ARTICLE_CONTENT_CONCURRENCY)
+    
+    async def load(article: dict):
+        async with semaphore:
+            content = await _get_page_content(article["id"], article["last_edited_time"])
+        # 본문이 없으면 속성의 "내용" 필드(미리보기)를 그대로 사용
+        if content:
+            article["content"] = content
+            article["content_loaded"] = True
+    
+    await asyncio.gather(*[load(article) for article in articles])
+
+
+async def get_user_articles_page_from_notion_db(
     user_id: str,
     database_id: str = None,
-    article_type: str = "최종글"  # 기본값: "최종글"만 조회
-) -> list:
+    article_type: str = "최종글",  # 기본값: "최종글"만 조회
+    include_content: bool = True,
+    page_size: int = 100,
+    cursor: Optional[str] = None
+) -> dict:
     """
-    사용자별로 생성된 글 목록 조회 (기록용 Database에서)
-    페이지 본문에서 전체 내용을 가져옵니다.
+    사용자별로 생성된 글 목록을 Notion 커서 단위로 한 페이지 조회 (기록용 Database에서)
+    include_content가 True면 페이지 본문에서 전체 내용을 병렬로 가져옵니다.
     
     Args:
         user_id: 사용자 ID
         database_id: Notion Database ID (None이면 기본 ARTICLE_DATABASE_ID 사용)
+        article_type: 조회할 글 유형 (빈 값이면 전체)
+        include_content: False면 목록 메타데이터와 미리보기만 반환 (본문은 get_article_from_notion_db로 지연 로딩)
+        page_size: Notion에 요청할 행 수 (최대 100)
+        cursor: 이전 응답의 next_cursor (None이면 처음부터)
     
     Returns:
-        사용자가 생성한 글 목록 (dict 리스트)
+        {"articles": [...], "next_cursor": "..." 또는 None, "has_more": bool}
+        유형 필터는 코드에서 적용하므로 articles 수는 page_size보다 적을 수 있습니다.
+    
+    Raises:
+        ArticleQueryError: Notion 조회/응답 처리에 실패한 경우
     """
-    if not ARTICLE_NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return []
+    empty_page = {"articles": [], "next_cursor": None, "has_more": False}
     
     # 환경 변수에서 API 키와 Database ID 읽기
     article_api_key = _get_article_notion_api_key()
     article_db_id = _get_article_database_id()
     
     if not article_db_id and not database_id:
-        print("오류: Database ID가 설정되지 않았습니다.")
-        return []
+        logger.error("Database ID가 설정되지 않았습니다.")
+        return empty_page
     
     if not article_api_key:
-        print("오류: ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
-        return []
+        logger.error("ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
+        return empty_page
     
     try:
         target_db_id = database_id or article_db_id
         
-        # HTTP 직접 호출만 사용 (notion-client의 query 메서드가 안정적이지 않음)
-        try:
-            headers = {
-                "Authorization": f"Bearer {article_api_key}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
+        # 공용 HTTP 클라이언트로 직접 호출 (notion-client의 query 메서드가 안정적이지 않음)
+        headers = notion_headers(article_api_key)
+        url = f"/databases/{target_db_id}/query"
+        
+        # 필터 조건 구성: "유형" 필드가 없을 수 있으므로 사용자만 필터링하고, 나중에 코드에서 유형 필터링
+        filter_conditions = {
+            "property": "사용자",
+            "rich_text": {
+                "equals": user_id
             }
-            
-            url = f"https://api.notion.com/v1/databases/{target_db_id}/query"
-            
-            # 필터 조건 구성: "유형" 필드가 없을 수 있으므로 사용자만 필터링하고, 나중에 코드에서 유형 필터링
-            filter_conditions = {
-                "property": "사용자",
-                "rich_text": {
-                    "equals": user_id
+        }
+        
+        payload = {
+            "filter": filter_conditions,
+            "sorts": [
+                {
+                    "property": "생성일",
+                    "direction": "descending"
                 }
-            }
-            
-            payload = {
-                "filter": filter_conditions,
-                "sorts": [
-                    {
-                        "property": "생성일",
-                        "direction": "descending"
-                    }
-                ]
-            }
-            
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                response_data = response.json()
-            
-            articles = []
-            for page in response_data.get("results", []):
-                props = page.get("properties", {})
-                try:
-                    # 제목 추출
-                    title_prop = props.get("제목", {}).get("title", [])
-                    title = title_prop[0].get("text", {}).get("content", "") if title_prop else ""
-                    
-                    # 주제 추출
-                    topic_prop = props.get("주제", {}).get("rich_text", [])
-                    topic = topic_prop[0].get("text", {}).get("content", "") if topic_prop else ""
-                    
-                    # 페이지 ID
-                    page_id = page.get("id", "")
-                    
-                    # "유형" 필터 적용: article_type이 지정된 경우 "유형" 필드 확인
-                    if article_type:
-                        type_prop = props.get("유형", {}).get("select", {})
-                        page_article_type = type_prop.get("name", "") if type_prop else ""
-                        # 유형이 일치하지 않으면 건너뛰기
-                        if page_article_type != article_type:
-                            continue
-                    
-                    # 페이지 본문에서 전체 내용 가져오기
-                    content = _get_page_content(page_id)
-                    
-                    # 본문이 없으면 속성의 "내용" 필드 사용 (미리보기용)
-                    if not content:
-                        content_prop = props.get("내용", {}).get("rich_text", [])
-                        content = content_prop[0].get("text", {}).get("content", "") if content_prop else ""
-                    
-                    # 생성일 추출 (rich_text 타입)
-                    date_prop = props.get("생성일", {}).get("rich_text", [])
-                    created_date = date_prop[0].get("text", {}).get("content", "") if date_prop else ""
-                    
-                    # 모델 추출
-                    model_prop = props.get("모델", {}).get("select", {})
-                    model = model_prop.get("name", "") if model_prop else ""
-                    
-                    # 글 의도 추출
-                    intent_prop = props.get("글 의도", {}).get("rich_text", [])
-                    article_intent = intent_prop[0].get("text", {}).get("content", "") if intent_prop else ""
-                    
-                    # 대상 독자 추출
-                    audience_prop = props.get("대상 독자", {}).get("rich_text", [])
-                    target_audience = audience_prop[0].get("text", {}).get("content", "") if audience_prop else ""
-                    
-                    articles.append({
-                        "id": page_id,
-                        "title": title,
-                        "topic": topic,
-                        "content": content,
-                        "created_date": created_date,
-                        "model": model,
-                        "article_intent": article_intent,
-                        "target_audience": target_audience
-                    })
-                except (KeyError, IndexError, TypeError) as e:
-                    print(f"페이지 파싱 오류: {e}")
-                    continue
-            
-            return articles
-            
-        except Exception as e:
-            print(f"HTTP 직접 호출로 글 조회 실패: {e}")
-            return []
+            ],
+            "page_size": max(1, min(page_size, 100))
+        }
+        if cursor:
+            payload["start_cursor"] = cursor
+        
+        client = get_notion_http()
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        response_data = response.json()
+        
+        articles = []
+        for page in response_data.get("results", []):
+            try:
+                article = _parse_article_page(page)
+            except (KeyError, IndexError, TypeError) as e:
+                logger.warning("페이지 파싱 오류", extra={"error": str(e)})
+                continue
             
+            # "유형" 필터 적용: article_type이 지정된 경우 유형이 일치하지 않으면 건너뛰기
+            if article_type and article["article_type"] != article_type:
+                continue
+            articles.append(article)
+        
+        if include_content:
+            await _load_full_contents(articles)
+        
+        has_more = bool(response_data.get("has_more") and response_data.get("next_cursor"))
+        return {
+            "articles": articles,
+            "next_cursor": response_data.get("next_cursor") if has_more else None,
+            "has_more": has_more
+        }
+        
     except Exception as e:
-        print(f"Notion에서 글 조회 실패: {e}")
-        return []
+        # 빈 마지막 페이지로 삼키면 전체 목록/스트림이 조용히 잘리므로 호출자에게 알림
+        logger.warning("Notion에서 글 조회 실패", extra={"error": str(e)})
+        raise ArticleQueryError(f"Notion에서 글 조회 실패: {e}") from e
+
+
+async def iter_user_articles_from_notion_db(
+    user_id: str,
+    database_id: str = None,
+    article_type: str = "최종글",
+    include_content: bool = True,
+    page_size: int = 100,
+    cursor: Optional[str] = None
+):
+    """
+    next_cursor를 따라가며 글을 하나씩 반환하는 비동기 제너레이터
+    한 번에 한 페이지만 메모리에 올리므로 기록이 많아도 메모리 사용량이 일정합니다.
+    """
+    while True:
+        page = await get_user_articles_page_from_notion_db(
+            user_id, database_id, article_type, include_content, page_size, cursor
+        )
+        for article in page["articles"]:
+            yield article
+        if not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+
+
+async def get_user_articles_from_notion_db(
+    user_id: str,
+    database_id: str = None,
+    article_type: str = "최종글",  # 기본값: "최종글"만 조회
+    include_content: bool = True
+) -> list:
+    """
+    사용자별로 생성된 글 전체 목록 조회 (기록용 Database에서, 100개를 넘어도 모두 조회)
+    
+    Args:
+        user_id: 사용자 ID
+        database_id: Notion Database ID (None이면 기본 ARTICLE_DATABASE_ID 사용)
+        article_type: 조회할 글 유형 (빈 값이면 전체)
+        include_content: False면 목록 메타데이터와 미리보기만 반환
+    
+    Returns:
+        사용자가 생성한 글 목록 (dict 리스트)
+    """
+    return [
+        article async for article in iter_user_articles_from_notion_db(
+            user_id, database_id, article_type, include_content
+        )
+    ]
+
+
+async def get_article_from_notion_db(user_id: str, page_id: str) -> Optional[dict]:
+    """
+    글 한 개를 본문까지 조회 (목록을 include_content=False로 받은 뒤 지연 로딩용)
+    
+    Args:
+        user_id: 사용자 ID (본인 글이 아니면 None)
+        page_id: Notion 페이지 ID
+    
+    Returns:
+        글 정보 dict, 없거나 다른 사용자의 글이면 None
+    """
+    article_api_key = _get_article_notion_api_key()
+    if not article_api_key:
+        logger.error("ARTICLE_NOTION_API_KEY가 설정되지 않았습니다.")
+        return None
+    
+    try:
+        client = get_notion_http()
+        response = await client.get(f"/pages/{page_id}", headers=notion_headers(article_api_key))
+        if response.status_code in (400, 404):
+            return None
+        response.raise_for_status()
+        article = _parse_article_page(response.json())
+    except Exception as e:
+        logger.warning("Notion에서 글 조회 실패", extra={"error": str(e)})
+        return None
+    
+    if article["user_id"] != user_id:
+        return None
+    
+    await _load_full_contents([article])
+    return article
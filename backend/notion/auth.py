@@ -1,119 +1,202 @@
 # notion/auth.py
 import os
-try:
-    from notion_client import Client
-    import httpx
-    
-    # 환경 변수에서 API 키와 Database ID 읽기
-    NOTION_API_KEY = os.getenv("NOTION_API_KEY", "")
-    DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "")
-    
-    notion = Client(auth=NOTION_API_KEY)
-    NOTION_AVAILABLE = True
-except ImportError:
-    # notion_client가 설치되지 않은 경우
-    NOTION_AVAILABLE = False
-    notion = None
-    import httpx  # httpx는 별도로 import 시도
-
-
-def check_login(user_id, user_pw):
-    if not NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        print("해결 방법: python -m pip install notion-client")
-        return False
-    
-    try:
-        # ✅ notion-client API 사용 (여러 방법 시도)
-        response = None
-        
-        # 방법 1: 표준 API 사용
-        try:
-            if hasattr(notion.databases, 'query'):
-                response = notion.databases.query(database_id=DATABASE_ID)
-            else:
-                # 방법 2: 직접 HTTP 요청 (fallback)
-                raise AttributeError("query method not found")
-        except AttributeError:
-            # 방법 3: 직접 HTTP API 호출
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
+import asyncio
+import hmac
+import logging
+import time
+from datetime import datetime
+
+from notion.http_client import get_notion_http, notion_headers
+from shared_state import SharedCache
+
+logger = logging.getLogger(__name__)
+
+# 환경 변수에서 API 키와 Database ID 읽기
+NOTION_API_KEY = os.getenv("NOTION_API_KEY", "")
+DATABASE_ID = os.getenv("NOTION_DATABASE_ID", "")
+
+# 사용자별 API 키 캐시 (거의 바뀌지 않으므로 TTL 동안 Notion 조회 생략, 저장 시 write-through)
+# 공유 상태 백엔드(redis)를 쓰면 워커 간에 같은 캐시를 사용하므로 다른 워커의 저장도 바로 반영됨
+_api_key_cache = SharedCache(
+    maxsize=int(os.getenv("API_KEY_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("API_KEY_CACHE_TTL", "600")),
+    name="api_keys"
+)
+
+
+def get_api_key_cache_stats() -> dict:
+    """API 키 캐시 hit/miss 통계"""
+    return _api_key_cache.stats()
+
+
+# 로그인용 사용자 인덱스 (user_id -> {"password", "page_id"})
+# 백그라운드에서 전체 사용자 DB를 주기적으로 다시 읽어 통째로 교체합니다.
+USER_INDEX_REFRESH_INTERVAL = float(os.getenv("USER_INDEX_REFRESH_INTERVAL", "300"))
+_user_index: dict = {}
+_user_index_loaded_at = 0.0
+
+
+def _rich_text(content: str) -> dict:
+    return {
+        "rich_text": [
+            {
+                "text": {
+                    "content": content
+                }
             }
-            
-            url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-            
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json={})
-                response.raise_for_status()
-                response = response.json()
-        
-        # 결과 처리
-        for row in response.get("results", []):
-            props = row.get("properties", {})
-            
-            # 안전하게 데이터 접근
-            try:
-                db_id_prop = props.get("아이디", {}).get("title", [])
-                db_pw_prop = props.get("비밀번호", {}).get("rich_text", [])
-                
-                if not db_id_prop or not db_pw_prop:
-                    continue
-                
-                db_id = db_id_prop[0].get("text", {}).get("content", "")
-                db_pw = db_pw_prop[0].get("text", {}).get("content", "")
+        ]
+    }
 
-                if user_id == db_id and user_pw == db_pw:
-                    return True
-            except (KeyError, IndexError, TypeError):
-                continue
 
-        return False
+def _extract_api_keys(props: dict) -> dict:
+    """사용자 행의 속성에서 API 키 추출"""
+    openai_prop = props.get("OpenAI API 키", {}).get("rich_text", [])
+    groq_prop = props.get("Groq API 키", {}).get("rich_text", [])
+    gemini_prop = props.get("Gemini API 키", {}).get("rich_text", [])
 
-    except AttributeError as e:
-        # 'DatabasesEndpoint' object has no attribute 'query' 오류 처리
-        print(f"노션 API 오류: 라이브러리 버전 문제일 수 있습니다.")
-        print(f"오류 상세: {e}")
-        # HTTP 직접 호출로 재시도
-        try:
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
+    return {
+        "openai": openai_prop[0].get("text", {}).get("content", "") if openai_prop else "",
+        "groq": groq_prop[0].get("text", {}).get("content", "") if groq_prop else "",
+        "gemini": gemini_prop[0].get("text", {}).get("content", "") if gemini_prop else ""
+    }
+
+
+async def _query_user_rows(user_id: str, page_size: int = 100) -> list:
+    """아이디 필드로 필터링한 사용자 행 조회"""
+    payload = {
+        "filter": {
+            "property": "아이디",
+            "title": {
+                "equals": user_id
             }
-            url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json={})
-                response.raise_for_status()
-                response = response.json()
-            
-            for row in response.get("results", []):
-                props = row.get("properties", {})
-                try:
-                    db_id_prop = props.get("아이디", {}).get("title", [])
-                    db_pw_prop = props.get("비밀번호", {}).get("rich_text", [])
-                    
-                    if not db_id_prop or not db_pw_prop:
-                        continue
-                    
-                    db_id = db_id_prop[0].get("text", {}).get("content", "")
-                    db_pw = db_pw_prop[0].get("text", {}).get("content", "")
-
-                    if user_id == db_id and user_pw == db_pw:
-                        return True
-                except (KeyError, IndexError, TypeError):
-                    continue
-            return False
-        except Exception as e2:
-            print(f"HTTP 직접 호출도 실패: {e2}")
+        },
+        "page_size": page_size
+    }
+
+    client = get_notion_http()
+    response = await client.post(
+        f"/databases/{DATABASE_ID}/query",
+        headers=notion_headers(NOTION_API_KEY),
+        json=payload
+    )
+    response.raise_for_status()
+    return response.json().get("results", [])
+
+
+async def _iter_database_rows(database_id: str, payload: dict):
+    """has_more / next_cursor를 따라가며 Database의 모든 행 반환"""
+    client = get_notion_http()
+    body = dict(payload)
+    body.setdefault("page_size", 100)
+    while True:
+        response = await client.post(
+            f"/databases/{database_id}/query",
+            headers=notion_headers(NOTION_API_KEY),
+            json=body
+        )
+        response.raise_for_status()
+        data = response.json()
+        for row in data.get("results", []):
+            yield row
+        if not data.get("has_more") or not data.get("next_cursor"):
+            break
+        body["start_cursor"] = data["next_cursor"]
+
+
+def _parse_user_row(row: dict):
+    """사용자 행에서 (아이디, {"password", "page_id"}) 추출, 형식이 맞지 않으면 None"""
+    props = row.get("properties", {})
+    try:
+        db_id_prop = props.get("아이디", {}).get("title", [])
+        db_pw_prop = props.get("비밀번호", {}).get("rich_text", [])
+
+        if not db_id_prop or not db_pw_prop:
+            return None
+
+        db_id = db_id_prop[0].get("text", {}).get("content", "")
+        db_pw = db_pw_prop[0].get("text", {}).get("content", "")
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    if not db_id:
+        return None
+    return db_id, {"password": db_pw, "page_id": row.get("id")}
+
+
+async def refresh_user_index() -> int:
+    """전체 사용자 DB를 페이지네이션으로 읽어 로그인 인덱스를 교체"""
+    global _user_index, _user_index_loaded_at
+    index = {}
+    async for row in _iter_database_rows(DATABASE_ID, {}):
+        parsed = _parse_user_row(row)
+        if parsed:
+            index[parsed[0]] = parsed[1]
+    _user_index = index
+    _user_index_loaded_at = time.monotonic()
+    return len(index)
+
+
+async def run_user_index_refresher(interval: float = USER_INDEX_REFRESH_INTERVAL):
+    """로그인 인덱스 주기적 갱신 (lifespan에서 백그라운드 태스크로 실행)"""
+    while True:
+        try:
+            count = await refresh_user_index()
+            logger.debug("사용자 인덱스 갱신", extra={"users": count})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("사용자 인덱스 갱신 실패 (기존 인덱스 유지)", extra={"error": str(e)})
+        await asyncio.sleep(interval)
+
+
+async def _lookup_user(user_id: str):
+    """인덱스에 없는 사용자를 아이디 필터로 한 행만 조회하고 인덱스에 추가"""
+    for row in await _query_user_rows(user_id, page_size=1):
+        parsed = _parse_user_row(row)
+        if parsed and parsed[0] == user_id:
+            _user_index[user_id] = parsed[1]
+            return parsed[1]
+    return None
+
+
+def _password_matches(stored: str, given: str) -> bool:
+    """타이밍 공격을 피하기 위한 상수 시간 비교 (한글 비밀번호도 비교할 수 있도록 bytes로 변환)"""
+    return hmac.compare_digest(stored.encode("utf-8"), (given or "").encode("utf-8"))
+
+
+def _user_index_is_fresh() -> bool:
+    """마지막 전체 갱신이 USER_INDEX_REFRESH_INTERVAL 이내인지"""
+    return bool(_user_index_loaded_at) and time.monotonic() - _user_index_loaded_at <= USER_INDEX_REFRESH_INTERVAL
+
+
+def get_user_index_stats() -> dict:
+    """로그인 인덱스 크기와 마지막 갱신 이후 경과 시간"""
+    return {
+        "size": len(_user_index),
+        "age_seconds": round(time.monotonic() - _user_index_loaded_at, 1) if _user_index_loaded_at else None,
+    }
+
+
+async def check_login(user_id, user_pw):
+    try:
+        record = _user_index.get(user_id)
+        if record and _password_matches(record["password"], user_pw):
+            return True
+        if record and _user_index_is_fresh():
+            # 최신 인덱스와 비밀번호가 다르면 Notion을 다시 조회하지 않고 거절
+            # (비밀번호 대입 시도가 Notion 호출로 이어지지 않도록, 변경된 비밀번호는 다음 갱신 때 반영)
             return False
+
+        # 인덱스에 없는 사용자이거나 인덱스 갱신이 밀린 경우에만 해당 사용자 한 행만 다시 조회
+        record = await _lookup_user(user_id)
+        return bool(record) and _password_matches(record["password"], user_pw)
+
     except Exception as e:
-        print(f"노션 로그인 오류: {e}")
+        logger.warning("노션 로그인 오류", extra={"user_id": user_id, "error": str(e)})
         return False
 
 
-def save_article_to_notion(
+async def save_article_to_notion(
     user_id: str,
     topic: str,
     content: str,
@@ -124,7 +207,7 @@ def save_article_to_notion(
 ) -> bool:
     """
     생성된 글을 Notion Database에 저장
-    
+
     Args:
         user_id: 사용자 ID
         topic: 주제
@@ -133,220 +216,71 @@ def save_article_to_notion(
         target_audience: 대상 독자
         model: 사용한 모델 (ChatGPT, Gemini, Groq)
         database_id: Notion Database ID (None이면 기본 DATABASE_ID 사용)
-    
+
     Returns:
         저장 성공 여부
     """
-    if not NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return False
-    
     try:
         # Database ID가 제공되지 않으면 기본값 사용
         target_db_id = database_id or DATABASE_ID
-        
-        # Notion API로 페이지 생성
-        from datetime import datetime
-        
-        # 방법 1: notion-client 사용
-        try:
-            new_page = notion.pages.create(
-                parent={"database_id": target_db_id},
-                properties={
-                    "제목": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": topic[:200]  # 제목은 200자 제한
-                                }
-                            }
-                        ]
-                    },
-                    "주제": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": topic
-                                }
-                            }
-                        ]
-                    },
-                    "내용": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": content[:2000]  # 내용은 2000자로 제한 (더 길면 잘림)
-                                }
-                            }
-                        ]
-                    },
-                    "생성일": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    },
-                    "사용자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": user_id
-                                }
+
+        payload = {
+            "parent": {"database_id": target_db_id},
+            "properties": {
+                "제목": {
+                    "title": [
+                        {
+                            "text": {
+                                "content": topic[:200]  # 제목은 200자 제한
                             }
-                        ]
-                    },
-                    "모델": {
-                        "select": {
-                            "name": model
                         }
-                    },
-                    "글 의도": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": article_intent
-                                }
-                            }
-                        ]
-                    },
-                    "대상 독자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": target_audience
-                                }
-                            }
-                        ]
+                    ]
+                },
+                "주제": _rich_text(topic),
+                "내용": _rich_text(content[:2000]),  # 내용은 2000자로 제한 (더 길면 잘림)
+                "생성일": {
+                    "date": {
+                        "start": datetime.now().isoformat()
                     }
                 },
-                children=[
-                    {
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": content  # 전체 내용은 페이지 본문에
-                                    }
-                                }
-                            ]
-                        }
+                "사용자": _rich_text(user_id),
+                "모델": {
+                    "select": {
+                        "name": model
                     }
-                ]
-            )
-            return True
-        except Exception as e:
-            print(f"notion-client로 저장 실패, HTTP 직접 호출 시도: {e}")
-            # 방법 2: HTTP 직접 호출
-            import httpx
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
-            }
-            
-            # 내용이 너무 길면 잘라서 저장
-            content_preview = content[:2000] if len(content) > 2000 else content
-            
-            payload = {
-                "parent": {"database_id": target_db_id},
-                "properties": {
-                    "제목": {
-                        "title": [
-                            {
-                                "text": {
-                                    "content": topic[:200]
-                                }
-                            }
-                        ]
-                    },
-                    "주제": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": topic
-                                }
-                            }
-                        ]
-                    },
-                    "내용": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": content_preview
-                                }
-                            }
-                        ]
-                    },
-                    "생성일": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    },
-                    "사용자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": user_id
-                                }
-                            }
-                        ]
-                    },
-                    "모델": {
-                        "select": {
-                            "name": model
-                        }
-                    },
-                    "글 의도": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": article_intent
-                                }
-                            }
-                        ]
-                    },
-                    "대상 독자": {
+                },
+                "글 의도": _rich_text(article_intent),
+                "대상 독자": _rich_text(target_audience)
+            },
+            "children": [
+                {
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {
                         "rich_text": [
                             {
+                                "type": "text",
                                 "text": {
-                                    "content": target_audience
+                                    "content": content  # 전체 내용은 페이지 본문에
                                 }
                             }
                         ]
                     }
-                },
-                "children": [
-                    {
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {
-                                        "content": content
-                                    }
-                                }
-                            ]
-                        }
-                    }
-                ]
-            }
-            
-            url = "https://api.notion.com/v1/pages"
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-            return True
-            
+                }
+            ]
+        }
+
+        client = get_notion_http()
+        response = await client.post("/pages", headers=notion_headers(NOTION_API_KEY), json=payload)
+        response.raise_for_status()
+        return True
+
     except Exception as e:
-        print(f"Notion에 글 저장 실패: {e}")
+        logger.warning("Notion에 글 저장 실패", extra={"user_id": user_id, "error": str(e)})
         return False
 
 
-def save_usage_log_to_notion(
+async def save_usage_log_to_notion(
     user_id: str,
     action_type: str,  # '초안생성', '장단점분석', '최종글생성'
     model: str,
@@ -355,498 +289,259 @@ def save_usage_log_to_notion(
 ) -> bool:
     """
     사용 기록을 Notion Database에 저장
-    
+
     Args:
         user_id: 사용자 ID
         action_type: 작업 유형
         model: 사용한 모델
         topic: 주제
         database_id: Notion Database ID (사용 기록용)
-    
+
     Returns:
         저장 성공 여부
     """
-    if not NOTION_AVAILABLE:
-        return False
-    
     try:
-        from datetime import datetime
         target_db_id = database_id or DATABASE_ID
-        
-        # 방법 1: notion-client 사용
-        try:
-            new_page = notion.pages.create(
-                parent={"database_id": target_db_id},
-                properties={
-                    "사용자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": user_id
-                                }
-                            }
-                        ]
-                    },
-                    "작업 유형": {
-                        "select": {
-                            "name": action_type
-                        }
-                    },
-                    "사용 모델": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": model
-                                }
-                            }
-                        ]
-                    },
-                    "생성일시": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    },
-                    "주제": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": topic
-                                }
-                            }
-                        ]
+
+        payload = {
+            "parent": {"database_id": target_db_id},
+            "properties": {
+                "사용자": _rich_text(user_id),
+                "작업 유형": {
+                    "select": {
+                        "name": action_type
                     }
-                }
-            )
-            return True
-        except Exception as e:
-            print(f"notion-client로 저장 실패, HTTP 직접 호출 시도: {e}")
-            # 방법 2: HTTP 직접 호출
-            import httpx
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "parent": {"database_id": target_db_id},
-                "properties": {
-                    "사용자": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": user_id
-                                }
-                            }
-                        ]
-                    },
-                    "작업 유형": {
-                        "select": {
-                            "name": action_type
-                        }
-                    },
-                    "사용 모델": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": model
-                                }
-                            }
-                        ]
-                    },
-                    "생성일시": {
-                        "date": {
-                            "start": datetime.now().isoformat()
-                        }
-                    },
-                    "주제": {
-                        "rich_text": [
-                            {
-                                "text": {
-                                    "content": topic
-                                }
-                            }
-                        ]
+                },
+                "사용 모델": _rich_text(model),
+                "생성일시": {
+                    "date": {
+                        "start": datetime.now().isoformat()
                     }
-                }
+                },
+                "주제": _rich_text(topic)
             }
-            
-            url = "https://api.notion.com/v1/pages"
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-            return True
-            
+        }
+
+        client = get_notion_http()
+        response = await client.post("/pages", headers=notion_headers(NOTION_API_KEY), json=payload)
+        response.raise_for_status()
+        return True
+
     except Exception as e:
-        print(f"Notion에 사용 기록 저장 실패: {e}")
+        logger.warning("Notion에 사용 기록 저장 실패", extra={"user_id": user_id, "error": str(e)})
         return False
 
 
-def get_user_articles(user_id: str, database_id: str = None) -> list:
+async def get_user_articles(user_id: str, database_id: str = None) -> list:
     """
     사용자별로 생성된 글 목록 조회
-    
+
     Args:
         user_id: 사용자 ID
         database_id: Notion Database ID (None이면 기본 DATABASE_ID 사용)
-    
+
     Returns:
         사용자가 생성한 글 목록 (dict 리스트)
     """
-    if not NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return []
-    
     try:
         target_db_id = database_id or DATABASE_ID
-        
-        # 방법 1: notion-client 사용
-        try:
-            response = notion.databases.query(
-                database_id=target_db_id,
-                filter={
-                    "property": "사용자",
-                    "rich_text": {
-                        "equals": user_id
-                    }
-                },
-                sorts=[
-                    {
-                        "property": "생성일",
-                        "direction": "descending"
-                    }
-                ]
-            )
-            
-            articles = []
-            for page in response.get("results", []):
-                props = page.get("properties", {})
-                try:
-                    # 제목 추출
-                    title_prop = props.get("제목", {}).get("title", [])
-                    title = title_prop[0].get("text", {}).get("content", "") if title_prop else ""
-                    
-                    # 주제 추출
-                    topic_prop = props.get("주제", {}).get("rich_text", [])
-                    topic = topic_prop[0].get("text", {}).get("content", "") if topic_prop else ""
-                    
-                    # 내용 추출
-                    content_prop = props.get("내용", {}).get("rich_text", [])
-                    content = content_prop[0].get("text", {}).get("content", "") if content_prop else ""
-                    
-                    # 생성일 추출
-                    date_prop = props.get("생성일", {}).get("date", {})
-                    created_date = date_prop.get("start", "") if date_prop else ""
-                    
-                    # 모델 추출
-                    model_prop = props.get("모델", {}).get("select", {})
-                    model = model_prop.get("name", "") if model_prop else ""
-                    
-                    # 글 의도 추출
-                    intent_prop = props.get("글 의도", {}).get("rich_text", [])
-                    article_intent = intent_prop[0].get("text", {}).get("content", "") if intent_prop else ""
-                    
-                    # 대상 독자 추출
-                    audience_prop = props.get("대상 독자", {}).get("rich_text", [])
-                    target_audience = audience_prop[0].get("text", {}).get("content", "") if audience_prop else ""
-                    
-                    # 페이지 ID
-                    page_id = page.get("id", "")
-                    
-                    articles.append({
-                        "id": page_id,
-                        "title": title,
-                        "topic": topic,
-                        "content": content,
-                        "created_date": created_date,
-                        "model": model,
-                        "article_intent": article_intent,
-                        "target_audience": target_audience
-                    })
-                except (KeyError, IndexError, TypeError) as e:
-                    print(f"페이지 파싱 오류: {e}")
-                    continue
-            
-            return articles
-            
-        except Exception as e:
-            print(f"notion-client로 조회 실패, HTTP 직접 호출 시도: {e}")
-            # 방법 2: HTTP 직접 호출
-            import httpx
-            headers = {
-                "Authorization": f"Bearer {NOTION_API_KEY}",
-                "Notion-Version": "2022-06-28",
-                "Content-Type": "application/json"
-            }
-            
-            url = f"https://api.notion.com/v1/databases/{target_db_id}/query"
-            payload = {
-                "filter": {
-                    "property": "사용자",
-                    "rich_text": {
-                        "equals": user_id
-                    }
-                },
-                "sorts": [
-                    {
-                        "property": "생성일",
-                        "direction": "descending"
-                    }
-                ]
-            }
-            
-            with httpx.Client() as client:
-                response = client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                response_data = response.json()
-            
-            articles = []
-            for page in response_data.get("results", []):
-                props = page.get("properties", {})
-                try:
-                    title_prop = props.get("제목", {}).get("title", [])
-                    title = title_prop[0].get("text", {}).get("content", "") if title_prop else ""
-                    
-                    topic_prop = props.get("주제", {}).get("rich_text", [])
-                    topic = topic_prop[0].get("text", {}).get("content", "") if topic_prop else ""
-                    
-                    content_prop = props.get("내용", {}).get("rich_text", [])
-                    content = content_prop[0].get("text", {}).get("content", "") if content_prop else ""
-                    
-                    date_prop = props.get("생성일", {}).get("date", {})
-                    created_date = date_prop.get("start", "") if date_prop else ""
-                    
-                    model_prop = props.get("모델", {}).get("select", {})
-                    model = model_prop.get("name", "") if model_prop else ""
-                    
-                    intent_prop = props.get("글 의도", {}).get("rich_text", [])
-                    article_intent = intent_prop[0].get("text", {}).get("content", "") if intent_prop else ""
-                    
-                    audience_prop = props.get("대상 독자", {}).get("rich_text", [])
-                    target_audience = audience_prop[0].get("text", {}).get("content", "") if audience_prop else ""
-                    
-                    page_id = page.get("id", "")
-                    
-                    articles.append({
-                        "id": page_id,
-                        "title": title,
-                        "topic": topic,
-                        "content": content,
-                        "created_date": created_date,
-                        "model": model,
-                        "article_intent": article_intent,
-                        "target_audience": target_audience
-                    })
-                except (KeyError, IndexError, TypeError) as e:
-                    print(f"페이지 파싱 오류: {e}")
-                    continue
-            
-            return articles
-            
+
+        payload = {
+            "filter": {
+                "property": "사용자",
+                "rich_text": {
+                    "equals": user_id
+                }
+            },
+            "sorts": [
+                {
+                    "property": "생성일",
+                    "direction": "descending"
+                }
+            ]
+        }
+
+        client = get_notion_http()
+        response = await client.post(
+            f"/databases/{target_db_id}/query",
+            headers=notion_headers(NOTION_API_KEY),
+            json=payload
+        )
+        response.raise_for_status()
+        response_data = response.json()
+
+        articles = []
+        for page in response_data.get("results", []):
+            props = page.get("properties", {})
+            try:
+                # 제목 추출
+                title_prop = props.get("제목", {}).get("title", [])
+                title = title_prop[0].get("text", {}).get("content", "") if title_prop else ""
+
+                # 주제 추출
+                topic_prop = props.get("주제", {}).get("rich_text", [])
+                topic = topic_prop[0].get("text", {}).get("content", "") if topic_prop else ""
+
+                # 내용 추출
+                content_prop = props.get("내용", {}).get("rich_text", [])
+                content = content_prop[0].get("text", {}).get("content", "") if content_prop else ""
+
+                # 생성일 추출
+                date_prop = props.get("생성일", {}).get("date", {})
+                created_date = date_prop.get("start", "") if date_prop else ""
+
+                # 모델 추출
+                model_prop = props.get("모델", {}).get("select", {})
+                model = model_prop.get("name", "") if model_prop else ""
+
+                # 글 의도 추출
+                intent_prop = props.get("글 의도", {}).get("rich_text", [])
+                article_intent = intent_prop[0].get("text", {}).get("content", "") if intent_prop else ""
+
+                # 대상 독자 추출
+                audience_prop = props.get("대상 독자", {}).get("rich_text", [])
+                target_audience = audience_prop[0].get("text", {}).get("content", "") if audience_prop else ""
+
+                # 페이지 ID
+                page_id = page.get("id", "")
+
+                articles.append({
+                    "id": page_id,
+                    "title": title,
+                    "topic": topic,
+                    "content": content,
+                    "created_date": created_date,
+                    "model": model,
+                    "article_intent": article_intent,
+                    "target_audience": target_audience
+                })
+            except (KeyError, IndexError, TypeError) as e:
+                logger.warning("페이지 파싱 오류", extra={"error": str(e)})
+                continue
+
+        return articles
+
     except Exception as e:
-        print(f"Notion에서 글 조회 실패: {e}")
+        logger.warning("Notion에서 글 조회 실패", extra={"user_id": user_id, "error": str(e)})
         return []
 
 
-def get_user_api_keys_from_notion(user_id: str) -> dict:
+async def get_user_api_keys_from_notion(user_id: str) -> dict:
     """
     Notion Database에서 사용자의 API 키 조회
-    
+
     Args:
         user_id: 사용자 ID (아이디 필드와 일치)
-    
+
     Returns:
         {"openai": "...", "groq": "...", "gemini": "..."} 형태의 딕셔너리
     """
-    if not NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return {"openai": "", "groq": "", "gemini": ""}
-    
+    cached = await _api_key_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
     try:
-        # HTTP 직접 호출로 조회 (안정성)
-        headers = {
-            "Authorization": f"Bearer {NOTION_API_KEY}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-        
-        url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-        payload = {
-            "filter": {
-                "property": "아이디",
-                "title": {
-                    "equals": user_id
-                }
-            }
-        }
-        
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-        
         # 사용자 행 찾기
-        for page in response_data.get("results", []):
+        for page in await _query_user_rows(user_id):
             props = page.get("properties", {})
             try:
                 # 아이디 확인
                 id_prop = props.get("아이디", {}).get("title", [])
                 if not id_prop:
                     continue
-                
+
                 db_user_id = id_prop[0].get("text", {}).get("content", "")
                 if db_user_id != user_id:
                     continue
-                
+
                 # API 키 추출
-                openai_prop = props.get("OpenAI API 키", {}).get("rich_text", [])
-                groq_prop = props.get("Groq API 키", {}).get("rich_text", [])
-                gemini_prop = props.get("Gemini API 키", {}).get("rich_text", [])
-                
-                openai_key = openai_prop[0].get("text", {}).get("content", "") if openai_prop else ""
-                groq_key = groq_prop[0].get("text", {}).get("content", "") if groq_prop else ""
-                gemini_key = gemini_prop[0].get("text", {}).get("content", "") if gemini_prop else ""
-                
-                return {
-                    "openai": openai_key,
-                    "groq": groq_key,
-                    "gemini": gemini_key
-                }
+                keys = _extract_api_keys(props)
+                await _api_key_cache.set(user_id, keys)
+                return dict(keys)
             except (KeyError, IndexError, TypeError) as e:
-                print(f"API 키 파싱 오류: {e}")
+                logger.warning("API 키 파싱 오류", extra={"user_id": user_id, "error": str(e)})
                 continue
-        
-        # 사용자를 찾지 못한 경우 빈 값 반환
-        return {"openai": "", "groq": "", "gemini": ""}
-        
-    except Exception as e:
-        print(f"Notion에서 API 키 조회 실패: {e}")
-        import traceback
-        traceback.print_exc()
+
+        # 사용자를 찾지 못한 경우 빈 값 반환 (조회 실패가 아니므로 캐시)
+        keys = {"openai": "", "groq": "", "gemini": ""}
+        await _api_key_cache.set(user_id, keys)
+        return dict(keys)
+
+    except Exception:
+        # 조회 실패는 캐시하지 않음 (다음 요청에서 재시도)
+        logger.exception("Notion에서 API 키 조회 실패", extra={"user_id": user_id})
         return {"openai": "", "groq": "", "gemini": ""}
 
 
-def save_user_api_keys_to_notion(user_id: str, openai_key: str = "", groq_key: str = "", gemini_key: str = "") -> bool:
+async def save_user_api_keys_to_notion(user_id: str, openai_key: str = "", groq_key: str = "", gemini_key: str = "") -> bool:
     """
     Notion Database에 사용자의 API 키 저장 (기존 행 업데이트)
-    
+
     Args:
         user_id: 사용자 ID (아이디 필드와 일치)
         openai_key: OpenAI API 키 (빈 문자열이면 업데이트하지 않음)
         groq_key: Groq API 키 (빈 문자열이면 업데이트하지 않음)
         gemini_key: Gemini API 키 (빈 문자열이면 업데이트하지 않음)
-    
+
     Returns:
         저장 성공 여부
     """
-    if not NOTION_AVAILABLE:
-        print("오류: notion_client 모듈이 설치되지 않았습니다.")
-        return False
-    
     try:
-        # 먼저 사용자 행 찾기
-        headers = {
-            "Authorization": f"Bearer {NOTION_API_KEY}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-        
-        url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-        payload = {
-            "filter": {
-                "property": "아이디",
-                "title": {
-                    "equals": user_id
-                }
-            }
-        }
-        
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            response_data = response.json()
-        
         # 사용자 행 찾기
         page_id = None
         existing_keys = {"openai": "", "groq": "", "gemini": ""}
-        
-        for page in response_data.get("results", []):
+
+        for page in await _query_user_rows(user_id):
             props = page.get("properties", {})
             try:
                 id_prop = props.get("아이디", {}).get("title", [])
                 if not id_prop:
                     continue
-                
+
                 db_user_id = id_prop[0].get("text", {}).get("content", "")
                 if db_user_id == user_id:
                     page_id = page.get("id")
-                    
+
                     # 기존 API 키 가져오기
-                    openai_prop = props.get("OpenAI API 키", {}).get("rich_text", [])
-                    groq_prop = props.get("Groq API 키", {}).get("rich_text", [])
-                    gemini_prop = props.get("Gemini API 키", {}).get("rich_text", [])
-                    
-                    existing_keys["openai"] = openai_prop[0].get("text", {}).get("content", "") if openai_prop else ""
-                    existing_keys["groq"] = groq_prop[0].get("text", {}).get("content", "") if groq_prop else ""
-                    existing_keys["gemini"] = gemini_prop[0].get("text", {}).get("content", "") if gemini_prop else ""
+                    existing_keys = _extract_api_keys(props)
                     break
             except (KeyError, IndexError, TypeError):
                 continue
-        
+
         if not page_id:
-            print(f"❌ 사용자를 찾을 수 없습니다: user_id={user_id}")
+            logger.warning("사용자를 찾을 수 없습니다", extra={"user_id": user_id})
             return False
-        
+
         # 업데이트할 키 결정 (빈 문자열이 아닌 경우만 업데이트)
         update_keys = {
             "openai": openai_key if openai_key and openai_key.strip() else existing_keys["openai"],
             "groq": groq_key if groq_key and groq_key.strip() else existing_keys["groq"],
             "gemini": gemini_key if gemini_key and gemini_key.strip() else existing_keys["gemini"],
         }
-        
+
         # Notion 페이지 업데이트 (모든 필드 업데이트)
-        update_url = f"https://api.notion.com/v1/pages/{page_id}"
         update_payload = {
             "properties": {
-                "OpenAI API 키": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": update_keys["openai"]
-                            }
-                        }
-                    ]
-                },
-                "Groq API 키": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": update_keys["groq"]
-                            }
-                        }
-                    ]
-                },
-                "Gemini API 키": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": update_keys["gemini"]
-                            }
-                        }
-                    ]
-                },
+                "OpenAI API 키": _rich_text(update_keys["openai"]),
+                "Groq API 키": _rich_text(update_keys["groq"]),
+                "Gemini API 키": _rich_text(update_keys["gemini"]),
             }
         }
-        
-        with httpx.Client() as client:
-            response = client.patch(update_url, headers=headers, json=update_payload)
-            response.raise_for_status()
-        
-        print(f"✅ Notion에 API 키 저장 성공: user_id={user_id}")
+
+        client = get_notion_http()
+        response = await client.patch(
+            f"/pages/{page_id}",
+            headers=notion_headers(NOTION_API_KEY),
+            json=update_payload
+        )
+        response.raise_for_status()
+
+        # write-through: 저장된 값으로 캐시 갱신
+        await _api_key_cache.set(user_id, update_keys)
+
+        logger.info("Notion에 API 키 저장 성공", extra={"user_id": user_id})
         return True
-        
-    except Exception as e:
-        print(f"❌ Notion에 API 키 저장 실패: user_id={user_id}, error={str(e)}")
-        import traceback
-        traceback.print_exc()
+
+    except Exception:
+        logger.exception("Notion에 API 키 저장 실패", extra={"user_id": user_id})
         return False
@@ -0,0 +1,127 @@
+# notion/http_client.py
+# Notion API 공용 비동기 HTTP 클라이언트
+# 앱 시작 시 한 번 생성하고 종료 시 닫아서 모든 Notion 요청이 keep-alive 연결을 재사용합니다.
+import os
+import re
+import time
+from typing import Optional
+
+import httpx
+
+from metrics import notion_request_duration_seconds, notion_requests_in_flight
+from tracing import start_span
+
+NOTION_VERSION = "2022-06-28"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _http2_enabled() -> bool:
+    """NOTION_HTTP2=0 이 아니고 h2 패키지가 설치된 경우에만 HTTP/2 사용"""
+    if os.getenv("NOTION_HTTP2", "1").lower() in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+_NOTION_ID_PATTERN = re.compile(r'^[0-9a-fA-F-]{32,36}$')
+
+
+def _notion_operation(request: httpx.Request) -> str:
+    """메트릭 라벨용 요청 종류 (ID를 빼고 "POST /databases/{id}/query" 형태로)"""
+    parts = [
+        "{id}" if _NOTION_ID_PATTERN.match(part) else part
+        for part in request.url.path.split("/") if part and part != "v1"
+    ]
+    return f"{request.method} /{'/'.join(parts)}"
+
+
+class _InstrumentedClient(httpx.AsyncClient):
+    """요청 종류별 소요 시간/진행 중 요청 수를 metrics에 기록하고 요청마다 tracing span을 만드는 클라이언트"""
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        status = "error"
+        operation = _notion_operation(request)
+        start = time.perf_counter()
+        try:
+            with start_span(f"notion {operation}", kind="client", **{"http.method": request.method, "http.url": str(request.url)}) as span:
+                with notion_requests_in_flight.track_inflight():
+                    response = await super().send(request, **kwargs)
+                status = response.status_code
+                span.set_attribute("http.status_code", status)
+            return response
+        finally:
+            notion_request_duration_seconds.observe(time.perf_counter() - start, operation=operation, status=status)
+
+
+def _build_client() -> httpx.AsyncClient:
+    """환경 변수 설정으로 공용 클라이언트 생성"""
+    timeout = httpx.Timeout(
+        _env_float("NOTION_HTTP_TIMEOUT", 15.0),
+        connect=_env_float("NOTION_HTTP_CONNECT_TIMEOUT", 5.0),
+        pool=_env_float("NOTION_HTTP_POOL_TIMEOUT", 5.0),
+    )
+    limits = httpx.Limits(
+        max_connections=_env_int("NOTION_HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int("NOTION_HTTP_MAX_KEEPALIVE", 10),
+        keepalive_expiry=_env_float("NOTION_HTTP_KEEPALIVE_EXPIRY", 60.0),
+    )
+    return _InstrumentedClient(
+        base_url=os.getenv("NOTION_API_BASE_URL", "https://api.notion.com/v1"),
+        http2=_http2_enabled(),
+        timeout=timeout,
+        limits=limits,
+    )
+
+
+async def init_notion_http() -> httpx.AsyncClient:
+    """앱 시작 시 공용 클라이언트 생성 (lifespan에서 호출)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_notion_http() -> None:
+    """앱 종료 시 공용 클라이언트 정리 (lifespan에서 호출)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_notion_http() -> httpx.AsyncClient:
+    """
+    공용 클라이언트 반환
+    lifespan 밖(스크립트 등)에서 호출되면 지연 생성합니다.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+def notion_headers(api_key: str) -> dict:
+    """Notion API 요청 헤더"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Notion-Version": NOTION_VERSION,
+        "Content-Type": "application/json"
+    }
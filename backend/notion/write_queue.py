@@ -0,0 +1,251 @@
+# notion/write_queue.py
+# Notion 글 저장용 write-behind 큐 (SQLite 기반, 프로세스가 재시작되어도 작업 유지)
+#
+# 생성 엔드포인트는 enqueue 후 바로 응답하고, 백그라운드 워커가 배치 단위로 작업을 꺼내
+# Notion에 저장합니다. 실패하면 지수 백오프로 재시도하고, 최대 시도 횟수를 넘으면 dead 상태로 보관합니다.
+# 같은 DB 파일을 여러 워커 프로세스가 함께 쓸 수 있도록 작업은 lease 방식으로 가져갑니다.
+# (inflight 작업의 next_attempt_at = lease 만료 시각, 만료될 때까지 끝나지 않은 작업은 다른 워커가 다시 가져감)
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from notion.article_db import save_article_to_notion_db
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notion_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending / inflight / dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,  -- inflight면 lease 만료 시각
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notion_jobs_ready ON notion_jobs (status, next_attempt_at);
+"""
+
+# 작업 종류별 처리 함수 (True 반환 시 성공)
+_HANDLERS = {
+    "article": save_article_to_notion_db,
+}
+
+
+class NotionWriteQueue:
+    def __init__(
+        self,
+        path: str,
+        workers: int = 2,
+        batch_size: int = 10,
+        max_attempts: int = 6,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0
+    ):
+        self.path = path
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list = []
+        self._stopping = False
+
+    # ---------------- SQLite (스레드에서 실행) ----------------
+
+    def _open(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        # 처리 중 종료된 프로세스의 inflight 작업은 lease가 만료되면 _claim에서 다시 가져감
+        # (다른 워커가 처리 중인 작업을 건드리지 않도록 여기서 일괄 초기화하지 않음)
+        self._conn = conn
+
+    def _insert(self, kind: str, payload: dict) -> int:
+        now = time.time()
+        with self._db_lock:
+            cursor = self._conn.execute(
+                "INSERT INTO notion_jobs (kind, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(payload, ensure_ascii=False), now, now)
+            )
+            return cursor.lastrowid
+
+    def _claim(self, limit: int) -> list:
+        """실행 시각이 된 대기 작업(과 lease가 만료된 inflight 작업)을 최대 limit개 inflight로 바꾸고 반환"""
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, kind, payload, attempts FROM notion_jobs "
+                    "WHERE status IN ('pending', 'inflight') AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE notion_jobs SET status = 'inflight', next_attempt_at = ? WHERE id = ?",
+                        [(now + self.lease_seconds, row[0]) for row in rows]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _complete(self, job_id: int) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM notion_jobs WHERE id = ?", (job_id,))
+
+    def _fail(self, job_id: int, attempts: int, error: str) -> str:
+        """재시도 예약 또는 dead-letter 처리 후 새 상태 반환"""
+        if attempts >= self.max_attempts:
+            new_status, next_at = "dead", time.time()
+        else:
+            delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+            new_status, next_at = "pending", time.time() + delay * random.uniform(0.8, 1.2)
+        with self._db_lock:
+            self._conn.execute(
+                "UPDATE notion_jobs SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (new_status, attempts, next_at, error[:1000], job_id)
+            )
+        return new_status
+
+    def _counts(self) -> dict:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM notion_jobs GROUP BY status").fetchall()
+        counts = {"pending": 0, "inflight": 0, "dead": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def _requeue_dead(self) -> int:
+        with self._db_lock:
+            cursor = self._conn.execute(
+                "UPDATE notion_jobs SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'",
+                (time.time(),)
+            )
+            return cursor.rowcount
+
+    # ---------------- 비동기 API ----------------
+
+    async def start(self) -> None:
+        """DB 열기 및 워커 시작 (lifespan에서 호출)"""
+        if self._conn is None:
+            await asyncio.to_thread(self._open)
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """워커 종료 (처리 중인 배치는 timeout까지 기다림, 남은 작업은 DB에 유지)"""
+        self._stopping = True
+        if self._wakeup:
+            self._wakeup.set()
+        if self._tasks:
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def enqueue(self, kind: str, payload: dict) -> int:
+        """작업 추가 후 즉시 반환 (Notion 장애가 호출자 지연으로 이어지지 않음)"""
+        if self._conn is None:
+            await asyncio.to_thread(self._open)
+        job_id = await asyncio.to_thread(self._insert, kind, payload)
+        if self._wakeup:
+            self._wakeup.set()
+        return job_id
+
+    async def enqueue_article(self, **kwargs) -> int:
+        """save_article_to_notion_db 인자를 그대로 받아 저장 작업 추가"""
+        return await self.enqueue("article", kwargs)
+
+    async def stats(self) -> dict:
+        if self._conn is None:
+            return {"pending": 0, "inflight": 0, "dead": 0}
+        return await asyncio.to_thread(self._counts)
+
+    async def requeue_dead(self) -> int:
+        """dead-letter 작업을 다시 대기열로 (Notion 장애 복구 후 수동 실행용)"""
+        count = await asyncio.to_thread(self._requeue_dead)
+        if count and self._wakeup:
+            self._wakeup.set()
+        return count
+
+    async def _run_job(self, job_id: int, kind: str, payload: str, attempts: int) -> None:
+        attempts += 1
+        handler = _HANDLERS.get(kind)
+        try:
+            if handler is None:
+                raise ValueError(f"알 수 없는 작업 종류: {kind}")
+            succeeded = await handler(**json.loads(payload))
+            error = "" if succeeded else "Notion 저장 실패 (handler가 False 반환)"
+        except Exception as e:
+            succeeded, error = False, str(e)
+        # 결과 기록 중 SQLite 오류는 저장 실패로 보지 않고 호출한 워커로 올려 보냄
+        if succeeded:
+            await asyncio.to_thread(self._complete, job_id)
+            return
+        new_status = await asyncio.to_thread(self._fail, job_id, attempts, error)
+        if new_status == "dead":
+            logger.error("Notion 저장 작업 dead-letter 처리", extra={"job_id": job_id, "attempts": attempts, "error": error})
+        else:
+            logger.warning("Notion 저장 작업 재시도 예약", extra={"job_id": job_id, "attempts": attempts, "error": error})
+
+    async def _worker(self, index: int) -> None:
+        while not self._stopping:
+            try:
+                rows = await asyncio.to_thread(self._claim, self.batch_size)
+            except Exception as e:
+                logger.warning("Notion 저장 큐 조회 실패", extra={"worker": index, "error": str(e)})
+                rows = []
+
+            if rows:
+                # 배치 내 작업은 동시에 처리 (공용 HTTP 연결 풀 재사용)
+                # 결과 기록(_complete/_fail) 중 SQLite 오류가 나도 워커는 계속 실행
+                # (기록하지 못한 작업은 inflight로 남아 lease 만료 후 다시 처리됨)
+                results = await asyncio.gather(*[self._run_job(*row) for row in rows], return_exceptions=True)
+                for row, result in zip(rows, results):
+                    if isinstance(result, Exception):
+                        logger.error(
+                            "Notion 저장 작업 결과 기록 실패 (lease 만료 후 다시 처리)",
+                            extra={"worker": index, "job_id": row[0], "error": str(result)}
+                        )
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+notion_write_queue = NotionWriteQueue(
+    path=os.getenv("NOTION_WRITE_QUEUE_PATH", os.path.join("data", "notion_write_queue.sqlite3")),
+    workers=int(os.getenv("NOTION_WRITE_QUEUE_WORKERS", "2")),
+    batch_size=int(os.getenv("NOTION_WRITE_QUEUE_BATCH_SIZE", "10")),
+    max_attempts=int(os.getenv("NOTION_WRITE_QUEUE_MAX_ATTEMPTS", "6")),
+    base_delay=float(os.getenv("NOTION_WRITE_QUEUE_BASE_DELAY", "2")),
+    max_delay=float(os.getenv("NOTION_WRITE_QUEUE_MAX_DELAY", "300")),
+    lease_seconds=float(os.getenv("NOTION_WRITE_QUEUE_LEASE_SECONDS", "300"))
+)
@@ -0,0 +1,172 @@
+"""
+최종 글 생성 입력 압축 (토큰 예산)
+
+generate_final은 세 모델의 초안 전체와 분석을 한 프롬프트로 보내므로 앱에서 가장 느리고 비싼 호출입니다.
+프롬프트를 만들기 전에 아래 순서로 입력을 줄입니다.
+1. 초안 사이에 거의 같은 문단은 처음 나온 초안에만 남김
+2. 그래도 예산(LLM_FINAL_INPUT_TOKEN_BUDGET)을 넘으면 긴 초안부터 문단 단위로 뒤쪽을 잘라
+   초안별 토큰이 비슷해지도록 맞춤 (분석은 짧고 개선 방향을 담고 있으므로 유지)
+
+무엇을 얼마나 줄였는지는 report로 반환합니다.
+토큰 수는 tiktoken이 설치되어 있으면 정확히, 없으면 문자 종류별 근사치로 계산합니다.
+"""
+import os
+import re
+from typing import Optional
+
+# tiktoken (선택)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# 최종 글 프롬프트(system + user) 입력 토큰 예산 (0이면 중복 제거만 하고 자르지 않음)
+FINAL_INPUT_TOKEN_BUDGET = int(os.getenv("LLM_FINAL_INPUT_TOKEN_BUDGET", "6000"))
+# 이 비율 이상 겹치는 문단은 중복으로 판단 (글자 3-gram Jaccard 유사도)
+DUPLICATE_SIMILARITY = float(os.getenv("LLM_FINAL_DUPLICATE_SIMILARITY", "0.8"))
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n|\n')
+_NORMALIZE_PATTERN = re.compile(r'[\s\W_]+')
+
+# tiktoken 인코딩 (OpenAI 모델만 정확, Groq(Llama)는 같은 BPE 계열로 근사)
+_TIKTOKEN_ENCODINGS = {"openai": "o200k_base", "groq": "cl100k_base"}
+_encoders: dict = {}
+
+_stats = {"requests": 0, "compacted": 0, "tokens_saved": 0, "duplicate_paragraphs": 0, "trimmed_paragraphs": 0}
+
+
+def _encoder(model_type: str):
+    name = _TIKTOKEN_ENCODINGS.get(model_type)
+    if not TIKTOKEN_AVAILABLE or name is None:
+        return None
+    if name not in _encoders:
+        _encoders[name] = tiktoken.get_encoding(name)
+    return _encoders[name]
+
+
+def count_tokens(text: str, model_type: str = "gemini") -> int:
+    """
+    프로바이더 기준 토큰 수
+
+    tiktoken이 없거나 Gemini처럼 로컬 토크나이저가 없으면 근사치를 사용합니다.
+    (ASCII 4자당 1토큰, 한글 등 그 외 문자 1.5자당 1토큰 - 실제보다 약간 많게 잡는 쪽)
+    """
+    encoder = _encoder(model_type)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def _shingles(text: str) -> set:
+    normalized = _NORMALIZE_PATTERN.sub("", text)
+    if len(normalized) < 3:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+def _is_duplicate(shingles: set, seen: list) -> bool:
+    for other in seen:
+        union = len(shingles | other)
+        if union and len(shingles & other) / union >= DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+
+def dedupe_paragraphs(drafts: list) -> tuple:
+    """
+    초안 사이에 겹치는 문단 제거 (같은 초안 안의 문단은 비교하지 않음)
+
+    Returns:
+        (중복 문단을 뺀 초안 리스트, 초안별 제거한 문단 수 dict)
+    """
+    seen = []
+    result = []
+    removed = {}
+    for draft in drafts:
+        kept = []
+        own = []
+        for paragraph in _PARAGRAPH_SPLIT.split(draft.get("content", "")):
+            if not paragraph.strip():
+                continue
+            shingles = _shingles(paragraph)
+            if shingles and _is_duplicate(shingles, seen):
+                removed[draft.get("model", "")] = removed.get(draft.get("model", ""), 0) + 1
+                continue
+            kept.append(paragraph.strip())
+            own.append(shingles)
+        seen.extend(own)
+        result.append({**draft, "content": "\n".join(kept)})
+    return result, removed
+
+
+def _trim_to_tokens(content: str, max_tokens: int, model_type: str) -> tuple:
+    """문단 단위로 앞에서부터 max_tokens까지만 남김 → (잘린 내용, 제거한 문단 수)"""
+    paragraphs = content.split("\n")
+    kept = []
+    used = 0
+    for paragraph in paragraphs:
+        tokens = count_tokens(paragraph, model_type)
+        if kept and used + tokens > max_tokens:
+            break
+        kept.append(paragraph)
+        used += tokens
+    return "\n".join(kept), len(paragraphs) - len(kept)
+
+
+def compact_final_inputs(drafts: list, fixed_tokens: int, model_type: str = "gemini", budget: Optional[int] = None) -> tuple:
+    """
+    최종 글 프롬프트 입력 압축
+
+    Args:
+        drafts: [{'model': '...', 'content': '...'}, ...]
+        fixed_tokens: 초안을 뺀 나머지 프롬프트(system 지시문, 주제, 분석)의 토큰 수
+        model_type: 토큰을 셀 프로바이더
+        budget: 전체 입력 토큰 예산 (None이면 LLM_FINAL_INPUT_TOKEN_BUDGET)
+
+    Returns:
+        (압축한 초안 리스트, report)
+    """
+    budget = FINAL_INPUT_TOKEN_BUDGET if budget is None else budget
+    _stats["requests"] += 1
+    before = fixed_tokens + sum(count_tokens(d.get("content", ""), model_type) for d in drafts)
+
+    drafts, duplicates = dedupe_paragraphs(drafts)
+    sizes = [count_tokens(d["content"], model_type) for d in drafts]
+
+    trimmed = {}
+    available = budget - fixed_tokens
+    if budget > 0 and sum(sizes) > available and drafts:
+        # 초안별 상한을 찾아 긴 초안부터 자름 (짧은 초안은 그대로 두고 남는 예산을 나머지에 배분)
+        remaining = max(available, 0)
+        limits = {}
+        for index in sorted(range(len(drafts)), key=lambda i: sizes[i]):
+            share = remaining // (len(drafts) - len(limits))
+            limits[index] = min(sizes[index], share)
+            remaining -= limits[index]
+        for index, limit in limits.items():
+            if sizes[index] > limit:
+                content, removed = _trim_to_tokens(drafts[index]["content"], limit, model_type)
+                trimmed[drafts[index].get("model", "")] = removed
+                drafts[index] = {**drafts[index], "content": content}
+
+    after = fixed_tokens + sum(count_tokens(d["content"], model_type) for d in drafts)
+    report = {
+        "budget": budget,
+        "tokens_before": before,
+        "tokens_after": after,
+        "token_counter": "tiktoken" if _encoder(model_type) is not None else "approx",
+        "duplicate_paragraphs": duplicates,
+        "trimmed_paragraphs": trimmed,
+    }
+    if duplicates or trimmed:
+        _stats["compacted"] += 1
+        _stats["tokens_saved"] += before - after
+        _stats["duplicate_paragraphs"] += sum(duplicates.values())
+        _stats["trimmed_paragraphs"] += sum(trimmed.values())
+    return drafts, report
+
+
+def get_prompt_compaction_stats() -> dict:
+    return {"budget": FINAL_INPUT_TOKEN_BUDGET, "tiktoken": TIKTOKEN_AVAILABLE, **_stats}
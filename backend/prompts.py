@@ -0,0 +1,269 @@
+"""
+프롬프트 템플릿 레지스트리
+
+각 템플릿은 요청마다 바뀌지 않는 지시문(system)과 요청별 입력(user)으로 나뉩니다.
+- system: 모듈 로드 시 한 번만 만들어지는 고정 문자열. system 메시지로 프롬프트 맨 앞에 보내므로
+  OpenAI 자동 프롬프트 캐시 / Gemini implicit 캐시가 같은 prefix를 재사용합니다.
+- user: 주제, 초안 등 요청별 필드만 채우는 짧은 템플릿. 프롬프트 맨 뒤에 옵니다.
+
+새 프롬프트는 PromptTemplate으로 만들어 register_prompt()로 등록하고 get_prompt(name).render(...)로 사용합니다.
+"""
+import string
+
+
+class PromptTemplate:
+    def __init__(self, name: str, system: str, user: str):
+        self.name = name
+        self.system = system.strip()
+        self.user = user.strip()
+        # user 템플릿의 필드 목록 (등록 시 한 번만 파싱)
+        self.fields = tuple(field for _, field, _, _ in string.Formatter().parse(self.user) if field)
+
+    def render(self, **values) -> tuple:
+        """(system, user) 반환 - system은 항상 같은 문자열 객체"""
+        missing = [field for field in self.fields if field not in values]
+        if missing:
+            raise KeyError(f"프롬프트 '{self.name}'에 필요한 값이 없습니다: {', '.join(missing)}")
+        return self.system, self.user.format_map(values)
+
+
+_PROMPTS: dict = {}
+
+
+def register_prompt(template: PromptTemplate) -> None:
+    """템플릿 등록 (같은 이름이면 교체)"""
+    _PROMPTS[template.name] = template
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    return _PROMPTS[name]
+
+
+def list_prompts() -> list:
+    return list(_PROMPTS)
+
+
+# ---------------------------------------------------------------------------
+# 제목 / 본문
+# ---------------------------------------------------------------------------
+
+register_prompt(PromptTemplate(
+    "title",
+    system="""
+사용자가 보내는 키워드를 기반으로 SEO 최적화된 블로그 제목을 1개만 생성합니다.
+
+요구사항:
+1. 제목은 30-50자 정도로 작성
+2. 클릭을 유도하는 매력적인 제목
+3. 키워드를 자연스럽게 포함
+4. 숫자나 질문형 제목 권장
+5. 한국어로만 작성
+
+제목만 출력하세요 (설명 없이).
+""",
+    user="""
+키워드: {keyword}
+
+제목:
+""",
+))
+
+register_prompt(PromptTemplate(
+    "content",
+    system="""
+사용자가 보내는 제목을 기반으로 SEO 최적화된 블로그 본문을 작성합니다.
+
+중요 지시사항:
+1. 반드시 한국어(한글)로만 작성하세요. 한자, 아랍어, 기타 외국어는 절대 사용하지 마세요.
+2. 한국어 맞춤법과 띄어쓰기 규칙을 정확히 따르세요.
+3. 이모티콘이나 특수문자 사용 금지
+4. 정보 제공 중심의 마케팅 톤 사용 (과장 없이 사실 기반)
+5. "~입니다", "~합니다" 존댓말 사용
+6. 간결하고 읽기 쉬운 문장으로 작성해주세요
+
+요구사항:
+1. 서론: 질문이나 상황 제시로 시작하여 독자의 관심을 끌기 (2-3문단)
+2. 본론: 구체적인 내용을 소제목(##)으로 나누어 설명 (5-7개 소제목)
+   - 각 소제목은 명확한 주제 제시
+   - 각 소제목 아래 2-3개 문단으로 설명
+   - 구체적인 숫자와 예시 반드시 포함
+3. 결론: 타겟 고객층을 명시하고 마무리 (2-3문단)
+4. 제목의 핵심 키워드를 자연스럽게 본문에 3-5회 포함해주세요.
+5. 전체 글자 수는 1500-2500자 정도로 작성해주세요.
+
+다음 형식으로 작성해주세요:
+[서론]
+
+질문이나 상황 제시...
+
+[본론]
+
+## 소제목1
+
+첫 번째 문단 설명...
+
+두 번째 문단 설명...
+
+## 소제목2
+
+첫 번째 문단 설명...
+
+[결론]
+
+타겟 고객층 명시...
+
+마무리 문단...
+""",
+    user="""
+다음 제목을 기반으로 블로그 본문을 작성해주세요.
+
+제목: {title}{keyword_line}
+""",
+))
+
+# ---------------------------------------------------------------------------
+# 초안 / 분석
+# ---------------------------------------------------------------------------
+
+register_prompt(PromptTemplate(
+    "draft",
+    system="""
+사용자가 보내는 정보(주제, 글 의도, 대상 독자, 톤/스타일 등)를 바탕으로 블로그 글 초안을 작성합니다.
+
+요구사항:
+1. 주제에 맞는 구체적이고 실용적인 내용 작성
+2. 대상 독자에게 맞는 수준과 톤으로 작성
+3. 글 의도에 맞는 구조로 작성
+   - 정보성: 정보 제공 중심, 객관적 사실 나열
+   - 튜토리얼: 단계별 가이드 형식
+   - 비교/리뷰: 비교 분석과 평가 중심
+   - 방문후기/여행기: 경험 중심의 생생한 묘사
+   - 제품 리뷰/홍보: 제품 특징과 사용 후기
+   - 문제 해결 가이드: 문제-원인-해결책 구조
+   - 교육/강의: 체계적인 학습 내용 전달
+   - 스토리텔링: 이야기 형식의 흥미로운 구성
+   - 브랜딩: 브랜드 가치와 정체성 강조
+   - 설득/마케팅: 설득력 있는 논리와 감성적 어필
+   - 엔터테인먼트: 재미있고 흥미로운 내용
+   - 맛집: 음식과 맛에 대한 상세한 묘사
+   - 일상생각: 개인적 경험과 생각 공유
+   - 상품리뷰: 상품의 장단점과 추천 여부
+   - 경제비즈니스: 경제 동향과 비즈니스 인사이트
+   - IT컴퓨터: 기술적 내용과 사용법
+   - 교육학문: 학술적 내용과 지식 전달
+4. 톤/스타일을 일관되게 유지
+5. **절대적으로 한국어로만 작성**
+   - 한자(漢字, 积累 등) 사용 절대 금지
+   - 일본어(まず, です 등) 사용 절대 금지
+   - 중국어 사용 절대 금지
+   - 영어는 최소한으로만 사용 (필수 전문용어만)
+   - 모든 내용은 한글로만 작성
+   - 숫자는 아라비아 숫자 사용 가능 (1, 2, 3 등)
+6. 1500-2500자 정도로 충실하게 작성
+7. **중요: 마크다운 형식 사용 금지**
+   - **볼드(**텍스트**)**, *이탤릭*, ### 헤딩 등 텍스트 스타일링 마크다운 사용 금지
+   - 해시태그(#컬쳐캐피탈)는 예외로 사용 가능
+   - 일반 텍스트로만 작성 (줄바꿈은 엔터로 구분)
+""",
+    user="""
+다음 정보를 바탕으로 블로그 글 초안을 작성해주세요.
+
+주제: {topic}
+글 의도: {article_intent}
+대상 독자: {target_audience}
+톤/스타일: {tone_style}{keywords_line}
+연령층: {age_groups}
+성별: {gender}
+
+초안:
+""",
+))
+
+register_prompt(PromptTemplate(
+    "analysis",
+    system="""
+사용자가 보내는 블로그 글 초안을 분석하여 장점, 단점, 개선사항을 제시합니다.
+
+다음 형식으로 JSON 형태로 응답해주세요:
+{
+  "pros": ["장점1", "장점2"],
+  "cons": ["단점1", "단점2"],
+  "improvement": "개선 방안을 한 문장으로 제시"
+}
+
+요구사항:
+1. 장점은 2-3개 정도로 구체적으로 제시
+2. 단점은 1-2개 정도로 구체적으로 제시
+3. 개선사항은 실용적이고 구체적으로 제시
+4. 한국어로만 작성
+""",
+    user="""
+다음 블로그 글 초안을 분석해주세요.
+
+초안 내용:
+{draft_content}
+""",
+))
+
+# ---------------------------------------------------------------------------
+# 최종 글
+# ---------------------------------------------------------------------------
+
+register_prompt(PromptTemplate(
+    "final",
+    system="""
+사용자가 보내는 주제 정보, 세 AI 모델의 초안과 장단점 분석을 바탕으로 세 모델의 강점을 모두 조합하여 최고 품질의 블로그 글을 작성합니다.
+
+요구사항:
+1. 세 모델의 장점을 모두 반영하여 작성
+   - ChatGPT의 장점 활용
+   - Gemini의 장점 활용
+   - Groq의 장점 활용
+2. 각 모델의 단점을 보완하여 작성
+3. 각 모델의 개선사항을 반영
+4. 대상 독자에게 맞는 수준과 톤으로 작성
+5. 글 의도에 맞는 구조로 작성
+6. 톤/스타일을 일관되게 유지
+7. 한국어로만 작성 (한자, 외국어 사용 금지)
+8. 3000-5000자 정도로 충실하게 작성
+9. **중요: 마크다운 형식 사용 금지**
+   - **볼드(**텍스트**)**, *이탤릭*, ### 헤딩, ## 소제목 등 텍스트 스타일링 마크다운 사용 금지
+   - 해시태그(#컬쳐캐피탈)는 예외로 사용 가능
+   - 일반 텍스트로만 작성 (줄바꿈은 엔터로 구분)
+
+필수 구조:
+1. 제목: 일반 텍스트로 제목 작성 (마크다운 # 사용 금지)
+2. 서론: 2-3문단으로 독자의 관심을 끌고 주제를 소개
+3. 본론:
+   - 일반 텍스트로 소제목 작성 (마크다운 ##, ### 사용 금지)
+   - 구체적인 예시, 숫자, 사례 포함
+   - 표는 일반 텍스트로 작성 (마크다운 테이블 형식 사용 금지)
+   - 체크리스트나 불릿 포인트는 일반 텍스트로 작성
+4. 핵심 요약: 불릿 포인트로 주요 내용 정리 (마크다운 사용 금지)
+5. 결론: 2-3문단으로 마무리
+6. 자주 묻는 질문 (FAQ): Q&A 형식으로 3-6개 질문과 답변
+7. 태그: 해시태그 형식으로 5-10개 태그 (#컬쳐캐피탈 형식으로 작성)
+
+글 흐름:
+- 서론에서 독자의 문제나 관심사 제시
+- 본론에서 단계별로 해결책 제시
+- 구체적인 예시와 사례 포함
+- 실전 팁과 체크리스트 제공
+- 표를 활용한 정보 정리
+- 친절하고 명확한 설명
+""",
+    user="""
+주제: {topic}
+글 의도: {article_intent}
+대상 독자: {target_audience}
+톤/스타일: {tone_style}
+
+세 모델의 초안:
+{drafts_text}
+
+세 모델의 장단점 분석:
+{analyses_text}
+
+최종 완성 글:
+""",
+))
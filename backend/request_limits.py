@@ -0,0 +1,86 @@
+"""
+요청 본문 크기 제한 (ASGI 미들웨어)
+
+Fly 머신(1GB, 동시 연결 25개)에서 큰 본문 몇 개가 JSON 파싱 전에 통째로 메모리에 쌓이는 것을 막습니다.
+- Content-Length가 한도를 넘으면 본문을 읽지 않고 바로 413 반환
+- Content-Length가 없거나(chunked) 틀린 경우에도 앱 호출 전에 본문을 읽으며 바이트를 세다가 한도를 넘는 순간 중단하고 413 반환
+  (한도 이내면 읽어 둔 조각을 그대로 앱에 넘김)
+"""
+import json
+import os
+
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(512 * 1024)))
+
+_stats = {"rejected_by_header": 0, "rejected_while_streaming": 0}
+
+
+def _format_size(size: int) -> str:
+    return f"{size // 1024}KB" if size >= 1024 and size % 1024 == 0 else f"{size}바이트"
+
+
+class RequestBodyLimitMiddleware:
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BODY_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_bytes:
+                    _stats["rejected_by_header"] += 1
+                    await self._reject(send)
+                    return
+                break
+
+        # 앱을 호출하기 전에 본문을 읽으며 바이트를 셈
+        # (receive 안에서 예외를 올리면 FastAPI 본문 파싱이 400으로 바꿔버리므로 여기서 직접 413 응답)
+        messages = []
+        received = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break  # http.disconnect
+            received += len(message.get("body", b""))
+            if received > self.max_bytes:
+                _stats["rejected_while_streaming"] += 1
+                await self._reject(send)
+                return
+            if not message.get("more_body", False):
+                break
+
+        async def replay_receive():
+            # 읽어 둔 조각을 순서대로 넘긴 뒤에는 원래 receive 사용 (스트리밍 응답 중 연결 종료 감지)
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    async def _reject(self, send):
+        body = json.dumps(
+            {"detail": f"요청 본문이 너무 큽니다. (최대 {_format_size(self.max_bytes)})"},
+            ensure_ascii=False
+        ).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def get_request_limit_stats() -> dict:
+    return {"max_body_bytes": MAX_REQUEST_BODY_BYTES, **_stats}
@@ -0,0 +1,290 @@
+"""
+LLM 프로바이더 보호 장치: 서킷 브레이커 + AIMD 동시성 제한
+
+- 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 요청을 즉시 거절(open)하고,
+  시간이 지나면 소수의 probe 요청만 통과시켜(half-open) 성공 시 다시 닫습니다.
+  키 문제(할당량/인증/429)는 (프로바이더, API 키)별, 서버 장애(5xx/연결 실패)는 프로바이더 전체 단위로 관리합니다.
+- AIMD 제한: (프로바이더, API 키)별 동시 요청 한도를 성공 시 조금씩 늘리고 429를 받으면 절반으로 줄입니다.
+  한도를 넘는 요청은 대기열에 쌓지 않고 바로 거절합니다.
+- 공유 상태 백엔드(redis)를 쓰면 키 차단(할당량/인증 실패, 429 retry-after)을 다른 워커와도 공유해
+  한 워커가 막힌 키로 다른 워커들이 계속 요청하지 않게 합니다. (동시성 한도는 워커별)
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from llm_clients import hash_api_key
+from shared_state import get_state_backend
+from llm_errors import (
+    ProviderUnavailableError, LLMAuthError, LLMQuotaError, LLMRateLimitError, LLMServerError, LLMTimeoutError
+)
+
+logger = logging.getLogger(__name__)
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("LLM_BREAKER_RESET_TIMEOUT", "30"))
+# 할당량 초과/인증 실패는 금방 회복되지 않으므로 더 오래 차단
+BREAKER_FATAL_RESET_TIMEOUT = float(os.getenv("LLM_BREAKER_FATAL_RESET_TIMEOUT", "300"))
+LIMITER_INITIAL = float(os.getenv("LLM_LIMITER_INITIAL", "8"))
+LIMITER_MIN = float(os.getenv("LLM_LIMITER_MIN", "1"))
+LIMITER_MAX = float(os.getenv("LLM_LIMITER_MAX", "64"))
+_MAX_TRACKED_KEYS = 1024
+
+
+def classify_error(e: BaseException) -> tuple:
+    """
+    예외를 (종류, retry_after초) 로 분류
+
+    종류: 'rate_limited' / 'fatal'(할당량·인증) / 'server'(5xx·연결·타임아웃) / 'client'(그 외 요청 오류)
+    """
+    if isinstance(e, LLMRateLimitError):
+        return "rate_limited", e.retry_after
+    if isinstance(e, (LLMQuotaError, LLMAuthError)):
+        return "fatal", None
+    if isinstance(e, (LLMServerError, LLMTimeoutError, TimeoutError, ConnectionError)):
+        return "server", None
+    return "client", None
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"  # closed / open / half_open
+        self.failures = 0
+        self.opened_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[float]:
+        """통과하면 None, 차단되면 남은 대기 시간(초) 반환"""
+        with self._lock:
+            if self.state == "closed":
+                return None
+            now = time.monotonic()
+            if self.state == "open":
+                if now < self.opened_until:
+                    return self.opened_until - now
+                self.state = "half_open"
+                self._probing = False
+            # half-open: probe 요청 하나만 통과
+            if self._probing:
+                return 1.0
+            self._probing = True
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, trip: bool = False, open_for: Optional[float] = None) -> None:
+        """실패 기록 (trip=True면 임계값과 관계없이 바로 open)"""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if trip or self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_until = time.monotonic() + max(open_for or 0.0, self.reset_timeout)
+
+    def release_probe(self) -> None:
+        """성공/실패로 판단할 수 없는 결과(요청 오류, 취소)면 probe 자리만 반납"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        remaining = max(0.0, self.opened_until - time.monotonic()) if self.state == "open" else 0.0
+        return {"state": self.state, "failures": self.failures, "open_remaining": round(remaining, 1)}
+
+
+class AIMDLimiter:
+    """Additive Increase / Multiplicative Decrease 동시 요청 한도"""
+
+    def __init__(self, name: str, initial: float = LIMITER_INITIAL, min_limit: float = LIMITER_MIN, max_limit: float = LIMITER_MAX):
+        self.name = name
+        self.limit = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> Optional[float]:
+        """자리가 있으면 None, 없으면 재시도까지 권장 대기 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                self.rejected += 1
+                return self.blocked_until - now
+            if self.inflight >= int(self.limit):
+                self.rejected += 1
+                return 1.0
+            self.inflight += 1
+            return None
+
+    def release(self, outcome: str = "success", retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.inflight = max(0, self.inflight - 1)
+            if outcome == "success":
+                # 한도만큼 성공하면 1 증가 (RTT당 +1)
+                self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+            elif outcome == "rate_limited":
+                self.limit = max(self.min_limit, self.limit / 2)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def backing_off(self) -> bool:
+        """retry-after 대기 중인지 여부"""
+        return time.monotonic() < self.blocked_until
+
+    def stats(self) -> dict:
+        return {"limit": round(self.limit, 2), "inflight": self.inflight, "rejected": self.rejected}
+
+
+class _BoundedRegistry:
+    """키별 상태 객체 (오래 사용하지 않은 키부터 제거)"""
+
+    def __init__(self, factory, maxsize: int = _MAX_TRACKED_KEYS):
+        self._factory = factory
+        self._items: "OrderedDict" = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = self._factory(key)
+                self._items[key] = item
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+            else:
+                self._items.move_to_end(key)
+            return item
+
+    def items(self) -> list:
+        with self._lock:
+            return list(self._items.items())
+
+
+_provider_breakers = _BoundedRegistry(lambda key: CircuitBreaker(key))
+_key_breakers = _BoundedRegistry(lambda key: CircuitBreaker(f"{key[0]}:{key[1][:8]}"))
+_limiters = _BoundedRegistry(lambda key: AIMDLimiter(f"{key[0]}:{key[1][:8]}"))
+
+
+def _shared_block_key(key: tuple) -> str:
+    return f"llm:blocked:{key[0]}:{key[1][:16]}"
+
+
+async def _shared_block_remaining(key: tuple) -> Optional[float]:
+    """다른 워커가 기록한 키 차단의 남은 시간 (공유 백엔드가 아니거나 조회 실패면 None)"""
+    backend = get_state_backend()
+    if not backend.shared:
+        return None
+    try:
+        until = await backend.get(_shared_block_key(key))
+    except Exception as e:
+        logger.warning("공유 차단 상태 조회 실패", extra={"provider": key[0], "error": str(e)})
+        return None
+    if until is None:
+        return None
+    remaining = until - time.time()
+    return remaining if remaining > 0 else None
+
+
+async def _share_block(key: tuple, seconds: Optional[float]) -> None:
+    backend = get_state_backend()
+    if not backend.shared or not seconds or seconds <= 0:
+        return
+    try:
+        await backend.set(_shared_block_key(key), time.time() + seconds, ttl=seconds)
+    except Exception as e:
+        logger.warning("공유 차단 상태 저장 실패", extra={"provider": key[0], "error": str(e)})
+
+
+@asynccontextmanager
+async def provider_guard(provider: str, api_key: str):
+    """
+    프로바이더 호출을 서킷 브레이커와 AIMD 제한으로 감싸기
+
+    차단 중이면 호출하지 않고 ProviderUnavailableError를 즉시 발생시킵니다.
+    """
+    key = (provider, hash_api_key(api_key or ""))
+    provider_breaker = _provider_breakers.get(provider)
+    key_breaker = _key_breakers.get(key)
+    limiter = _limiters.get(key)
+
+    wait = await _shared_block_remaining(key)
+    if wait is not None:
+        raise ProviderUnavailableError(
+            f"{provider.upper()} API 키가 일시적으로 차단되었습니다. {math.ceil(wait)}초 후 다시 시도해주세요.",
+            provider=provider,
+            retry_after=wait
+        )
+
+    admitted = []
+    for breaker in (provider_breaker, key_breaker):
+        wait = breaker.allow()
+        if wait is not None:
+            # 앞 브레이커에서 잡은 half-open probe 자리 반납 (반납하지 않으면 half_open에 계속 묶임)
+            for passed in admitted:
+                passed.release_probe()
+            raise ProviderUnavailableError(
+                f"{provider.upper()} API가 최근 오류가 반복되어 일시적으로 차단되었습니다. {math.ceil(wait)}초 후 다시 시도해주세요.",
+                provider=provider,
+                retry_after=wait
+            )
+        admitted.append(breaker)
+
+    wait = limiter.try_acquire()
+    if wait is not None:
+        provider_breaker.release_probe()
+        key_breaker.release_probe()
+        reason = "요청 한도 초과로 대기 중입니다" if limiter.backing_off() else "동시 요청이 많아 처리할 수 없습니다"
+        raise ProviderUnavailableError(
+            f"{provider.upper()} API {reason}. {math.ceil(wait)}초 후 다시 시도해주세요.",
+            provider=provider,
+            retry_after=wait
+        )
+
+    try:
+        yield
+    except BaseException as e:
+        # 프로바이더 구현이 SDK 예외를 llm_errors 타입으로 변환해 올려 보냄
+        kind, retry_after = classify_error(e)
+        limiter.release(kind, retry_after)
+        if kind == "fatal":
+            key_breaker.record_failure(trip=True, open_for=BREAKER_FATAL_RESET_TIMEOUT)
+            provider_breaker.release_probe()
+            await _share_block(key, BREAKER_FATAL_RESET_TIMEOUT)
+        elif kind == "rate_limited":
+            key_breaker.record_failure(open_for=retry_after)
+            provider_breaker.release_probe()
+            await _share_block(key, retry_after)
+        elif kind == "server":
+            provider_breaker.record_failure(open_for=retry_after)
+            key_breaker.release_probe()
+        else:
+            provider_breaker.release_probe()
+            key_breaker.release_probe()
+        raise
+    else:
+        limiter.release("success")
+        provider_breaker.record_success()
+        key_breaker.record_success()
+
+
+def get_resilience_stats() -> dict:
+    return {
+        "providers": {name: b.stats() for name, b in _provider_breakers.items()},
+        "keys": {b.name: b.stats() for _, b in _key_breakers.items() if b.state != "closed" or b.failures},
+        "limiters": {l.name: l.stats() for _, l in _limiters.items()},
+    }
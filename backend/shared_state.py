@@ -0,0 +1,259 @@
+"""
+프로세스 간 공유 상태 백엔드 (캐시, 토큰 폐기 목록, 차단/카운터, 작업 상태/선점)
+
+STATE_BACKEND로 선택합니다.
+- memory (기본): 프로세스 내 dict. 워커 1개로 실행할 때 사용
+- redis: Redis 호환 서버 (REDIS_URL, 기본 redis://localhost:6379/0).
+  uvicorn --workers N 이나 Fly 머신 여러 대로 실행할 때 사용 (redis 패키지는 requirements.txt에 포함)
+
+값은 JSON으로 저장하고 키 앞에 STATE_KEY_PREFIX를 붙입니다.
+init_state_backend / close_state_backend는 FastAPI lifespan에서 호출합니다.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from ttl_cache import TTLCache
+
+# Redis (선택)
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+STATE_KEY_PREFIX = os.getenv("STATE_KEY_PREFIX", "ynk:")
+
+
+class StateBackend:
+    """
+    공유 상태 인터페이스
+
+    shared가 True면 다른 프로세스와 값을 공유합니다. (False면 프로세스 내 상태)
+    """
+    name = ""
+    shared = False
+
+    async def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """키가 없을 때만 저장 (저장했으면 True) - 작업 선점(lease)용"""
+        raise NotImplementedError
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """카운터 증가 후 새 값 반환 (ttl은 키가 새로 만들어질 때만 적용)"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        # key -> (expires_at 또는 None, JSON 문자열) - redis와 같이 저장 시점의 값을 복사해 둠
+        self._data: dict = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def _live(self, key: str, now: float):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        return item
+
+    def _purge(self, now: float) -> None:
+        if now < self._next_purge:
+            return
+        self._next_purge = now + 60
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at is not None and expires_at <= now]:
+            del self._data[key]
+
+    async def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._live(key, time.monotonic())
+            return None if item is None else json.loads(item[1])
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            self._data[key] = (now + ttl if ttl else None, json.dumps(value, ensure_ascii=False))
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._live(key, now) is not None:
+                return False
+            self._data[key] = (now + ttl if ttl else None, json.dumps(value, ensure_ascii=False))
+            return True
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.monotonic()
+        with self._lock:
+            item = self._live(key, now)
+            if item is None:
+                item = (now + ttl if ttl else None, "0")
+            value = int(json.loads(item[1])) + amount
+            self._data[key] = (item[0], str(value))
+            return value
+
+
+class RedisStateBackend(StateBackend):
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str, prefix: str = STATE_KEY_PREFIX):
+        self.url = url
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url, decode_responses=True, health_check_interval=30)
+
+    async def ping(self) -> None:
+        await self._client.ping()
+
+    async def get(self, key: str) -> Any:
+        raw = await self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raw = json.dumps(value, ensure_ascii=False)
+        if ttl:
+            await self._client.set(self.prefix + key, raw, px=max(int(ttl * 1000), 1))
+        else:
+            await self._client.set(self.prefix + key, raw)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        raw = json.dumps(value, ensure_ascii=False)
+        px = max(int(ttl * 1000), 1) if ttl else None
+        return bool(await self._client.set(self.prefix + key, raw, px=px, nx=True))
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        full_key = self.prefix + key
+        value = int(await self._client.incrby(full_key, amount))
+        if ttl and value == amount:
+            # 이번 호출에서 키가 만들어진 경우에만 만료 시간 설정
+            await self._client.pexpire(full_key, max(int(ttl * 1000), 1))
+        return value
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+_backend: StateBackend = MemoryStateBackend()
+
+
+def get_state_backend() -> StateBackend:
+    return _backend
+
+
+async def init_state_backend() -> StateBackend:
+    """STATE_BACKEND 설정에 맞는 백엔드 연결 (lifespan 시작 시 호출, 연결 실패 시 예외로 시작 중단)"""
+    global _backend
+    if STATE_BACKEND == "redis":
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("STATE_BACKEND=redis 이지만 redis 패키지가 설치되지 않았습니다. (pip install redis)")
+        backend = RedisStateBackend(REDIS_URL)
+        await backend.ping()
+        _backend = backend
+    elif STATE_BACKEND != "memory":
+        raise RuntimeError(f"지원하지 않는 STATE_BACKEND={STATE_BACKEND} (memory/redis)")
+
+    workers = int(os.getenv("WEB_CONCURRENCY", "1") or 1)
+    if workers > 1 and not _backend.shared:
+        logger.warning("워커가 여러 개인데 STATE_BACKEND=memory 입니다. 캐시/토큰 폐기/차단 상태가 워커마다 따로 관리됩니다.", extra={"workers": workers})
+    logger.info("공유 상태 백엔드 사용", extra={"backend": _backend.name})
+    return _backend
+
+
+async def close_state_backend() -> None:
+    """백엔드 연결 종료 (lifespan 종료 시 호출)"""
+    global _backend
+    await _backend.close()
+    _backend = MemoryStateBackend()
+
+
+class SharedCache:
+    """
+    get/set/delete 캐시 (memory면 프로세스 내 TTLCache, 공유 백엔드면 백엔드에 저장)
+
+    공유 백엔드를 쓰면 한 워커에서 저장(write-through)한 값을 다른 워커도 바로 읽습니다.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0):
+        self.name = name
+        self.ttl = ttl
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        backend = get_state_backend()
+        if not backend.shared:
+            return self._local.get(key, default)
+        value = await backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        backend = get_state_backend()
+        if not backend.shared:
+            self._local.set(key, value, ttl)
+            return
+        await backend.set(self._key(key), value, self.ttl if ttl is None else ttl)
+
+    async def delete(self, key: str) -> None:
+        backend = get_state_backend()
+        if not backend.shared:
+            self._local.delete(key)
+            return
+        await backend.delete(self._key(key))
+
+    def stats(self) -> dict:
+        if not get_state_backend().shared:
+            return self._local.stats()
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "backend": get_state_backend().name,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def get_state_backend_stats() -> dict:
+    return {"backend": _backend.name, "shared": _backend.shared}
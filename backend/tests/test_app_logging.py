@@ -0,0 +1,28 @@
+"""app_logging 종료 후 로그 유실 테스트"""
+import json
+import logging
+
+import app_logging
+
+
+def test_logs_after_shutdown_are_written_directly(capsys, monkeypatch):
+    monkeypatch.setattr(app_logging, "LOG_FORMAT", "json")
+    # main import 시 설치된 리스너와 분리된 새 리스너로 테스트
+    monkeypatch.setattr(app_logging, "_listener", None)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        app_logging.setup_logging()
+        logging.getLogger("test").info("종료 전")
+        app_logging.shutdown_logging()
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger("test").exception("종료 후", extra={"api_key": "secret"})
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["msg"] for line in lines] == ["종료 전", "종료 후"]
+    assert lines[1]["api_key"] == app_logging.REDACTED
+    assert "RuntimeError: boom" in lines[1]["exc"]
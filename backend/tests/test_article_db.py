@@ -0,0 +1,66 @@
+"""기록 조회 실패가 빈 목록으로 삼켜지지 않는지 테스트"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import main
+from notion import article_db
+from notion.article_db import ArticleQueryError
+
+
+def _page(n: int) -> dict:
+    return {
+        "id": f"page-{n}",
+        "properties": {"유형": {"select": {"name": "최종글"}}},
+    }
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    """첫 페이지는 성공(has_more), 두 번째 페이지는 502로 실패하는 Notion"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "start_cursor" not in json.loads(request.content):
+            return httpx.Response(200, json={"results": [_page(1)], "has_more": True, "next_cursor": "c2"})
+        return httpx.Response(502, json={"message": "bad gateway"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://notion.test/v1")
+    monkeypatch.setenv("ARTICLE_NOTION_API_KEY", "secret")
+    monkeypatch.setenv("ARTICLE_DATABASE_ID", "db")
+    monkeypatch.setattr(article_db, "get_notion_http", lambda: client)
+    main.app.dependency_overrides[main.require_auth] = lambda: "user-1"
+    yield
+    main.app.dependency_overrides.clear()
+
+
+def test_failed_page_raises_instead_of_ending_list(notion):
+    async def run():
+        seen = []
+        with pytest.raises(ArticleQueryError):
+            async for article in article_db.iter_user_articles_from_notion_db("user-1", include_content=False):
+                seen.append(article["id"])
+        assert seen == ["page-1"]
+
+    asyncio.run(run())
+
+
+def test_history_endpoint_returns_502(notion):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app)
+    assert client.get("/api/history/articles", params={"include_content": "false"}).status_code == 502
+    first = client.get("/api/history/articles", params={"include_content": "false", "page_size": 10})
+    assert first.status_code == 200 and first.json()["next_cursor"] == "c2"
+    second = client.get("/api/history/articles", params={"include_content": "false", "cursor": "c2"})
+    assert second.status_code == 502
+
+
+def test_ndjson_stream_ends_with_error_line(notion):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(main.app)
+    response = client.get("/api/history/articles", params={"include_content": "false", "format": "ndjson"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line.get("id") for line in lines[:-1]] == ["page-1"]
+    assert lines[-1]["status_code"] == 502 and "error" in lines[-1]
@@ -0,0 +1,168 @@
+"""jobs.JobManager 멱등성 / lease 테스트 (memory 상태 백엔드)"""
+import asyncio
+import uuid
+
+import pytest
+
+import jobs
+from jobs import INTERRUPTED, RUNNING, SUCCEEDED, FAILED, JobConflictError, JobError, JobManager
+from shared_state import get_state_backend
+
+
+def _user() -> str:
+    return f"user-{uuid.uuid4().hex[:8]}"
+
+
+class _Runner:
+    """호출 횟수를 세는 작업 함수"""
+
+    def __init__(self, result: dict = None, error: Exception = None, delay: float = 0.0):
+        self.calls = 0
+        self.result = result if result is not None else {"content": "본문"}
+        self.error = error
+        self.delay = delay
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _finish(manager: JobManager) -> None:
+    await asyncio.gather(*list(manager._tasks.values()), return_exceptions=True)
+
+
+def test_retry_of_running_and_finished_job_does_not_rerun():
+    async def run():
+        manager, user, runner = JobManager("final"), _user(), _Runner(delay=0.05)
+        job, created = await manager.submit(user, "fp", runner, idempotency_key="k")
+        assert created and job["status"] == RUNNING
+
+        again, created = await manager.submit(user, "fp", runner, idempotency_key="k")
+        assert not created and again["id"] == job["id"]
+
+        await _finish(manager)
+        done, created = await manager.submit(user, "fp", runner, idempotency_key="k")
+        assert not created and done["status"] == SUCCEEDED
+        assert done["result"] == {"content": "본문"}
+        assert runner.calls == 1
+
+    asyncio.run(run())
+
+
+def test_fingerprint_is_used_without_idempotency_key():
+    async def run():
+        manager, user, runner = JobManager("final"), _user(), _Runner()
+        first, _ = await manager.submit(user, "fp-a", runner)
+        same, created = await manager.submit(user, "fp-a", runner)
+        other, other_created = await manager.submit(user, "fp-b", runner)
+        await _finish(manager)
+        assert not created and same["id"] == first["id"]
+        assert other_created and other["id"] != first["id"]
+        assert runner.calls == 2
+
+    asyncio.run(run())
+
+
+def test_reused_key_with_different_body_conflicts():
+    async def run():
+        manager, user = JobManager("final"), _user()
+        await manager.submit(user, "fp-a", _Runner(), idempotency_key="k")
+        await _finish(manager)
+        with pytest.raises(JobConflictError):
+            await manager.submit(user, "fp-b", _Runner(), idempotency_key="k")
+
+    asyncio.run(run())
+
+
+def test_jobs_are_scoped_per_user():
+    async def run():
+        manager, user = JobManager("final"), _user()
+        job, _ = await manager.submit(user, "fp", _Runner(), idempotency_key="k")
+        await _finish(manager)
+        assert await manager.get(job["id"], "someone-else") is None
+        other, created = await manager.submit("someone-else", "fp", _Runner(), idempotency_key="k")
+        await _finish(manager)
+        assert created and other["id"] != job["id"]
+
+    asyncio.run(run())
+
+
+def test_failed_job_reruns_on_retry():
+    async def run():
+        manager, user = JobManager("final"), _user()
+        failing = _Runner(error=JobError("한도 초과", 429, retry_after=3))
+        job, _ = await manager.submit(user, "fp", failing, idempotency_key="k")
+        await _finish(manager)
+        failed = await manager.get(job["id"], user)
+        assert failed["status"] == FAILED
+        assert failed["error"] == {"detail": "한도 초과", "status_code": 429, "retry_after": 3}
+
+        retry = _Runner()
+        resumed, created = await manager.submit(user, "fp", retry, idempotency_key="k")
+        await _finish(manager)
+        assert created and resumed["attempts"] == 2
+        done = await manager.get(job["id"], user)
+        assert done["status"] == SUCCEEDED and "error" not in done
+        assert retry.calls == 1
+
+    asyncio.run(run())
+
+
+def test_job_with_expired_lease_is_interrupted_and_resumed():
+    async def run():
+        user = _user()
+        # 다른 워커가 실행하다 죽은 작업: 상태는 running이지만 lease가 없음
+        dead_worker = JobManager("final")
+        job, _ = await dead_worker.submit(user, "fp", _Runner(delay=10), idempotency_key="k")
+        for task in dead_worker._tasks.values():
+            task.cancel()
+        await asyncio.gather(*dead_worker._tasks.values(), return_exceptions=True)
+        record = await get_state_backend().get(f"job:{job['id']}")
+        record["status"] = RUNNING
+        await get_state_backend().set(f"job:{job['id']}", record)
+        await get_state_backend().delete(f"job:{job['id']}:lease")
+
+        manager = JobManager("final")
+        seen = await manager.get(job["id"], user)
+        assert seen["status"] == INTERRUPTED
+
+        runner = _Runner()
+        resumed, created = await manager.submit(user, "fp", runner, idempotency_key="k")
+        await _finish(manager)
+        assert created and resumed["attempts"] == 2
+        assert (await manager.get(job["id"], user))["status"] == SUCCEEDED
+        assert runner.calls == 1
+
+    asyncio.run(run())
+
+
+def test_live_lease_held_elsewhere_prevents_second_run():
+    async def run():
+        user = _user()
+        manager = JobManager("final")
+        job_id = manager._job_id(user, "k")
+        # 다른 워커가 lease를 잡았지만 아직 상태를 저장하기 전
+        assert await get_state_backend().add(f"job:{job_id}:lease", "other-worker", ttl=jobs.JOB_LEASE_SECONDS)
+
+        runner = _Runner()
+        job, created = await manager.submit(user, "fp", runner, idempotency_key="k")
+        assert not created and job == {"id": job_id, "kind": "final", "status": RUNNING}
+        assert runner.calls == 0
+        await get_state_backend().delete(f"job:{job_id}:lease")
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_running_job_as_failed():
+    async def run():
+        manager, user = JobManager("final"), _user()
+        job, _ = await manager.submit(user, "fp", _Runner(delay=10), idempotency_key="k")
+        await manager.stop(timeout=0.01)
+        stopped = await manager.get(job["id"], user)
+        assert stopped["status"] == FAILED and stopped["error"]["status_code"] == 503
+        assert await get_state_backend().get(f"job:{job['id']}:lease") is None
+
+    asyncio.run(run())
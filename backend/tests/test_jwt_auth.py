@@ -0,0 +1,41 @@
+"""jwt_auth 검증 캐시 / 로그아웃 폐기 테스트"""
+import asyncio
+import time
+
+import jwt
+
+import jwt_auth
+from jwt_auth import JWT_ALGORITHM, JWT_SECRET_KEY, JWTAuth
+
+
+def test_verify_caches_and_revoke_rejects():
+    async def run():
+        token = JWTAuth.create_token("user-a")
+        assert await JWTAuth.verify_token(token) == "user-a"
+        hits = jwt_auth._verified_cache.stats()["hits"]
+        assert await JWTAuth.verify_token(token) == "user-a"
+        assert jwt_auth._verified_cache.stats()["hits"] == hits + 1
+
+        assert await JWTAuth.revoke_token(token)
+        assert await JWTAuth.verify_token(token) is None
+        # 같은 사용자의 다른 토큰은 영향 없음
+        assert await JWTAuth.verify_token(JWTAuth.create_token("user-a")) == "user-a"
+
+    asyncio.run(run())
+
+
+def test_invalid_and_expired_tokens_are_rejected():
+    async def run():
+        expired = jwt.encode({"user_id": "user-a", "exp": int(time.time()) - 10}, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+        assert await JWTAuth.verify_token(expired) is None
+        assert await JWTAuth.verify_token("not-a-token") is None
+        assert not await JWTAuth.revoke_token("not-a-token")
+
+    asyncio.run(run())
+
+
+def test_short_lived_token_expiry():
+    token = JWTAuth.create_token("user-a", short_lived=True)
+    payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    assert payload["exp"] - payload["iat"] == int(JWTAuth.lifetime_seconds(short_lived=True))
+    assert JWTAuth.lifetime_seconds(short_lived=True) < JWTAuth.lifetime_seconds()
@@ -0,0 +1,38 @@
+"""llm_clients.ClientPool 제거/지연 종료 테스트"""
+import asyncio
+
+from llm_clients import ClientPool
+
+
+class _FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_evicted_client_is_closed_after_delay():
+    async def run():
+        pool = ClientPool(maxsize=1, close_delay=0.05)
+        first = pool.get("openai", "key-a", _FakeClient)
+        pool.get("openai", "key-b", _FakeClient)
+        await asyncio.sleep(0)
+        assert not first.closed  # 꺼내 간 요청이 아직 사용 중일 수 있음
+        await asyncio.sleep(0.1)
+        assert first.closed
+        assert pool.stats()["closing"] == 0
+
+    asyncio.run(run())
+
+
+def test_close_all_closes_pending_evictions():
+    async def run():
+        pool = ClientPool(maxsize=1, close_delay=60)
+        first = pool.get("openai", "key-a", _FakeClient)
+        second = pool.get("openai", "key-b", _FakeClient)
+        await pool.close_all()
+        assert first.closed and second.closed
+        assert pool.stats()["closing"] == 0
+
+    asyncio.run(run())
@@ -0,0 +1,43 @@
+"""GeminiProvider 스트리밍 청크 처리 테스트"""
+import asyncio
+
+import pytest
+
+from llm_providers import GEMINI_AVAILABLE, GeminiProvider
+
+pytestmark = pytest.mark.skipif(not GEMINI_AVAILABLE, reason="google-generativeai 미설치")
+
+
+def _chunk(text: str = None, finish_reason: str = "STOP"):
+    from google.generativeai import protos
+    from google.generativeai.types import GenerateContentResponse
+
+    parts = [protos.Part(text=text)] if text is not None else []
+    candidate = protos.Candidate(content=protos.Content(parts=parts, role="model"), finish_reason=finish_reason)
+    return GenerateContentResponse.from_response(protos.GenerateContentResponse(candidates=[candidate]))
+
+
+class _Model:
+    def __init__(self, chunks: list):
+        self.chunks = chunks
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def response():
+            for chunk in self.chunks:
+                yield chunk
+        return response()
+
+
+def test_stream_skips_textless_final_chunk(monkeypatch):
+    final = _chunk(finish_reason="MAX_TOKENS")
+    with pytest.raises(ValueError):
+        final.text
+
+    provider = GeminiProvider()
+    model = _Model([_chunk("안녕"), _chunk("하세요"), final])
+    monkeypatch.setattr(provider, "get_client", lambda api_key=None, system=None: model)
+
+    async def run():
+        return [text async for text in provider.stream("prompt", 0.5, 10)]
+
+    assert asyncio.run(run()) == ["안녕", "하세요"]
@@ -0,0 +1,38 @@
+"""notion.auth.check_login 인덱스 사용 테스트 (Notion 조회는 가짜 함수로 대체)"""
+import asyncio
+import time
+
+import pytest
+
+from notion import auth
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    async def fake_lookup(user_id):
+        calls.append(user_id)
+        return {"password": "new-pw", "page_id": "page"} if user_id == "known" else None
+
+    monkeypatch.setattr(auth, "_lookup_user", fake_lookup)
+    monkeypatch.setattr(auth, "_user_index", {"known": {"password": "pw", "page_id": "page"}})
+    monkeypatch.setattr(auth, "_user_index_loaded_at", time.monotonic())
+    return calls
+
+
+def test_wrong_password_with_fresh_index_does_not_query_notion(lookups):
+    assert asyncio.run(auth.check_login("known", "pw"))
+    assert not asyncio.run(auth.check_login("known", "guess"))
+    assert lookups == []
+
+
+def test_unknown_user_falls_back_to_notion(lookups):
+    assert not asyncio.run(auth.check_login("unknown", "pw"))
+    assert lookups == ["unknown"]
+
+
+def test_stale_index_falls_back_to_notion(lookups, monkeypatch):
+    monkeypatch.setattr(auth, "_user_index_loaded_at", time.monotonic() - auth.USER_INDEX_REFRESH_INTERVAL - 1)
+    assert asyncio.run(auth.check_login("known", "new-pw"))
+    assert lookups == ["known"]
@@ -0,0 +1,54 @@
+"""prompt_compaction 중복 제거 / 토큰 예산 테스트 (gemini = 근사 토큰 수)"""
+import hashlib
+
+from prompt_compaction import compact_final_inputs, count_tokens, dedupe_paragraphs
+
+
+def _paragraphs(prefix: str, count: int) -> str:
+    """서로 겹치지 않는 문단 (문단마다 다른 해시 문자열)"""
+    return "\n".join(
+        f"{prefix} 문단 {i}: " + hashlib.sha256(f"{prefix}{i}".encode()).hexdigest()
+        for i in range(count)
+    )
+
+
+def test_duplicate_paragraph_kept_only_in_first_draft():
+    shared = "같은 문단은 첫 번째 초안에만 남아야 합니다. 블로그 자동화 도구 소개."
+    drafts = [
+        {"model": "openai", "content": f"{shared}\nopenai만의 문단"},
+        {"model": "groq", "content": f"{shared}!\ngroq만의 문단"},
+    ]
+    result, removed = dedupe_paragraphs(drafts)
+    assert shared in result[0]["content"]
+    assert result[1]["content"] == "groq만의 문단"
+    assert removed == {"groq": 1}
+
+
+def test_within_budget_is_left_alone():
+    drafts = [{"model": "openai", "content": "짧은 초안"}, {"model": "groq", "content": "다른 초안"}]
+    result, report = compact_final_inputs(drafts, fixed_tokens=100, budget=6000)
+    assert result == drafts
+    assert report["trimmed_paragraphs"] == {} and report["duplicate_paragraphs"] == {}
+
+
+def test_over_budget_trims_longest_draft_first():
+    drafts = [
+        {"model": "openai", "content": _paragraphs("openai", 2)},
+        {"model": "gemini", "content": _paragraphs("gemini", 30)},
+    ]
+    short_tokens = count_tokens(drafts[0]["content"])
+    budget = 100 + short_tokens * 3
+    result, report = compact_final_inputs(drafts, fixed_tokens=100, budget=budget)
+
+    assert result[0]["content"] == drafts[0]["content"]
+    assert "gemini" in report["trimmed_paragraphs"]
+    assert result[1]["content"].startswith("gemini 문단 0")
+    assert report["tokens_after"] <= budget
+    assert report["tokens_after"] < report["tokens_before"]
+
+
+def test_zero_budget_only_dedupes():
+    drafts = [{"model": "gemini", "content": _paragraphs("gemini", 30)}]
+    result, report = compact_final_inputs(drafts, fixed_tokens=100, budget=0)
+    assert result[0]["content"] == drafts[0]["content"]
+    assert report["trimmed_paragraphs"] == {}
@@ -0,0 +1,104 @@
+"""request_limits.RequestBodyLimitMiddleware 413 경로 테스트 (ASGI 직접 호출)"""
+import asyncio
+import json
+
+import request_limits
+from request_limits import RequestBodyLimitMiddleware
+
+
+async def _parsing_app(scope, receive, send):
+    """FastAPI처럼 본문을 끝까지 읽고, 읽는 중 예외가 나면 400으로 바꾸는 앱"""
+    try:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        status, payload = 200, {"received": len(body)}
+    except Exception:
+        status, payload = 400, {"detail": "There was an error parsing the body"}
+    raw = json.dumps(payload).encode("utf-8")
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": raw})
+
+
+def _request(middleware, chunks: list, headers: list = ()) -> tuple:
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": list(headers)}
+    incoming = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    status = sent[0]["status"]
+    body = json.loads(b"".join(m.get("body", b"") for m in sent[1:]))
+    return status, body
+
+
+def test_rejects_by_content_length():
+    middleware = RequestBodyLimitMiddleware(_parsing_app, max_bytes=10)
+    before = request_limits._stats["rejected_by_header"]
+    status, _ = _request(middleware, [b"x" * 20], headers=[(b"content-length", b"20")])
+    assert status == 413
+    assert request_limits._stats["rejected_by_header"] == before + 1
+
+
+def test_rejects_chunked_body_while_streaming():
+    middleware = RequestBodyLimitMiddleware(_parsing_app, max_bytes=10)
+    before = request_limits._stats["rejected_while_streaming"]
+    status, body = _request(middleware, [b"x" * 6, b"x" * 6, b"x" * 6])
+    assert status == 413
+    assert "10바이트" in body["detail"]
+    assert request_limits._stats["rejected_while_streaming"] == before + 1
+
+
+def test_understated_content_length_is_still_counted():
+    middleware = RequestBodyLimitMiddleware(_parsing_app, max_bytes=2048)
+    status, body = _request(middleware, [b"x" * 2000, b"x" * 2000], headers=[(b"content-length", b"10")])
+    assert status == 413
+    assert "2KB" in body["detail"]
+
+
+def test_passes_buffered_chunks_to_app():
+    middleware = RequestBodyLimitMiddleware(_parsing_app, max_bytes=10)
+    status, body = _request(middleware, [b"x" * 4, b"x" * 6])
+    assert status == 200
+    assert body == {"received": 10}
+
+
+def test_fastapi_chunked_upload_gets_413():
+    """FastAPI 본문 파싱을 거쳐도 400이 아니라 413으로 응답"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from pydantic import BaseModel
+
+    class Payload(BaseModel):
+        text: str
+
+    app = FastAPI()
+    app.add_middleware(RequestBodyLimitMiddleware, max_bytes=1024)
+
+    @app.post("/echo")
+    async def echo(payload: Payload):
+        return {"length": len(payload.text)}
+
+    def chunks():
+        yield b'{"text": "'
+        for _ in range(4):
+            yield b"x" * 400
+        yield b'"}'
+
+    client = TestClient(app)
+    response = client.post("/echo", content=chunks(), headers={"content-type": "application/json"})
+    assert response.status_code == 413
+    assert client.post("/echo", json={"text": "ok"}).json() == {"length": 2}
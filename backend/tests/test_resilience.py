@@ -0,0 +1,72 @@
+"""resilience.provider_guard 브레이커 순서 테스트"""
+import asyncio
+import uuid
+
+import pytest
+
+import resilience
+from llm_errors import LLMQuotaError, LLMServerError, ProviderUnavailableError
+
+
+def _call(provider: str, api_key: str, error: Exception = None) -> None:
+    async def run():
+        async with resilience.provider_guard(provider, api_key):
+            if error is not None:
+                raise error
+    asyncio.run(run())
+
+
+def _open_provider_breaker(provider: str, api_key: str) -> resilience.CircuitBreaker:
+    for _ in range(resilience.BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(LLMServerError):
+            _call(provider, api_key, LLMServerError("5xx"))
+    breaker = resilience._provider_breakers.get(provider)
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_key_breaker_rejection_releases_provider_probe():
+    provider = f"test-{uuid.uuid4().hex[:8]}"
+
+    # 키 A: 할당량 초과로 키 브레이커 open
+    with pytest.raises(LLMQuotaError):
+        _call(provider, "key-a", LLMQuotaError("quota"))
+
+    # 키 C의 서버 오류로 프로바이더 브레이커 open → reset timeout 경과
+    breaker = _open_provider_breaker(provider, "key-c")
+    breaker.opened_until = 0.0
+
+    # 키 A: 프로바이더 probe는 통과하지만 키 브레이커에서 거절
+    with pytest.raises(ProviderUnavailableError):
+        _call(provider, "key-a")
+    assert breaker.state == "half_open"
+
+    # 키 B는 반납된 probe 자리로 호출되고 성공하면 프로바이더 브레이커가 닫힘
+    _call(provider, "key-b")
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_single_probe():
+    provider = f"test-{uuid.uuid4().hex[:8]}"
+    breaker = _open_provider_breaker(provider, "key-a")
+    breaker.opened_until = 0.0
+
+    assert breaker.allow() is None
+    assert breaker.allow() is not None
+    breaker.release_probe()
+    assert breaker.allow() is None
+
+
+def test_limiter_rejection_releases_probes():
+    provider = f"test-{uuid.uuid4().hex[:8]}"
+    breaker = _open_provider_breaker(provider, "key-a")
+    breaker.opened_until = 0.0
+
+    limiter = resilience._limiters.get((provider, resilience.hash_api_key("key-b")))
+    limiter.limit = 0
+    with pytest.raises(ProviderUnavailableError):
+        _call(provider, "key-b")
+
+    limiter.limit = 1
+    _call(provider, "key-b")
+    assert breaker.state == "closed"
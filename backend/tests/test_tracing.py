@@ -0,0 +1,18 @@
+"""TracingMiddleware workflow_id 전파 테스트 (OTEL 비활성)"""
+import asyncio
+
+import tracing
+from tracing import TracingMiddleware, current_workflow_id
+
+
+def test_workflow_id_is_set_without_tracer(monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(current_workflow_id())
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"x-workflow-id", b"wf-1")]}
+    asyncio.run(TracingMiddleware(app)(scope, None, None))
+    assert seen == ["wf-1"]
+    assert current_workflow_id() == ""
@@ -0,0 +1,91 @@
+"""notion.write_queue lease 테스트 (같은 SQLite 파일을 쓰는 두 큐 = 두 워커 프로세스)"""
+import time
+
+from notion.write_queue import NotionWriteQueue
+
+
+def _queue(path, **kwargs) -> NotionWriteQueue:
+    queue = NotionWriteQueue(str(path), **kwargs)
+    queue._open()
+    return queue
+
+
+def test_inflight_jobs_are_not_claimed_twice(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    first, second = _queue(path), _queue(path)
+    ids = [first._insert("article", {"n": i}) for i in range(3)]
+
+    claimed = first._claim(2)
+    assert [row[0] for row in claimed] == ids[:2]
+    assert [row[0] for row in second._claim(10)] == ids[2:]
+    assert second._claim(10) == []
+
+    # 다른 워커가 새로 시작해도 처리 중인 작업을 대기 상태로 되돌리지 않음
+    restarted = _queue(path)
+    assert restarted._counts()["inflight"] == 3
+    assert restarted._claim(10) == []
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    path = tmp_path / "queue.sqlite3"
+    crashed = _queue(path, lease_seconds=0.01)
+    job_id = crashed._insert("article", {})
+    assert [row[0] for row in crashed._claim(1)] == [job_id]
+
+    time.sleep(0.02)
+    survivor = _queue(path)
+    assert [row[0] for row in survivor._claim(1)] == [job_id]
+
+
+def test_failed_job_backs_off_then_goes_dead(tmp_path):
+    queue = _queue(tmp_path / "queue.sqlite3", max_attempts=2, base_delay=60)
+    job_id = queue._insert("article", {})
+    queue._claim(1)
+
+    assert queue._fail(job_id, 1, "Notion 503") == "pending"
+    assert queue._claim(1) == []  # 백오프 중
+    assert queue._fail(job_id, 2, "Notion 503") == "dead"
+    assert queue._counts() == {"pending": 0, "inflight": 0, "dead": 1}
+    assert queue._requeue_dead() == 1
+    assert [row[0] for row in queue._claim(1)] == [job_id]
+
+
+def test_worker_survives_sqlite_error_while_recording_result(tmp_path, monkeypatch):
+    import asyncio
+    import sqlite3
+
+    from notion import write_queue
+
+    saved = []
+
+    async def handler(**payload):
+        saved.append(payload["n"])
+        return True
+
+    monkeypatch.setitem(write_queue._HANDLERS, "article", handler)
+    queue = NotionWriteQueue(str(tmp_path / "queue.sqlite3"), workers=1, poll_interval=0.01)
+    complete = queue._complete
+    failures = []
+
+    def flaky_complete(job_id):
+        if not failures:
+            failures.append(job_id)
+            raise sqlite3.OperationalError("database is locked")
+        complete(job_id)
+
+    monkeypatch.setattr(queue, "_complete", flaky_complete)
+
+    async def run():
+        await queue.start()
+        await queue.enqueue("article", {"n": 1})
+        await asyncio.sleep(0.1)
+        await queue.enqueue("article", {"n": 2})
+        await asyncio.sleep(0.1)
+        assert all(not task.done() for task in queue._tasks)
+        counts = await queue.stats()
+        await queue.stop()
+        return counts
+
+    counts = asyncio.run(run())
+    assert saved == [1, 2]
+    assert counts == {"pending": 0, "inflight": 1, "dead": 0}  # 기록 실패한 작업은 lease 만료까지 inflight
@@ -0,0 +1,220 @@
+"""
+OpenTelemetry 트레이싱 (선택)
+
+글 하나는 프론트엔드에서 HTTP 호출 7번(초안 3 → 분석 3 → 최종 1)으로 만들어집니다.
+프론트엔드가 글마다 만든 X-Workflow-ID 헤더를 보내면 그 값에서 trace id를 만들어
+7번의 호출과 그 안의 LLM / Notion 호출 span이 하나의 trace로 묶입니다.
+(traceparent 헤더가 있으면 그쪽을 우선 사용)
+
+OTEL_TRACES_EXPORTER로 내보낼 곳을 정합니다.
+- none (기본): 트레이싱 끔 (span 함수는 아무 일도 하지 않음)
+- console: 표준 출력
+- otlp: OTLP/HTTP 수집기 (OTEL_EXPORTER_OTLP_ENDPOINT, 기본 http://localhost:4318)
+
+opentelemetry 패키지(requirements.txt에 포함)를 불러올 수 없으면 설정과 관계없이 꺼지고, 시작 시 경고를 남깁니다.
+"""
+import contextvars
+import hashlib
+import logging
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+# OpenTelemetry (선택)
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+    from opentelemetry.propagate import extract
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.trace import NonRecordingSpan, SpanContext, SpanKind, Status, StatusCode, TraceFlags
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ynk-blog-backend")
+WORKFLOW_HEADER = "x-workflow-id"
+
+_provider = None
+_tracer = None
+_workflow_id: contextvars.ContextVar = contextvars.ContextVar("workflow_id", default="")
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[dict] = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def init_tracing() -> bool:
+    """앱 시작 시 TracerProvider 설정 (lifespan에서 호출) → 트레이싱 사용 여부"""
+    global _provider, _tracer
+    if _tracer is not None:
+        return True
+    if TRACES_EXPORTER in ("", "none"):
+        return False
+    if not OTEL_AVAILABLE:
+        logger.warning("OTEL_TRACES_EXPORTER가 설정되었지만 opentelemetry-sdk를 불러올 수 없어 트레이싱을 끕니다.", extra={"exporter": TRACES_EXPORTER})
+        return False
+
+    if TRACES_EXPORTER == "console":
+        exporter = ConsoleSpanExporter()
+    elif TRACES_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTLP exporter가 설치되지 않아 트레이싱을 끕니다. (pip install opentelemetry-exporter-otlp-proto-http)")
+            return False
+        exporter = OTLPSpanExporter()  # OTEL_EXPORTER_OTLP_ENDPOINT 등 표준 환경 변수 사용
+    else:
+        logger.warning("지원하지 않는 OTEL_TRACES_EXPORTER (none/console/otlp), 트레이싱을 끕니다.", extra={"exporter": TRACES_EXPORTER})
+        return False
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer("ynk-blog")
+    logger.info("트레이싱 사용", extra={"exporter": TRACES_EXPORTER})
+    return True
+
+
+def shutdown_tracing() -> None:
+    """남은 span을 내보내고 종료 (lifespan에서 호출)"""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def current_workflow_id() -> str:
+    return _workflow_id.get()
+
+
+def _span_options(kind: str, attributes: dict) -> dict:
+    workflow_id = _workflow_id.get()
+    if workflow_id:
+        attributes["workflow.id"] = workflow_id
+    return {
+        "kind": getattr(SpanKind, kind.upper()),
+        "attributes": {key: value for key, value in attributes.items() if value is not None},
+    }
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", **attributes):
+    """
+    현재 span의 자식 span 실행 (트레이싱이 꺼져 있으면 아무 일도 하지 않는 span 반환)
+
+    kind: internal / client / server. 블록 안에서 난 예외는 span에 기록되고 그대로 전달됩니다.
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    with _tracer.start_as_current_span(name, **_span_options(kind, attributes)) as span:
+        yield span
+
+
+@contextmanager
+def start_detached_span(name: str, kind: str = "internal", **attributes):
+    """
+    현재 span의 자식 span이지만 현재 span으로 등록하지는 않음
+
+    async generator처럼 블록 중간에 yield하는 곳에서 사용합니다.
+    (재개되는 컨텍스트가 달라도 OpenTelemetry context attach/detach가 어긋나지 않음)
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    span = _tracer.start_span(name, **_span_options(kind, attributes))
+    try:
+        yield span
+    except Exception as e:
+        span.record_exception(e)
+        span.set_status(Status(StatusCode.ERROR, str(e)))
+        raise
+    finally:
+        span.end()
+
+
+def _workflow_parent(workflow_id: str):
+    """workflow id에서 만든 고정 trace id / 부모 span id (같은 글의 호출끼리 같은 trace가 됨)"""
+    digest = hashlib.sha256(workflow_id.encode("utf-8")).digest()
+    span_context = SpanContext(
+        trace_id=int.from_bytes(digest[:16], "big") or 1,
+        span_id=int.from_bytes(digest[16:24], "big") or 1,
+        is_remote=True,
+        trace_flags=TraceFlags(TraceFlags.SAMPLED),
+    )
+    return trace.set_span_in_context(NonRecordingSpan(span_context))
+
+
+class TracingMiddleware:
+    """
+    모든 HTTP 요청을 server span으로 감싸는 ASGI 미들웨어
+
+    span 이름은 라우팅 후 "METHOD 엔드포인트함수" 로 바꾸고, 스트리밍 응답은 마지막 조각까지 포함합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope.get("headers", [])}
+        workflow_id = headers.get(WORKFLOW_HEADER, "")[:128]
+        # 로그의 workflow_id는 OTEL 사용 여부와 관계없이 남도록 span보다 먼저 설정
+        workflow_token = _workflow_id.set(workflow_id)
+        try:
+            if _tracer is None:
+                await self.app(scope, receive, send)
+            else:
+                await self._traced(scope, receive, send, headers, workflow_id)
+        finally:
+            _workflow_id.reset(workflow_token)
+
+    async def _traced(self, scope, receive, send, headers: dict, workflow_id: str):
+        if "traceparent" in headers:
+            parent = extract(headers)
+        elif workflow_id:
+            parent = _workflow_parent(workflow_id)
+        else:
+            parent = None
+
+        context_token = otel_context.attach(parent) if parent is not None else None
+        try:
+            with start_span(f"{scope['method']} {scope['path']}", kind="server", **{
+                "http.method": scope["method"],
+                "http.target": scope["path"],
+            }) as span:
+                async def traced_send(message):
+                    if message["type"] == "http.response.start":
+                        span.set_attribute("http.status_code", message["status"])
+                    await send(message)
+
+                try:
+                    await self.app(scope, receive, traced_send)
+                finally:
+                    endpoint = scope.get("endpoint")
+                    if endpoint is not None:
+                        span.update_name(f"{scope['method']} {endpoint.__name__}")
+        finally:
+            if context_token is not None:
+                otel_context.detach(context_token)
@@ -7,7 +7,7 @@ import * as Label from '@radix-ui/react-label';
 import * as Select from '@radix-ui/react-select';
 import SettingsPage from './SettingsPage';
 import HistoryPage from './HistoryPage';
-import { getAuthHeaders, getSessionId } from '@/lib/session';
+import { getAuthHeaders, getSessionId, newRequestId, startWorkflow } from '@/lib/session';
 
 interface MainPageProps {
   onLogout: () => void;
@@ -165,6 +165,7 @@ export default function MainPage({ onLogout }: MainPageProps) {
   const handleGenerateDrafts = async () => {
     setShowConfirmStep2(false);
     setIsGenerating(true);
+    startWorkflow(); // 이번 글의 초안/분석/최종 요청을 하나의 trace로 묶음
     
     // 초기 상태 설정 - 각 모델을 generating 상태로
     setDrafts([
@@ -511,39 +512,77 @@ export default function MainPage({ onLogout }: MainPageProps) {
       const successfulAnalyses = analyses.filter(a => a.status === 'success');
 
       const backendUrl = process.env.NEXT_PUBLIC_BACKEND_URL || 'http://localhost:8000';
-      const response = await fetch(`${backendUrl}/api/generate/final`, {
+      const requestBody = JSON.stringify({
+        topic,
+        article_intent: articleIntents.join(', '),
+        target_audience: targetAudience,
+        tone_style: toneStyle === '직접 입력' ? customToneStyle : toneStyle,
+        drafts: successfulDrafts.map(d => ({
+          model: d.model,
+          content: d.content,
+        })),
+        analyses: successfulAnalyses.map(a => ({
+          model: a.model,
+          pros: a.pros,
+          cons: a.cons,
+          improvement: a.improvement,
+        })),
+        api_key: apiKeys.gemini || '',
+        model: 'gemini',
+      });
+
+      // 최종 글은 서버 작업으로 생성 (같은 Idempotency-Key로 다시 보내면 LLM을 다시 호출하지 않고 같은 작업을 돌려받음)
+      const idempotencyKey = newRequestId();
+      const submitJob = () => fetch(`${backendUrl}/api/jobs/final`, {
         method: 'POST',
-        headers: getAuthHeaders(),
+        headers: { ...getAuthHeaders(), 'Idempotency-Key': idempotencyKey },
         credentials: 'include',
-        body: JSON.stringify({
-          topic,
-          article_intent: articleIntents.join(', '),
-          target_audience: targetAudience,
-          tone_style: toneStyle === '직접 입력' ? customToneStyle : toneStyle,
-          drafts: successfulDrafts.map(d => ({
-            model: d.model,
-            content: d.content,
-          })),
-          analyses: successfulAnalyses.map(a => ({
-            model: a.model,
-            pros: a.pros,
-            cons: a.cons,
-            improvement: a.improvement,
-          })),
-          api_key: apiKeys.gemini || '',
-          model: 'gemini',
-        }),
+        body: requestBody,
       });
 
+      const response = await submitJob();
+
       // 401 오류 처리
       if (handleAuthError(response)) {
         throw new Error('세션이 만료되었습니다.'); // 에러를 던져서 중단
       }
 
-      const data = await response.json();
+      let job = await response.json();
+      if (!response.ok) {
+        alert(`최종 생성 실패: ${job.detail || '알 수 없는 오류'}`);
+        return;
+      }
+
+      // 작업이 끝날 때까지 상태 조회 (일시적인 네트워크 오류는 다음 조회에서 재시도, 서버가 중단된 작업은 같은 키로 다시 요청)
+      let resubmits = 0;
+      while (job.status === 'running' || (job.status === 'interrupted' && resubmits < 3)) {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        try {
+          let jobResponse: Response;
+          if (job.status === 'interrupted') {
+            resubmits++;
+            jobResponse = await submitJob();
+          } else {
+            jobResponse = await fetch(`${backendUrl}/api/jobs/${job.id}`, {
+              headers: getAuthHeaders(),
+              credentials: 'include',
+            });
+          }
+          if (handleAuthError(jobResponse)) {
+            throw new Error('세션이 만료되었습니다.');
+          }
+          if (jobResponse.ok) {
+            job = await jobResponse.json();
+          }
+        } catch (error) {
+          if (error instanceof Error && error.message === '세션이 만료되었습니다.') {
+            throw error;
+          }
+        }
+      }
 
-      if (response.ok) {
-        const fullContent = data.content;
+      if (job.status === 'succeeded') {
+        const fullContent = job.result.content;
         setFinalContent(fullContent);
         setDisplayedFinalContent('');
         
@@ -560,7 +599,7 @@ export default function MainPage({ onLogout }: MainPageProps) {
           }
         }, typingSpeed);
       } else {
-        alert(`최종 생성 실패: ${data.detail || '알 수 없는 오류'}`);
+        alert(`최종 생성 실패: ${job.error?.detail || '알 수 없는 오류'}`);
       }
     } catch (error) {
       alert(`서버 오류: ${error}`);
@@ -21,10 +21,23 @@ export const removeSessionId = () => {
   }
 };
 
-// API 요청 헤더에 session_id 추가
+// 글 한 편(초안 → 분석 → 최종)의 요청을 백엔드 트레이싱에서 하나로 묶기 위한 ID
+let workflowId: string | null = null;
+
+export const newRequestId = (): string =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+export const startWorkflow = (): string => {
+  workflowId = newRequestId();
+  return workflowId;
+};
+
+// API 요청 헤더에 session_id, workflow id 추가
 export const getAuthHeaders = (): HeadersInit => {
   const sessionId = getSessionId();
-  const headers: HeadersInit = {
+  const headers: Record<string, string> = {
     'Content-Type': 'application/json',
   };
   
@@ -32,5 +45,9 @@ export const getAuthHeaders = (): HeadersInit => {
     headers['X-Session-ID'] = sessionId;
   }
   
+  if (workflowId) {
+    headers['X-Workflow-ID'] = workflowId;
+  }
+  
   return headers;
 };